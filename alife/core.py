@@ -1,7 +1,27 @@
 # alife/core.py
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from alife.utils import checkpoint
+
+if TYPE_CHECKING:
+    from alife.schedulers import Scheduler
 
 
 class Resource(ABC):
@@ -10,8 +30,28 @@ class Resource(ABC):
 
     This class defines the basic interface for resources such as energy or matter.
     Specific resource types should inherit from this class and implement its methods.
+
+    Resources that call _level_changed() on every change of level set
+    reports_changes to True. An organism holding only such resources can then
+    tell whether it is alive without reading every level.
     """
 
+    reports_changes = False
+
+    # The organism notified when the level crosses zero, set by add_resource()
+    _owner: Optional["Organism"] = None
+
+    def _level_changed(self, old: float, new: float) -> None:
+        """
+        Tell the owner, if any, that the level went from old to new.
+
+        Args:
+            old (float): The level before the change.
+            new (float): The level after the change.
+        """
+        if self._owner is not None and (old > 0) != (new > 0):
+            self._owner._resource_crossed_zero(self, new > 0)
+
     @abstractmethod
     def consume(self, amount: float) -> None:
         """
@@ -96,14 +136,86 @@ class Organism(Entity):
     types should inherit from this class and implement its methods.
     """
 
+    # Bookkeeping for is_alive(), kept up to date by the resources mapping.
+    # The defaults are immutable and replaced on change, so subclasses that
+    # do not call Organism.__init__ still work.
+    # ids of resources that report changes and are at or below 0
+    _depleted: FrozenSet[int] = frozenset()
+    # Resources that do not report changes and must be read every time
+    _polled: Tuple[Resource, ...] = ()
+    _simulation: Optional["Simulation"] = None
+
+    @property
+    def resources(self) -> Dict[str, Resource]:
+        """
+        The resources of the organism, by name.
+
+        Adding, replacing or removing entries, directly or through
+        add_resource(), keeps is_alive() up to date. A resource that reports
+        changes is owned by the organism from then on, and must not be added
+        to another one.
+        """
+        return self._resources
+
+    @resources.setter
+    def resources(self, resources: Dict[str, Resource]) -> None:
+        previous = vars(self).get("_resources")
+        if previous is not None:
+            previous.clear()
+        self._resources = _OrganismResources(self)
+        self._resources.update(resources)
+
     def is_alive(self) -> bool:
         """
         Check if the organism is alive.
 
+        Levels of resources that report changes are not read: the organism
+        keeps the set of those at or below 0 up to date as they change.
+
         Returns:
             bool: True if all resource levels are above 0, False otherwise.
         """
-        return all(resource.get_level() > 0 for resource in self.resources.values())
+        if self._depleted:
+            return False
+        for resource in self._polled:
+            if resource.get_level() <= 0:
+                return False
+        return True
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # ids of resources change with copies, so rebuild the bookkeeping
+        resources = state.pop("_resources", None)
+        for name in ("_depleted", "_polled"):
+            state.pop(name, None)
+        self.__dict__.update(state)
+        if resources is not None:
+            self.resources = resources
+
+    def _track(self, resource: Resource) -> None:
+        if resource.reports_changes:
+            resource._owner = self
+            if resource.get_level() <= 0:
+                self._depleted |= {id(resource)}
+        else:
+            self._polled += (resource,)
+
+    def _forget(self, resource: Resource) -> None:
+        self._depleted -= {id(resource)}
+        if resource._owner is self:
+            resource._owner = None
+        self._polled = tuple(r for r in self._polled if r is not resource)
+
+    def _alive_changed(self, was_alive: bool) -> None:
+        if self._simulation is not None and self.is_alive() != was_alive:
+            self._simulation._organism_changed(self, not was_alive)
+
+    def _resource_crossed_zero(self, resource: Resource, positive: bool) -> None:
+        was_alive = self._simulation is not None and self.is_alive()
+        if positive:
+            self._depleted -= {id(resource)}
+        else:
+            self._depleted |= {id(resource)}
+        self._alive_changed(was_alive)
 
     @abstractmethod
     def act(self, environment: "Environment") -> None:
@@ -128,6 +240,153 @@ class Organism(Entity):
         pass
 
 
+class _OrganismResources(dict):
+    # The resources of an organism. Every change of an entry updates the
+    # organism's bookkeeping, so is_alive() never has to check for changes.
+
+    def __init__(self, owner: Organism):
+        super().__init__()
+        self._owner = owner
+
+    def __setitem__(self, name: str, resource: Resource) -> None:
+        owner = self._owner
+        was_alive = owner.is_alive()
+        previous = self.get(name)
+        if previous is not None:
+            owner._forget(previous)
+        super().__setitem__(name, resource)
+        owner._track(resource)
+        owner._alive_changed(was_alive)
+
+    def __delitem__(self, name: str) -> None:
+        owner = self._owner
+        was_alive = owner.is_alive()
+        resource = self[name]
+        super().__delitem__(name)
+        owner._forget(resource)
+        owner._alive_changed(was_alive)
+
+    def pop(self, name: str, *default):
+        if name not in self:
+            return super().pop(name, *default)
+        resource = self[name]
+        del self[name]
+        return resource
+
+    def popitem(self):
+        name = next(reversed(self))
+        return name, self.pop(name)
+
+    def setdefault(self, name: str, default=None):
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs) -> None:
+        for name, resource in dict(*args, **kwargs).items():
+            self[name] = resource
+
+    def clear(self) -> None:
+        for name in list(self):
+            del self[name]
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __reduce__(self):
+        # Copied and pickled as a plain dict; Organism.__setstate__ wraps it
+        return dict, (dict(self),)
+
+
+def _phase_method(name: str, method: Callable, of_simulation: bool) -> Callable:
+    # Runs method as a phase of the simulation it belongs to
+    @wraps(method)
+    def phase_method(self, *args, **kwargs):
+        simulation = self if of_simulation else self._hook_owner
+        if simulation is None:
+            return method(self, *args, **kwargs)
+        with simulation._run_phase(name):
+            return method(self, *args, **kwargs)
+
+    return phase_method
+
+
+def _reduce_unhooked(self, protocol):
+    # Hooked instances are copied and pickled as instances of their own class,
+    # without the hooks
+    hooked = type(self)
+    self.__class__ = hooked._unhooked_class
+    try:
+        reduced = self.__reduce_ex__(protocol)
+    finally:
+        self.__class__ = hooked
+    if len(reduced) > 2 and isinstance(reduced[2], dict):
+        state = {
+            key: value
+            for key, value in reduced[2].items()
+            if key not in ("_hooks", "_hook_owner")
+        }
+        reduced = reduced[:2] + (state,) + reduced[3:]
+    return reduced
+
+
+def _get_environment(simulation: "Simulation") -> "Environment":
+    return vars(simulation)["environment"]
+
+
+def _set_environment(simulation: "Simulation", environment: "Environment") -> None:
+    _unhook_environment(simulation)
+    vars(simulation)["environment"] = environment
+    _hook_environment(simulation)
+
+
+# Subclasses of simulation and environment classes running their phase
+# methods as phases. An instance is switched to one of these while its
+# simulation has hooks, so without hooks nothing is wrapped.
+_HOOKED_CLASSES: Dict[type, type] = {}
+
+
+def _hooked_class(cls: type, phases: Sequence[str], of_simulation: bool) -> type:
+    hooked = _HOOKED_CLASSES.get(cls)
+    if hooked is None:
+        namespace: Dict[str, Any] = {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "__reduce_ex__": _reduce_unhooked,
+            "_unhooked_class": cls,
+        }
+        for name in phases:
+            method = getattr(cls, name, None)
+            if callable(method):
+                namespace[name] = _phase_method(name, method, of_simulation)
+        if of_simulation:
+            # Hook environments assigned while hooked, such as those built by
+            # initialize()
+            namespace["environment"] = property(_get_environment, _set_environment)
+        hooked = _HOOKED_CLASSES[cls] = type(cls)(cls.__name__, (cls,), namespace)
+    return hooked
+
+
+def _hook_environment(simulation: "Simulation") -> None:
+    environment = vars(simulation).get("environment")
+    if environment is None:
+        return
+    if "_unhooked_class" not in vars(type(environment)):
+        environment.__class__ = _hooked_class(
+            type(environment), ("update",), of_simulation=False
+        )
+    environment._hook_owner = simulation
+
+
+def _unhook_environment(simulation: "Simulation") -> None:
+    environment = vars(simulation).get("environment")
+    if environment is None or vars(environment).get("_hook_owner") is not simulation:
+        return
+    del environment._hook_owner
+    environment.__class__ = type(environment)._unhooked_class
+
+
 class Environment(ABC):
     """
     Abstract base class representing the simulation environment.
@@ -137,6 +396,9 @@ class Environment(ABC):
     inherit from this class and implement its methods.
     """
 
+    # The simulation whose hooks run around update(), set while it has hooks
+    _hook_owner: Optional["Simulation"] = None
+
     @abstractmethod
     def get_state(self) -> Any:
         """
@@ -208,6 +470,27 @@ class Environment(ABC):
         pass
 
 
+class SimulationHook:
+    """
+    Base class for hooks called around the phases of a simulation.
+
+    A phase is named by a string: "initialize", "run_step", "get_state",
+    "step_agents", "sweep_dead", "update" (the environment update) or any
+    name a simulation passes to Simulation.phase(). Phases nest, so
+    "update" usually runs inside "run_step". Both methods do nothing by
+    default.
+    """
+
+    def before(self, simulation: "Simulation", phase: str) -> None:
+        """Called when a phase starts."""
+
+    def after(self, simulation: "Simulation", phase: str) -> None:
+        """Called when a phase ends, even if it raised."""
+
+
+_NO_PHASE = nullcontext()
+
+
 class Simulation(ABC):
     """
     Abstract base class representing a simulation.
@@ -216,14 +499,27 @@ class Simulation(ABC):
     the environment and entities, and controlling the execution of the simulation.
     """
 
-    def __init__(self, environment: Environment):
+    # Methods run as phases of the same name when hooks are added
+    HOOKED_PHASES = ("initialize", "run_step", "get_state", "step_agents", "sweep_dead")
+
+    # Set by add_hook()
+    _hooks: Tuple[SimulationHook, ...] = ()
+
+    def __init__(
+        self, environment: Environment, scheduler: Optional["Scheduler"] = None
+    ):
         """
         Initialize a Simulation object.
 
         Args:
             environment (Environment): The environment object in which the simulation will run.
+            scheduler (Optional[Scheduler]): How step_agents() activates agents.
+                Defaults to a SequentialScheduler.
         """
         self.environment = environment
+        self.scheduler = scheduler
+        # Watched organisms that died since the last sweep, in order of death
+        self.dead: Dict[Organism, None] = {}
 
     @abstractmethod
     def initialize(self) -> None:
@@ -273,6 +569,213 @@ class Simulation(ABC):
         while not self.is_complete():
             self.run_step()
 
+    def step_agents(self, agents: Optional[Sequence[Entity]] = None) -> None:
+        """
+        Activate agents for one step with the scheduler.
+
+        Simulations call this from run_step() instead of looping over their
+        agents themselves.
+
+        Args:
+            agents (Optional[Sequence[Entity]]): The agents to activate.
+                Defaults to the entities of the environment.
+        """
+        if self.scheduler is None:
+            from alife.schedulers import SequentialScheduler
+
+            self.scheduler = SequentialScheduler()
+        if agents is None:
+            agents = self.environment.get_entities()
+        self.scheduler.step(agents, self.environment)
+
+    def watch(self, organism: Organism) -> None:
+        """
+        Start tracking when an organism dies.
+
+        From then on the organism reports its own death, so the simulation
+        never has to ask every organism whether it is alive. Only deaths
+        caused by resources that report changes are noticed.
+
+        Args:
+            organism (Organism): The organism to watch.
+        """
+        organism._simulation = self
+        if not organism.is_alive():
+            self.dead[organism] = None
+
+    def sweep_dead(self) -> List[Organism]:
+        """
+        Remove every watched organism that died since the last sweep.
+
+        Dead organisms are removed from the environment if they are still in
+        it and are no longer watched.
+
+        Returns:
+            List[Organism]: The removed organisms, in the order they died.
+        """
+        swept = [organism for organism in self.dead if not organism.is_alive()]
+        self.dead.clear()
+        for organism in swept:
+            organism._simulation = None
+            try:
+                self.environment.remove_entity(organism)
+            except ValueError:
+                pass  # Already removed from the environment
+        return swept
+
+    def add_hook(self, hook: SimulationHook) -> None:
+        """
+        Call a hook around every phase of the simulation.
+
+        The hooks run around initialize(), run_step(), get_state(),
+        step_agents(), sweep_dead() and the update() of the environment,
+        including any environment assigned later, and around blocks marked
+        with phase().
+
+        While the simulation has hooks, it and its environment are instances
+        of subclasses of their classes that run these methods as phases, so
+        without hooks they run unchanged.
+
+        Args:
+            hook (SimulationHook): The hook to add.
+        """
+        if not self._hooks:
+            self.__class__ = _hooked_class(
+                type(self), self.HOOKED_PHASES, of_simulation=True
+            )
+            _hook_environment(self)
+        self._hooks = self._hooks + (hook,)
+
+    def remove_hook(self, hook: SimulationHook) -> None:
+        """
+        Stop calling a hook added by add_hook().
+
+        Args:
+            hook (SimulationHook): The hook to remove.
+
+        Raises:
+            ValueError: If the hook was not added.
+        """
+        if hook not in self._hooks:
+            raise ValueError("Hook not found in simulation")
+        hooks = list(self._hooks)
+        hooks.remove(hook)
+        self._hooks = tuple(hooks)
+        if not hooks:
+            _unhook_environment(self)
+            self.__class__ = type(self)._unhooked_class
+
+    def phase(self, name: str):
+        """
+        Mark a block of code as a phase for the hooks.
+
+        Simulations use this for work worth measuring on its own, such as
+        resource bookkeeping:
+
+            with self.phase("resources"):
+                ...
+
+        Args:
+            name (str): The name of the phase.
+
+        Returns:
+            A context manager, which does nothing when there are no hooks.
+        """
+        if not self._hooks:
+            return _NO_PHASE
+        return self._run_phase(name)
+
+    @contextmanager
+    def _run_phase(self, name: str) -> Iterator[None]:
+        hooks = self._hooks
+        for hook in hooks:
+            hook.before(self, name)
+        try:
+            yield
+        finally:
+            for hook in reversed(hooks):
+                hook.after(self, name)
+
+    def save_checkpoint(
+        self, path: str, pack_bits: bool = False, compress: bool = False
+    ) -> None:
+        """
+        Save the state of the simulation to a file.
+
+        Arrays such as grids are written as raw NumPy buffers after a small
+        JSON header, so they can be read back without parsing.
+
+        Args:
+            path (str): The file to write.
+            pack_bits (bool): Store boolean grids eight cells per byte. Packed
+                arrays cannot be memory-mapped when loaded.
+            compress (bool): Compress arrays with zlib. Compressed arrays
+                cannot be memory-mapped when loaded.
+
+        Raises:
+            NotImplementedError: If the simulation does not support
+                checkpoints.
+        """
+        metadata, arrays = self._checkpoint_state()
+        checkpoint.save_checkpoint(
+            path, type(self).__name__, metadata, arrays, pack_bits, compress
+        )
+
+    def load_checkpoint(self, path: str, mmap: bool = False) -> None:
+        """
+        Restore a state saved by save_checkpoint().
+
+        The simulation must have been created with the same parameters as
+        the one that was saved.
+
+        Args:
+            path (str): The file to read.
+            mmap (bool): Map raw arrays from the file instead of reading them,
+                so a large world is paged in only as it is used. Changes to
+                mapped arrays are never written back to the file.
+
+        Raises:
+            ValueError: If the file is not a checkpoint of this kind of
+                simulation or does not match its parameters.
+            NotImplementedError: If the simulation does not support
+                checkpoints.
+        """
+        saved = checkpoint.load_checkpoint(path, mmap)
+        if saved.kind != type(self).__name__:
+            raise ValueError(
+                f"Checkpoint of a {saved.kind} cannot be loaded into a"
+                f" {type(self).__name__}"
+            )
+        self._restore_checkpoint(saved.metadata, saved.arrays)
+
+    def _checkpoint_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """
+        Get the state to save as JSON-serializable metadata and arrays.
+
+        Raises:
+            NotImplementedError: If the simulation does not support
+                checkpoints.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support checkpoints")
+
+    def _restore_checkpoint(
+        self, metadata: Dict[str, Any], arrays: Dict[str, np.ndarray]
+    ) -> None:
+        """
+        Restore the state returned by _checkpoint_state().
+
+        Raises:
+            NotImplementedError: If the simulation does not support
+                checkpoints.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support checkpoints")
+
+    def _organism_changed(self, organism: Organism, alive: bool) -> None:
+        if alive:
+            self.dead.pop(organism, None)
+        else:
+            self.dead[organism] = None
+
     @abstractmethod
     def reset(self) -> None:
         """
@@ -0,0 +1,133 @@
+# alife/environments/fields.py
+
+from typing import Optional
+
+import numpy as np
+
+from alife.environments.neighborhood import GridTopology
+
+
+class ResourceField:
+    """
+    A resource spread over the cells of a grid, such as food or a chemical.
+
+    The amount in every cell is held in one (height, width) float array, and
+    step() advances all cells at once: the resource first diffuses to the
+    neighbors given by the topology, then decays by a fraction of what each
+    cell holds, then regenerates by a fixed amount per cell up to a capacity.
+    """
+
+    def __init__(
+        self,
+        topology: GridTopology,
+        initial=0.0,
+        regeneration_rate=0.0,
+        decay_rate: float = 0.0,
+        diffusion_rate: float = 0.0,
+        capacity: float = float("inf"),
+    ):
+        """
+        Initialize a field.
+
+        Args:
+            topology (GridTopology): The grid size, neighborhood and boundary.
+                With fixed boundaries, resource diffuses off the edge and is
+                lost.
+            initial: The amount in every cell, or a (height, width) array.
+            regeneration_rate: The amount added to every cell per step, or a
+                (height, width) array.
+            decay_rate (float): The fraction of each cell lost per step.
+            diffusion_rate (float): The fraction of the difference between
+                each cell and the mean of its neighbors that moves per step.
+            capacity (float): The most a cell regenerates to.
+
+        Raises:
+            ValueError: If a rate is negative, or decay_rate or
+                diffusion_rate is more than 1.
+        """
+        if not 0 <= decay_rate <= 1:
+            raise ValueError("decay_rate must be between 0 and 1")
+        if not 0 <= diffusion_rate <= 1:
+            raise ValueError("diffusion_rate must be between 0 and 1")
+        shape = (topology.height, topology.width)
+        self.topology = topology
+        self.levels = np.maximum(
+            np.broadcast_to(np.asarray(initial, dtype=np.float64), shape), 0.0
+        )
+        self.regeneration_rate = np.asarray(regeneration_rate, dtype=np.float64)
+        if (self.regeneration_rate < 0).any():
+            raise ValueError("regeneration_rate cannot be negative")
+        self.decay_rate = decay_rate
+        self.diffusion_rate = diffusion_rate
+        self.capacity = capacity
+
+    def total(self) -> float:
+        """The amount of resource on the whole grid."""
+        return float(self.levels.sum())
+
+    def step(self) -> None:
+        """Diffuse, decay and regenerate every cell once."""
+        levels = self.levels
+        if self.diffusion_rate:
+            mean = self.topology.neighbor_sum(levels) / len(self.topology.neighborhood)
+            levels += self.diffusion_rate * (mean - levels)
+        if self.decay_rate:
+            levels *= 1.0 - self.decay_rate
+        if self.regeneration_rate.any():
+            below = levels < self.capacity
+            regenerated = np.minimum(levels + self.regeneration_rate, self.capacity)
+            np.copyto(levels, regenerated, where=below)
+
+    def harvest(self, xs, ys, amounts, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Take resource from many cells at once.
+
+        Each request gets as much of its amount as its cell still holds.
+        When several requests name the same cell, earlier ones are served
+        first.
+
+        Args:
+            xs: An array-like of N columns.
+            ys: An array-like of N rows.
+            amounts: The amount wanted by each request, or one amount for all.
+            mask (Optional[np.ndarray]): Which requests to serve. Defaults to
+                all.
+
+        Returns:
+            np.ndarray: The (N,) amounts actually taken.
+
+        Raises:
+            ValueError: If an amount is negative.
+        """
+        xs = np.asarray(xs, dtype=np.int64).reshape(-1)
+        ys = np.asarray(ys, dtype=np.int64).reshape(-1)
+        wanted = np.broadcast_to(np.asarray(amounts, dtype=np.float64), xs.shape)
+        if (wanted < 0).any():
+            raise ValueError("Cannot harvest negative amount of resource.")
+        if mask is not None:
+            wanted = np.where(mask, wanted, 0.0)
+        flat = self.levels.reshape(-1)
+        cells = ys * self.topology.width + xs
+        if len(cells) == 0:
+            return np.zeros(0)
+
+        # Group requests by cell, keeping their order within each group, and
+        # count how much of the cell the requests before each one used up
+        order = np.argsort(cells, kind="stable")
+        sorted_cells = cells[order]
+        sorted_wanted = wanted[order]
+        requested = np.cumsum(sorted_wanted)
+        starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+        group_offset = np.repeat(
+            requested[starts] - sorted_wanted[starts],
+            np.diff(np.r_[starts, len(cells)]),
+        )
+        before = requested - sorted_wanted - group_offset
+        taken = np.clip(flat[sorted_cells] - before, 0.0, sorted_wanted)
+
+        np.subtract.at(flat, sorted_cells, taken)
+        # Rounding in the running sums must not leave a cell below zero
+        np.maximum(flat, 0.0, out=flat)
+        result = np.empty_like(taken)
+        result[order] = taken
+        return result
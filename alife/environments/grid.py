@@ -1,16 +1,101 @@
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from alife.core import Entity, Environment
+from alife.environments.fields import ResourceField
+from alife.environments.neighborhood import MOORE, GridTopology, Neighborhood
+from alife.utils.views import read_only
+
+
+class EntitiesView(Sequence[Entity]):
+    """
+    A read-only list of the entities in a grid, in the order they were added.
+
+    Membership, length and iteration come straight from the grid's position
+    index; indexing goes through a list that is rebuilt only after entities
+    are added or removed.
+    """
+
+    def __init__(self, environment: "GridEnvironment"):
+        self._environment = environment
+
+    def __len__(self) -> int:
+        return len(self._environment._positions)
+
+    def __iter__(self) -> Iterator[Entity]:
+        return iter(self._environment._positions)
+
+    def __contains__(self, entity: object) -> bool:
+        return entity in self._environment._positions
+
+    def __getitem__(self, index):
+        return self._environment._entity_list()[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (EntitiesView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EntitiesView({list(self)!r})"
 
 
 class GridEnvironment(Environment):
-    def __init__(self, width: int, height: int):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        neighborhood: Neighborhood = MOORE,
+        boundary: str = "toroidal",
+    ):
+        """
+        Initialize an empty grid.
+
+        Args:
+            width (int): The number of columns.
+            height (int): The number of rows.
+            neighborhood (Neighborhood): The cells returned as neighbors.
+                Defaults to the eight surrounding cells, with dx varying
+                slowest.
+            boundary (str): How moves and neighbors past the edge are handled,
+                one of BOUNDARIES. With "fixed", moves off the grid fail and
+                neighbors off the grid are reported as empty.
+        """
         self.width = width
         self.height = height
+        self.topology = GridTopology(width, height, neighborhood, boundary)
         self.grid: List[List[Entity]] = [
             [None for _ in range(width)] for _ in range(height)
         ]
-        self.entities: List[Entity] = []
+        # Position of every entity, in the order the entities were added
+        self._positions: Dict[Entity, Tuple[int, int]] = {}
+        # The entities as a list, for indexing; None until it is needed again
+        self._entities: Optional[List[Entity]] = None
+        # Id of the entity in each cell, -1 for empty cells
+        self.occupancy = np.full((height, width), -1, dtype=np.int64)
+        self._ids: Dict[Entity, int] = {}
+        self._by_id: Dict[int, Entity] = {}
+        self._next_id = 0
+        self.fields: Dict[str, ResourceField] = {}
+        # Incremented whenever an entity or a field changes
+        self.version = 0
+
+    @property
+    def entities(self) -> EntitiesView:
+        """
+        The entities in the order they were added, as a read-only list.
+
+        The view supports indexing, len() and fast membership tests, and shows
+        later additions and removals. Use add_entity() and remove_entity() to
+        change it.
+        """
+        return EntitiesView(self)
+
+    def _entity_list(self) -> List[Entity]:
+        if self._entities is None:
+            self._entities = list(self._positions)
+        return self._entities
 
     def get_state(self) -> List[List[Any]]:
         return [
@@ -18,61 +103,228 @@ class GridEnvironment(Environment):
             for row in self.grid
         ]
 
+    def state_view(self) -> Dict[str, Any]:
+        """
+        Get the state as read-only arrays instead of nested lists.
+
+        Unlike get_state(), nothing is copied: the arrays follow later
+        changes, so copy them to keep a snapshot. Compare version with its
+        previous value to skip work when nothing changed.
+
+        Returns:
+            Dict[str, Any]: The version, the occupancy array of entity ids
+            (-1 for empty cells, see get_entity()) and the levels of every
+            field by name.
+        """
+        return {
+            "version": self.version,
+            "occupancy": read_only(self.occupancy),
+            "fields": {
+                name: read_only(field.levels) for name, field in self.fields.items()
+            },
+        }
+
     def update(self) -> None:
-        # In this simple implementation, the environment doesn't change on its own
-        pass
+        if self.fields:
+            self.version += 1
+        for field in self.fields.values():
+            field.step()
+
+    def add_field(self, name: str, **kwargs: Any) -> ResourceField:
+        """
+        Add a resource layer over the grid, advanced by every update().
+
+        Args:
+            name (str): The name of the field.
+            **kwargs: Arguments of ResourceField other than the topology,
+                such as initial, regeneration_rate, decay_rate,
+                diffusion_rate and capacity.
+
+        Returns:
+            ResourceField: The new field.
+
+        Raises:
+            ValueError: If a field with that name already exists.
+        """
+        if name in self.fields:
+            raise ValueError(f"Field {name} already exists")
+        field = ResourceField(self.topology, **kwargs)
+        self.fields[name] = field
+        self.version += 1
+        return field
+
+    def harvest(
+        self, name: str, amounts, entities: Optional[List[Entity]] = None
+    ) -> np.ndarray:
+        """
+        Let many entities take resource from the cells they stand on.
+
+        Args:
+            name (str): The name of the field.
+            amounts: The amount each entity wants, or one amount for all.
+            entities (Optional[List[Entity]]): The entities harvesting.
+                Defaults to all entities, in the order of entities.
+
+        Returns:
+            np.ndarray: The amount each entity took, at most what its cell
+            held.
+        """
+        if entities is None:
+            positions = self.get_positions()
+        else:
+            positions = np.array(
+                [self._find_entity(entity) for entity in entities], dtype=np.int64
+            ).reshape(-1, 2)
+        self.version += 1
+        return self.fields[name].harvest(positions[:, 0], positions[:, 1], amounts)
 
     def interact(self, entity: Entity, action: str, **kwargs) -> Dict[str, Any]:
         if action == "move":
             return self._move_entity(entity, kwargs.get("x", 0), kwargs.get("y", 0))
         elif action == "get_neighbors":
             return self._get_neighbors(kwargs.get("x", 0), kwargs.get("y", 0))
+        elif action == "harvest":
+            taken = self.harvest(kwargs["field"], kwargs.get("amount", 0), [entity])
+            return {"success": True, "amount": float(taken[0])}
         else:
             raise ValueError(f"Invalid action: {action}")
 
     def add_entity(self, entity: Entity, x: int, y: int) -> None:
+        if entity in self._positions:
+            raise ValueError("Entity is already in the environment")
         if self.grid[y][x] is not None:
             raise ValueError(f"Cell ({x}, {y}) is already occupied")
+        self.version += 1
         self.grid[y][x] = entity
-        self.entities.append(entity)
+        self._positions[entity] = (x, y)
+        self._entities = None
+        self._ids[entity] = self._next_id
+        self._by_id[self._next_id] = entity
+        self.occupancy[y, x] = self._next_id
+        self._next_id += 1
 
     def remove_entity(self, entity: Entity) -> None:
-        if entity not in self.entities:
+        position = self._positions.pop(entity, None)
+        if position is None:
             raise ValueError("Entity not found in the environment")
-        self.entities.remove(entity)
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] == entity:
-                    self.grid[y][x] = None
-                    return
+        self.version += 1
+        self._entities = None
+        x, y = position
+        self.grid[y][x] = None
+        self.occupancy[y, x] = -1
+        del self._by_id[self._ids.pop(entity)]
 
     def get_entities(self) -> List[Entity]:
-        return self.entities
+        return list(self._positions)
+
+    def entity_id(self, entity: Entity) -> int:
+        """
+        Get the id under which an entity appears in occupancy.
+
+        Ids are given out in the order entities are added and are not reused.
+
+        Args:
+            entity (Entity): An entity in the environment.
+
+        Returns:
+            int: The id of the entity.
+        """
+        entity_id = self._ids.get(entity)
+        if entity_id is None:
+            raise ValueError("Entity not found in the environment")
+        return entity_id
+
+    def get_entity(self, entity_id: int) -> Entity:
+        """
+        Get the entity with the given id.
+
+        Args:
+            entity_id (int): An id from occupancy or neighbor_ids().
+
+        Returns:
+            Entity: The entity with that id.
+        """
+        entity = self._by_id.get(int(entity_id))
+        if entity is None:
+            raise ValueError(f"No entity with id {entity_id}")
+        return entity
+
+    def get_positions(self) -> np.ndarray:
+        """
+        Get the positions of all entities.
+
+        Returns:
+            np.ndarray: An (N, 2) int array of (x, y) positions, in the order
+            of entities.
+        """
+        positions = np.array(list(self._positions.values()), dtype=np.int64)
+        return positions.reshape(-1, 2)
+
+    def neighbor_ids(self, xs, ys) -> np.ndarray:
+        """
+        Get the ids of the neighbors of many cells at once.
+
+        Args:
+            xs: An array-like of N columns.
+            ys: An array-like of N rows.
+
+        Returns:
+            np.ndarray: An (N, k) int array of entity ids for the k cells of
+            the neighborhood, -1 for empty cells and cells off the grid, with
+            neighbors in the same order as the "get_neighbors" action.
+        """
+        nx, ny, inside = self.topology.neighbors(xs, ys)
+        ids = self.occupancy[ny, nx]
+        if inside is not None:
+            ids[~inside] = -1
+        return ids
+
+    def count_neighbors(self, xs, ys) -> np.ndarray:
+        """
+        Count the occupied neighbors of many cells at once.
+
+        Args:
+            xs: An array-like of N columns.
+            ys: An array-like of N rows.
+
+        Returns:
+            np.ndarray: An (N,) int array of occupied neighbor counts.
+        """
+        return (self.neighbor_ids(xs, ys) >= 0).sum(axis=1)
 
     def _move_entity(self, entity: Entity, dx: int, dy: int) -> Dict[str, Any]:
         old_x, old_y = self._find_entity(entity)
-        new_x, new_y = (old_x + dx) % self.width, (old_y + dy) % self.height
+        target = self.topology.resolve(old_x + dx, old_y + dy)
+        if target is None:
+            return {"success": False, "message": "Target cell is outside the grid"}
+        new_x, new_y = target
 
         if self.grid[new_y][new_x] is not None:
             return {"success": False, "message": "Target cell is occupied"}
 
+        self.version += 1
         self.grid[old_y][old_x] = None
         self.grid[new_y][new_x] = entity
+        self._positions[entity] = (new_x, new_y)
+        self.occupancy[new_y, new_x] = self.occupancy[old_y, old_x]
+        self.occupancy[old_y, old_x] = -1
         return {"success": True, "new_position": (new_x, new_y)}
 
     def _get_neighbors(self, x: int, y: int) -> Dict[str, Any]:
-        neighbors = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = (x + dx) % self.width, (y + dy) % self.height
-                neighbors.append(self.grid[ny][nx])
+        grid = self.grid
+        topology = self.topology
+        columns, rows = topology.column_neighbors[x], topology.row_neighbors[y]
+        if topology.boundary == "fixed":
+            neighbors: List[Optional[Entity]] = [
+                grid[ny][nx] if nx >= 0 and ny >= 0 else None
+                for nx, ny in zip(columns, rows)
+            ]
+        else:
+            neighbors = [grid[ny][nx] for nx, ny in zip(columns, rows)]
         return {"neighbors": neighbors}
 
     def _find_entity(self, entity: Entity) -> Tuple[int, int]:
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] == entity:
-                    return x, y
-        raise ValueError("Entity not found in the grid")
+        position = self._positions.get(entity)
+        if position is None:
+            raise ValueError("Entity not found in the grid")
+        return position
@@ -0,0 +1,316 @@
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# How coordinates past the edge of a grid are treated. "toroidal" wraps them
+# around to the opposite edge, "fixed" treats them as outside the grid (empty
+# or dead), and "reflecting" mirrors them at the edge, so the cell just past
+# an edge is the edge cell itself.
+BOUNDARIES = ("toroidal", "fixed", "reflecting")
+
+_PAD_MODES = {"toroidal": "wrap", "fixed": "constant", "reflecting": "symmetric"}
+
+
+class Neighborhood:
+    """
+    The offsets (dx, dy) of the cells that count as neighbors of a cell.
+    """
+
+    def __init__(self, offsets: Iterable[Tuple[int, int]]):
+        """
+        Initialize a neighborhood from its offsets.
+
+        Args:
+            offsets (Iterable[Tuple[int, int]]): The (dx, dy) offsets, in the
+                order neighbors are returned.
+
+        Raises:
+            ValueError: If there are no offsets or they include (0, 0).
+        """
+        self.offsets = tuple((int(dx), int(dy)) for dx, dy in offsets)
+        if not self.offsets:
+            raise ValueError("A neighborhood needs at least one offset")
+        if (0, 0) in self.offsets:
+            raise ValueError("A neighborhood cannot include the cell itself")
+        self.dx = np.array([dx for dx, _ in self.offsets], dtype=np.int64)
+        self.dy = np.array([dy for _, dy in self.offsets], dtype=np.int64)
+        self.dx.flags.writeable = False
+        self.dy.flags.writeable = False
+        self.radius = max(max(abs(dx), abs(dy)) for dx, dy in self.offsets)
+
+    @classmethod
+    def moore(cls, radius: int = 1) -> "Neighborhood":
+        """The (2 * radius + 1)^2 - 1 cells of the square around a cell."""
+        span = range(-radius, radius + 1)
+        return cls((dx, dy) for dx in span for dy in span if dx or dy)
+
+    @classmethod
+    def von_neumann(cls, radius: int = 1) -> "Neighborhood":
+        """The cells within Manhattan distance radius of a cell."""
+        span = range(-radius, radius + 1)
+        return cls(
+            (dx, dy)
+            for dx in span
+            for dy in span
+            if (dx or dy) and abs(dx) + abs(dy) <= radius
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Neighborhood):
+            return NotImplemented
+        return self.offsets == other.offsets
+
+    def __hash__(self) -> int:
+        return hash(self.offsets)
+
+    def __repr__(self) -> str:
+        return f"Neighborhood({list(self.offsets)!r})"
+
+
+MOORE = Neighborhood.moore()
+VON_NEUMANN = Neighborhood.von_neumann()
+
+
+def _resolve(coordinate: int, size: int, boundary: str) -> int:
+    # The cell that coordinate refers to, or -1 if it is outside the grid
+    if boundary == "toroidal":
+        return coordinate % size
+    if boundary == "reflecting":
+        coordinate %= 2 * size
+        return coordinate if coordinate < size else 2 * size - 1 - coordinate
+    return coordinate if 0 <= coordinate < size else -1
+
+
+class GridTopology:
+    """
+    A neighborhood and a boundary mode applied to a grid of a given size.
+
+    For each axis, the cell referred to by every coordinate from -radius to
+    size + radius - 1 is computed once, so looking up neighbors is a gather
+    from these small tables rather than modulo arithmetic on every access.
+    For loops over single cells, column_neighbors[x] and row_neighbors[y]
+    hold the neighbor coordinates of column x and row y through each offset,
+    in order, with -1 for coordinates outside a grid with fixed boundaries.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        neighborhood: Neighborhood = MOORE,
+        boundary: str = "toroidal",
+    ):
+        """
+        Initialize the lookup tables for a grid.
+
+        Args:
+            width (int): The number of columns.
+            height (int): The number of rows.
+            neighborhood (Neighborhood): The cells that count as neighbors.
+            boundary (str): One of BOUNDARIES.
+
+        Raises:
+            ValueError: If the boundary is unknown.
+        """
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"Invalid boundary: {boundary}")
+        self.width = width
+        self.height = height
+        self.neighborhood = neighborhood
+        self.boundary = boundary
+        radius = neighborhood.radius
+        self.x_table = np.array(
+            [_resolve(x, width, boundary) for x in range(-radius, width + radius)]
+        )
+        self.y_table = np.array(
+            [_resolve(y, height, boundary) for y in range(-radius, height + radius)]
+        )
+        self._x_list = self.x_table.tolist()
+        self._y_list = self.y_table.tolist()
+        self.column_neighbors: List[Tuple[int, ...]] = [
+            tuple(self._x_list[x + dx + radius] for dx, _ in neighborhood.offsets)
+            for x in range(width)
+        ]
+        self.row_neighbors: List[Tuple[int, ...]] = [
+            tuple(self._y_list[y + dy + radius] for _, dy in neighborhood.offsets)
+            for y in range(height)
+        ]
+        self._inverse: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    @property
+    def is_default(self) -> bool:
+        """Whether this is the radius-1 Moore neighborhood on a torus."""
+        return self.neighborhood == MOORE and self.boundary == "toroidal"
+
+    def resolve(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """
+        Map a possibly out-of-range position to a cell of the grid.
+
+        Args:
+            x (int): The column.
+            y (int): The row.
+
+        Returns:
+            Optional[Tuple[int, int]]: The (x, y) cell, or None if the
+            position is outside a grid with fixed boundaries.
+        """
+        radius = self.neighborhood.radius
+        if -radius <= x < self.width + radius:
+            x = self._x_list[x + radius]
+        else:
+            x = _resolve(x, self.width, self.boundary)
+        if -radius <= y < self.height + radius:
+            y = self._y_list[y + radius]
+        else:
+            y = _resolve(y, self.height, self.boundary)
+        if x < 0 or y < 0:
+            return None
+        return x, y
+
+    def cell_neighbors(self, x: int, y: int) -> List[Optional[Tuple[int, int]]]:
+        """
+        Get the neighbors of one cell.
+
+        Args:
+            x (int): The column of the cell.
+            y (int): The row of the cell.
+
+        Returns:
+            List[Optional[Tuple[int, int]]]: The (x, y) cell for each offset of
+            the neighborhood, in order, or None for offsets that fall outside
+            a grid with fixed boundaries.
+        """
+        return [
+            None if nx < 0 or ny < 0 else (nx, ny)
+            for nx, ny in zip(self.column_neighbors[x], self.row_neighbors[y])
+        ]
+
+    def neighbors(self, xs, ys) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Get the neighbors of many cells at once.
+
+        Args:
+            xs: An array-like of N columns.
+            ys: An array-like of N rows.
+
+        Returns:
+            Tuple of the (N, k) columns and rows of the neighbors, for the k
+            offsets of the neighborhood, and an (N, k) bool mask of the
+            neighbors inside the grid. The mask is None unless the boundary
+            is fixed, since every neighbor is inside otherwise; masked-out
+            entries hold -1.
+        """
+        radius = self.neighborhood.radius
+        xs = np.asarray(xs, dtype=np.int64).reshape(-1, 1)
+        ys = np.asarray(ys, dtype=np.int64).reshape(-1, 1)
+        nx = self.x_table[xs + (self.neighborhood.dx + radius)]
+        ny = self.y_table[ys + (self.neighborhood.dy + radius)]
+        if self.boundary != "fixed":
+            return nx, ny, None
+        inside = (nx >= 0) & (ny >= 0)
+        return np.where(inside, nx, -1), np.where(inside, ny, -1), inside
+
+    def reverse_neighbors(self, xs, ys) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get every cell that has one of many cells as a neighbor.
+
+        For a symmetric neighborhood on a toroidal grid these are the
+        neighbors of the cells, but in general they are not: a cell may see
+        a neighbor that does not see it back, and a reflecting edge can make
+        two cells see the same one through the same offset.
+
+        Args:
+            xs: An array-like of N columns.
+            ys: An array-like of N rows.
+
+        Returns:
+            Tuple of the columns and rows of those cells, as flat arrays. A
+            cell appears once for every offset through which it sees one of
+            the given cells.
+        """
+        if self._inverse is None:
+            self._inverse = (
+                self._inverse_table(self.x_table, self.width, self.neighborhood.dx),
+                self._inverse_table(self.y_table, self.height, self.neighborhood.dy),
+            )
+        inverse_x, inverse_y = self._inverse
+        xs = np.asarray(xs, dtype=np.int64).reshape(-1)
+        ys = np.asarray(ys, dtype=np.int64).reshape(-1)
+        # (k, N, slots) candidates on each axis, combined into every pair
+        px = inverse_x[:, xs, :, None]
+        py = inverse_y[:, ys, None, :]
+        px, py = np.broadcast_arrays(px, py)
+        found = (px >= 0) & (py >= 0)
+        return px[found], py[found]
+
+    def _inverse_table(
+        self, table: np.ndarray, size: int, offsets: np.ndarray
+    ) -> np.ndarray:
+        # For each offset d and coordinate c, the coordinates p whose
+        # neighbor through d is c, padded with -1. Per axis there is at most
+        # one for toroidal and fixed boundaries and two for reflecting ones.
+        radius = self.neighborhood.radius
+        slots = 2 if self.boundary == "reflecting" else 1
+        inverse = np.full((len(offsets), size, slots), -1, dtype=np.int64)
+        sources = np.arange(size)
+        for k, offset in enumerate(offsets):
+            targets = table[sources + offset + radius]
+            valid = targets >= 0
+            found, targets = sources[valid], targets[valid]
+            # Later writes win, so write in reverse to keep the first source
+            inverse[k, targets[::-1], 0] = found[::-1]
+            rest = found != inverse[k, targets, 0]
+            if slots == 2:
+                inverse[k, targets[rest], 1] = found[rest]
+        return inverse
+
+    def pad(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Surround a grid with a halo of radius cells following the boundary.
+
+        Args:
+            cells (np.ndarray): A (height, width) array.
+
+        Returns:
+            np.ndarray: A (height + 2 * radius, width + 2 * radius) array in
+            which cell (x, y) of the grid is at [y + radius, x + radius].
+        """
+        return np.pad(cells, self.neighborhood.radius, mode=_PAD_MODES[self.boundary])
+
+    def neighbor_sum(self, values: np.ndarray) -> np.ndarray:
+        """
+        Sum the values of the neighbors of every cell.
+
+        Args:
+            values (np.ndarray): A (height, width) array. Cells past a fixed
+                boundary count as 0.
+
+        Returns:
+            np.ndarray: A (height, width) array of sums, of the dtype of
+            values.
+        """
+        radius = self.neighborhood.radius
+        padded = self.pad(values)
+        total = np.zeros((self.height, self.width), dtype=values.dtype)
+        for dx, dy in self.neighborhood.offsets:
+            total += padded[
+                radius + dy : radius + dy + self.height,
+                radius + dx : radius + dx + self.width,
+            ]
+        return total
+
+    def count(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Count the live neighbors of every cell.
+
+        Args:
+            cells (np.ndarray): A (height, width) bool array.
+
+        Returns:
+            np.ndarray: A (height, width) array of neighbor counts.
+        """
+        dtype = np.uint8 if len(self.neighborhood) < 256 else np.uint16
+        return self.neighbor_sum(np.asarray(cells).astype(dtype))
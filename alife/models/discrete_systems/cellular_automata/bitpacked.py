@@ -0,0 +1,206 @@
+# alife/models/cellular_automata/bitpacked.py
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from alife.models.discrete_systems.cellular_automata.rules import CONWAY, LifeRule
+
+# Cells are stored 64 per word, least significant bit first: cell x of a row
+# lives in word x // 64 at bit x % 64. Bits past the row width are kept at zero.
+WORD_BITS = 64
+
+# Rows stepped at a time, which bounds the size of the temporary bit planes.
+BLOCK_ROWS = 256
+
+_ONE = np.uint64(1)
+_MSB = np.uint64(WORD_BITS - 1)
+
+
+def words_per_row(width: int) -> int:
+    return (width + WORD_BITS - 1) // WORD_BITS
+
+
+def pack_grid(cells) -> np.ndarray:
+    """
+    Pack a 2-D bool grid into rows of uint64 words.
+
+    Args:
+        cells: A (height, width) array-like of booleans.
+
+    Returns:
+        np.ndarray: A (height, ceil(width / 64)) array of uint64 words.
+    """
+    cells = np.asarray(cells, dtype=bool)
+    height, width = cells.shape
+    padded = np.zeros((height, words_per_row(width) * WORD_BITS), dtype=bool)
+    padded[:, :width] = cells
+    packed = np.packbits(padded, axis=1, bitorder="little")
+    return packed.view("<u8").astype(np.uint64)
+
+
+def unpack_grid(words: np.ndarray, width: int) -> np.ndarray:
+    """
+    Unpack rows of uint64 words into a 2-D bool grid.
+
+    Args:
+        words (np.ndarray): A (height, ceil(width / 64)) array of uint64 words.
+        width (int): The number of cells per row.
+
+    Returns:
+        np.ndarray: A (height, width) bool array.
+    """
+    as_bytes = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    bits = np.unpackbits(as_bytes, axis=1, bitorder="little")
+    return bits[:, :width].astype(bool)
+
+
+def _last_word_mask(width: int) -> np.uint64:
+    used = width % WORD_BITS
+    if used == 0:
+        return np.uint64(0xFFFFFFFFFFFFFFFF)
+    return np.uint64((1 << used) - 1)
+
+
+def _from_west(rows: np.ndarray, width: int) -> np.ndarray:
+    # result[x] = rows[(x - 1) % width]
+    out = rows << _ONE
+    out[:, 1:] |= rows[:, :-1] >> _MSB
+    out[:, 0] |= (rows[:, -1] >> np.uint64((width - 1) % WORD_BITS)) & _ONE
+    out[:, -1] &= _last_word_mask(width)
+    return out
+
+
+def _from_east(rows: np.ndarray, width: int) -> np.ndarray:
+    # result[x] = rows[(x + 1) % width]
+    out = rows >> _ONE
+    out[:, :-1] |= rows[:, 1:] << _MSB
+    out[:, -1] |= (rows[:, 0] & _ONE) << np.uint64((width - 1) % WORD_BITS)
+    return out
+
+
+def neighbor_count_planes(
+    rows: np.ndarray, width: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Count the eight toroidal neighbors of every cell with full-adder logic.
+
+    Args:
+        rows (np.ndarray): Packed rows with one halo row above and below, so the
+            counts are produced for rows[1:-1].
+        width (int): The number of cells per row.
+
+    Returns:
+        Tuple of four bit planes (s0, s1, s2, s3) holding the binary digits of
+        the neighbor count for each cell.
+    """
+    west = _from_west(rows, width)
+    east = _from_east(rows, width)
+
+    # Horizontal sums: three cells (with the center) for the rows above and
+    # below, two cells (without it) for the middle row.
+    w_xor_e = west ^ east
+    h3_0 = w_xor_e ^ rows
+    h3_1 = (west & east) | (rows & w_xor_e)
+    m0 = w_xor_e[1:-1]
+    m1 = (west & east)[1:-1]
+    t0, t1 = h3_0[:-2], h3_1[:-2]
+    u0, u1 = h3_0[2:], h3_1[2:]
+
+    # Weight 1 column
+    t_xor_m = t0 ^ m0
+    s0 = t_xor_m ^ u0
+    carry = (t0 & m0) | (u0 & t_xor_m)
+
+    # Weight 2 column: t1 + m1 + u1 + carry
+    t1_xor_m1 = t1 ^ m1
+    x = t1_xor_m1 ^ u1
+    y = (t1 & m1) | (u1 & t1_xor_m1)
+    s1 = x ^ carry
+    z = x & carry
+
+    # Weight 4 and 8 columns
+    s2 = y ^ z
+    s3 = y & z
+    return s0, s1, s2, s3
+
+
+def apply_rule_planes(
+    planes: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+    alive: np.ndarray,
+    rule: LifeRule,
+) -> np.ndarray:
+    """
+    Combine neighbor count bit planes with the current cells under a rule.
+
+    Args:
+        planes: The (s0, s1, s2, s3) planes from neighbor_count_planes().
+        alive (np.ndarray): The packed current cells.
+        rule (LifeRule): The rule to apply.
+
+    Returns:
+        np.ndarray: The packed next generation, including any padding bits set
+        by rules with birth on zero neighbors.
+    """
+    s0, s1, s2, s3 = planes
+    if rule == CONWAY:
+        # Live next generation: exactly three neighbors, or two and alive
+        return ~s3 & ~s2 & s1 & (s0 | alive)
+
+    bits = planes
+    inverted = tuple(~plane for plane in planes)
+    result = np.zeros_like(alive)
+    for count in range(9):
+        born = count in rule.birth
+        survives = count in rule.survival
+        if not (born or survives):
+            continue
+        match = bits[0] if count & 1 else inverted[0]
+        for bit in range(1, 4):
+            match = match & (bits[bit] if count >> bit & 1 else inverted[bit])
+        if born and not survives:
+            match &= ~alive
+        elif survives and not born:
+            match &= alive
+        result |= match
+    return result
+
+
+def step_packed(
+    words: np.ndarray,
+    width: int,
+    out: Optional[np.ndarray] = None,
+    y0: int = 0,
+    y1: Optional[int] = None,
+    rule: LifeRule = CONWAY,
+) -> np.ndarray:
+    """
+    Advance a packed toroidal Game of Life board by one generation.
+
+    Args:
+        words (np.ndarray): The packed board, as returned by pack_grid().
+        width (int): The number of cells per row.
+        out (Optional[np.ndarray]): Buffer for the next generation. It must not
+            be the same array as words.
+        y0 (int): The first row to compute.
+        y1 (Optional[int]): One past the last row to compute. Rows outside
+            [y0, y1) of out are left untouched, so disjoint row ranges can be
+            computed concurrently into the same buffer.
+        rule (LifeRule): The rule to apply.
+
+    Returns:
+        np.ndarray: The packed next generation.
+    """
+    height = words.shape[0]
+    if out is None:
+        out = np.empty_like(words)
+    if y1 is None:
+        y1 = height
+    for start in range(y0, y1, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, y1)
+        rows = words.take(np.arange(start - 1, stop + 1) % height, axis=0)
+        planes = neighbor_count_planes(rows, width)
+        out[start:stop] = apply_rule_planes(planes, rows[1:-1], rule)
+        if 0 in rule.birth:
+            out[start:stop, -1] &= _last_word_mask(width)
+    return out
@@ -1,38 +1,390 @@
 # alife/models/cellular_automata/game_of_life.py
 
-from typing import List, Tuple
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
 
 from alife.core import Environment, Simulation
+from alife.environments.neighborhood import MOORE, GridTopology, Neighborhood
+from alife.models.discrete_systems.cellular_automata.bitpacked import (
+    pack_grid,
+    step_packed,
+    unpack_grid,
+    words_per_row,
+)
+from alife.models.discrete_systems.cellular_automata.hashing import (
+    CycleDetector,
+    GridHasher,
+    hash_words,
+)
+from alife.models.discrete_systems.cellular_automata.hashlife import (
+    HashLifeEnvironment,
+)
+from alife.models.discrete_systems.cellular_automata.rules import (
+    CONWAY,
+    LifeRule,
+    as_rule,
+)
+from alife.utils.views import read_only
+
+# Available update engines. "python" keeps the grid as nested lists and walks
+# every cell; "numpy" keeps a 2-D bool array and updates it with array slicing;
+# "bitpacked" keeps 64 cells per uint64 word and updates them with bitwise
+# adders; "sparse" keeps a bool array and only re-evaluates the neighborhoods
+# of cells that changed in the previous generation.
+BACKENDS = ("python", "numpy", "bitpacked", "sparse")
+
+# GameOfLifeSimulation can also run on HashLifeEnvironment, which jumps many
+# generations at once on boards whose sides are powers of two.
+SIMULATION_BACKENDS = BACKENDS + ("hashlife",)
+
+# Backends that can split an update across a pool of worker threads
+PARALLEL_BACKENDS = ("numpy", "bitpacked")
+
+# Fraction of live cells in the random starting board
+INITIAL_DENSITY = 0.2
+
+# The "sparse" backend falls back to a full update when more than this
+# fraction of the cells changed, since the dense path is faster there.
+SPARSE_DENSE_FRACTION = 1 / 16
+
+# Largest neighborhood whose rule table indices still fit in a byte
+MAX_NEIGHBORS = 126
+
+
+def _step_rows(
+    grid: np.ndarray, out: np.ndarray, y0: int, y1: int, rule: LifeRule
+) -> None:
+    # Rows y0..y1 plus a one-row halo on each side, and a one-cell wrapped
+    # halo on the left and right, turn the toroidal lookups into slices.
+    # Leading axes, if any, index independent boards.
+    height, width = grid.shape[-2:]
+    padded = np.empty(grid.shape[:-2] + (y1 - y0 + 2, width + 2), dtype=np.uint8)
+    padded[..., 1:-1, 1:-1] = grid[..., y0:y1, :]
+    padded[..., 0, 1:-1] = grid[..., (y0 - 1) % height, :]
+    padded[..., -1, 1:-1] = grid[..., y1 % height, :]
+    padded[..., 0] = padded[..., -2]
+    padded[..., -1] = padded[..., 1]
+    rows = padded[..., :-2, :] + padded[..., 1:-1, :] + padded[..., 2:, :]
+    # Sum over the 3x3 block, so the cell itself is included in the total
+    total = rows[..., :-2] + rows[..., 1:-1] + rows[..., 2:]
+    alive = grid[..., y0:y1, :]
+    if rule == CONWAY:
+        out[..., y0:y1, :] = (total == 3) | (alive & (total == 4))
+        return
+    total += padded[..., 1:-1, 1:-1] * np.uint8(10)
+    out[..., y0:y1, :] = rule.apply(total)
+
+
+def step_dense(
+    grid: np.ndarray,
+    rule: LifeRule = CONWAY,
+    topology: Optional[GridTopology] = None,
+) -> np.ndarray:
+    """
+    Advance one or more boards by one generation.
+
+    Args:
+        grid (np.ndarray): A (..., height, width) bool array. Leading axes
+            index independent boards, which is only supported for the default
+            topology.
+        rule (LifeRule): The rule to apply.
+        topology (Optional[GridTopology]): The neighborhood and boundary.
+            Defaults to the eight surrounding cells on a torus.
+
+    Returns:
+        np.ndarray: A new bool array with the next generation.
+    """
+    if topology is not None and not topology.is_default:
+        # Live neighbors from a halo-padded copy, then the same table lookup
+        # as _step_rows: alive * (n + 2) + neighbors + alive
+        neighbors = len(topology.neighborhood)
+        alive = np.asarray(grid, dtype=np.uint8)
+        index = alive * np.uint8(neighbors + 3) + topology.count(grid)
+        return rule.apply(index, neighbors)
+
+    out = np.empty_like(grid)
+    _step_rows(grid, out, 0, grid.shape[-2], rule)
+    return out
+
+
+def random_cells(width: int, height: int, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Draw a random starting board.
+
+    Args:
+        width (int): The number of columns.
+        height (int): The number of rows.
+        seed (Optional[int]): Seed for the random generator. The same seed
+            always gives the same board.
+
+    Returns:
+        np.ndarray: A (height, width) bool array with INITIAL_DENSITY live cells
+        on average.
+    """
+    return np.random.default_rng(seed).random((height, width)) < INITIAL_DENSITY
+
+
+def _step_active(
+    grid: np.ndarray, changed: np.ndarray, rule: LifeRule, topology: GridTopology
+) -> np.ndarray:
+    # Only a changed cell or a cell that sees one can change next; every other
+    # cell sees the same neighborhood as last generation and keeps its value.
+    height, width = grid.shape
+    flat = grid.reshape(-1)
+    ys, xs = np.divmod(changed, width)
+    nx, ny = topology.reverse_neighbors(xs, ys)
+    candidates = np.unique(np.concatenate([changed, ny * width + nx]))
+
+    cy, cx = np.divmod(candidates, width)
+    nx, ny, inside = topology.neighbors(cx, cy)
+    if inside is None:
+        neighbors = flat[ny * width + nx]
+    else:
+        neighbors = flat[np.where(inside, ny * width + nx, 0)] & inside
+    count = len(topology.neighborhood)
+    alive = flat[candidates]
+    index = alive * np.uint8(count + 3) + neighbors.sum(axis=1, dtype=np.uint8)
+    flipped = candidates[rule.apply(index, count) != alive]
+    flat[flipped] = ~flat[flipped]
+    return flipped
 
 
 class GameOfLifeEnvironment(Environment):
-    def __init__(self, width: int, height: int):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        backend: str = "python",
+        workers: int = 1,
+        rule: Union[str, LifeRule] = CONWAY,
+        neighborhood: Neighborhood = MOORE,
+        boundary: str = "toroidal",
+    ):
+        """
+        Initialize a Game of Life board.
+
+        Args:
+            width (int): The number of columns.
+            height (int): The number of rows.
+            backend (str): The update engine, one of BACKENDS.
+            workers (int): The number of threads that update horizontal strips
+                of the board concurrently. Values above 1 are supported by the
+                PARALLEL_BACKENDS, which then alternate between two grid
+                buffers, so a grid returned by get_state() is overwritten two
+                updates later.
+            rule (Union[str, LifeRule]): The Life-like rule to run, as a
+                LifeRule, a rulestring such as "B36/S23", or a name from
+                NAMED_RULES. Defaults to Conway's Game of Life.
+            neighborhood (Neighborhood): The cells counted as neighbors, at
+                most MAX_NEIGHBORS of them. Defaults to the eight surrounding
+                cells; others need the "python", "numpy" or "sparse" backend
+                with one worker.
+            boundary (str): How cells past the edge are treated, one of
+                BOUNDARIES. Cells outside a "fixed" boundary are dead.
+                Boundaries other than "toroidal" have the same restrictions
+                as neighborhoods.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if workers > 1 and backend not in PARALLEL_BACKENDS:
+            raise ValueError(f"The {backend} backend does not support workers")
+        if len(neighborhood) > MAX_NEIGHBORS:
+            raise ValueError(f"Neighborhoods can have at most {MAX_NEIGHBORS} cells")
+        self.topology = GridTopology(width, height, neighborhood, boundary)
+        if not self.topology.is_default and (backend == "bitpacked" or workers > 1):
+            raise ValueError(
+                "Custom neighborhoods and boundaries need a single-threaded"
+                " python, numpy or sparse backend"
+            )
         self.width = width
         self.height = height
-        self.grid = [[False for _ in range(width)] for _ in range(height)]
+        self.backend = backend
+        self.workers = workers
+        self.rule = as_rule(rule)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._back_buffer: Optional[np.ndarray] = None
+        # Flat indices of the cells that changed in the last "sparse" update,
+        # or None when the whole grid has to be re-evaluated.
+        self._changed = None
+        self._tracked_grid = None
+        # Incremented whenever the grid changes
+        self.version = 0
+        if backend in ("numpy", "sparse"):
+            self.grid = np.zeros((height, width), dtype=bool)
+        elif backend == "bitpacked":
+            self.grid = np.zeros((height, words_per_row(width)), dtype=np.uint64)
+        else:
+            self.grid = [[False for _ in range(width)] for _ in range(height)]
+
+    def get_state(self, packed: bool = False) -> Any:
+        """
+        Get the current grid.
 
-    def get_state(self) -> List[List[bool]]:
+        Args:
+            packed (bool): If True, return the grid packed 64 cells per uint64
+                word instead of one value per cell.
+
+        Returns:
+            The grid in the backend's own form (nested lists or a bool array),
+            or a packed uint64 array. The "bitpacked" backend unpacks its
+            words into a new bool array unless packed is True.
+        """
+        if self.backend == "bitpacked":
+            return self.grid if packed else unpack_grid(self.grid, self.width)
+        if packed:
+            return pack_grid(self.grid)
         return self.grid
 
+    def state_view(self) -> Dict[str, Any]:
+        """
+        Get the grid without copying it, for polling.
+
+        Returns:
+            Dict[str, Any]: The version, which changes whenever the grid
+            changes, and the grid as a read-only (height, width) bool array.
+            For the "numpy" and "sparse" backends the grid is a view that
+            follows later in-place changes; copy it to keep a snapshot.
+        """
+        return {"version": self.version, "grid": read_only(self.get_state())}
+
+    def set_grid(self, cells, copy: bool = True) -> None:
+        """
+        Replace the grid with the given cells.
+
+        Args:
+            cells: A (height, width) array-like of booleans.
+            copy (bool): If False, the "numpy" and "sparse" backends use a
+                bool array passed as cells as the grid itself, such as a
+                memory-mapped snapshot, instead of copying it.
+        """
+        self.version += 1
+        if self.backend in ("numpy", "sparse"):
+            if copy:
+                self.grid = np.array(cells, dtype=bool)
+            else:
+                self.grid = np.asarray(cells, dtype=bool)
+            self.mark_dirty()
+        elif self.backend == "bitpacked":
+            self.grid = pack_grid(cells)
+        else:
+            self.grid = np.asarray(cells, dtype=bool).tolist()
+
     def update(self) -> None:
+        self.version += 1
+        if self.workers > 1:
+            self._update_parallel()
+            return
+        if self.backend == "numpy":
+            grid = np.asarray(self.grid, dtype=bool)
+            self.grid = step_dense(grid, self.rule, self.topology)
+            return
+        if self.backend == "sparse":
+            self._update_sparse()
+            return
+        if self.backend == "bitpacked":
+            self.grid = step_packed(self.grid, self.width, rule=self.rule)
+            return
+        birth, survival = self.rule.birth, self.rule.survival
         new_grid = [[False for _ in range(self.width)] for _ in range(self.height)]
         for y in range(self.height):
             for x in range(self.width):
                 live_neighbors = self._count_live_neighbors(x, y)
                 if self.grid[y][x]:
-                    new_grid[y][x] = live_neighbors in [2, 3]
+                    new_grid[y][x] = live_neighbors in survival
                 else:
-                    new_grid[y][x] = live_neighbors == 3
+                    new_grid[y][x] = live_neighbors in birth
         self.grid = new_grid
 
+    def advance(self, generations: int) -> None:
+        """
+        Advance the grid by the given number of generations.
+
+        Args:
+            generations (int): The number of generations to run.
+        """
+        for _ in range(generations):
+            self.update()
+
+    def close(self) -> None:
+        """Shut down the worker threads, if any were started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _update_parallel(self) -> None:
+        if self.backend == "numpy":
+            grid = np.asarray(self.grid, dtype=bool)
+        else:
+            grid = self.grid
+        out = self._back_buffer
+        if out is None or out.shape != grid.shape or out is grid:
+            out = np.empty_like(grid)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+        # One strip per worker; each strip reads its halo rows from the
+        # current buffer and writes only its own rows of the back buffer.
+        edges = np.linspace(0, self.height, min(self.workers, self.height) + 1)
+        strips = [(int(y0), int(y1)) for y0, y1 in zip(edges[:-1], edges[1:])]
+        if self.backend == "numpy":
+            futures = [
+                self._pool.submit(_step_rows, grid, out, y0, y1, self.rule)
+                for y0, y1 in strips
+            ]
+        else:
+            futures = [
+                self._pool.submit(step_packed, grid, self.width, out, y0, y1, self.rule)
+                for y0, y1 in strips
+            ]
+        for future in futures:
+            future.result()
+
+        self._back_buffer = grid
+        self.grid = out
+
+    def mark_dirty(self) -> None:
+        """
+        Make the next "sparse" update re-evaluate every cell.
+
+        Call this after modifying the grid in place. Assigning a new grid or
+        calling set_grid() is detected automatically.
+        """
+        self.version += 1
+        self._changed = None
+
+    def _update_sparse(self) -> None:
+        if self.grid is not self._tracked_grid:
+            self.grid = np.asarray(self.grid, dtype=bool)
+            self._changed = None
+
+        area = self.width * self.height
+        if self._changed is None or len(self._changed) > area * SPARSE_DENSE_FRACTION:
+            new_grid = step_dense(self.grid, self.rule, self.topology)
+            self._changed = np.flatnonzero(new_grid != self.grid)
+            self.grid = new_grid
+        elif len(self._changed):
+            # The grid is updated in place, so the cost follows the activity
+            self._changed = _step_active(
+                self.grid, self._changed, self.rule, self.topology
+            )
+        self._tracked_grid = self.grid
+
     def _count_live_neighbors(self, x: int, y: int) -> int:
+        grid = self.grid
+        topology = self.topology
         count = 0
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx, ny = (x + dx) % self.width, (y + dy) % self.height
-                if self.grid[ny][nx]:
+        if topology.boundary == "fixed":
+            for nx, ny in zip(topology.column_neighbors[x], topology.row_neighbors[y]):
+                if nx >= 0 and ny >= 0 and grid[ny][nx]:
+                    count += 1
+        else:
+            for nx, ny in zip(topology.column_neighbors[x], topology.row_neighbors[y]):
+                if grid[ny][nx]:
                     count += 1
         return count
 
@@ -54,29 +406,207 @@ class GameOfLifeEnvironment(Environment):
 
 
 class GameOfLifeSimulation(Simulation):
-    def __init__(self, width: int, height: int):
-        super().__init__(GameOfLifeEnvironment(width, height))
+    """
+    Runs a Game of Life board from a random start.
+
+    After every generation the board is hashed and looked up in a table of
+    the last max_history states. When a state repeats, the board has settled
+    into a cycle: its period and the length of the transient before it are
+    reported by get_state() and the simulation completes early. If the board
+    is edited through the environment after initialize(), call
+    cycle_detector.reset() so that older states are not matched.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        backend: str = "python",
+        workers: int = 1,
+        seed: Optional[int] = None,
+        rule: Union[str, LifeRule] = CONWAY,
+        neighborhood: Neighborhood = MOORE,
+        boundary: str = "toroidal",
+        max_generations: int = 100,
+        detect_cycles: bool = True,
+        max_history: int = 1024,
+    ):
+        """
+        Initialize a Game of Life simulation.
+
+        Args:
+            width (int): The number of columns.
+            height (int): The number of rows.
+            backend (str): The update engine, one of SIMULATION_BACKENDS.
+            workers (int): The number of threads used by the parallel backends.
+            seed (Optional[int]): Seed for the random starting board. With a
+                seed, initialize() and reset() always produce the same board as
+                random_cells(width, height, seed).
+            rule (Union[str, LifeRule]): The Life-like rule to run.
+            neighborhood (Neighborhood): The cells counted as neighbors.
+            boundary (str): How cells past the edge are treated, one of
+                BOUNDARIES.
+            max_generations (int): The number of generations after which the
+                simulation is complete.
+            detect_cycles (bool): Whether to look for repeated states and
+                complete as soon as one is found.
+            max_history (int): The number of recent states to remember, which
+                is the longest period that can be detected.
+        """
+        self.seed = seed
+        if backend == "hashlife":
+            if workers != 1:
+                raise ValueError("The hashlife backend does not support workers")
+            if neighborhood != MOORE or boundary != "toroidal":
+                raise ValueError(
+                    "The hashlife backend only supports the default neighborhood"
+                    " on a torus"
+                )
+            environment = HashLifeEnvironment(width, height, rule=rule)
+        else:
+            environment = GameOfLifeEnvironment(
+                width, height, backend, workers, rule, neighborhood, boundary
+            )
+        super().__init__(environment)
         self.generation = 0
+        self.max_generations = max_generations
+        self.detect_cycles = detect_cycles
+        self.cycle_detector = CycleDetector(max_history)
+        self._hasher = GridHasher(width, height)
+
+    @property
+    def period(self) -> Optional[int]:
+        """The period of the cycle the board settled into, if found."""
+        return self.cycle_detector.period
+
+    @property
+    def transient(self) -> Optional[int]:
+        """The generation at which the cycle started, if found."""
+        return self.cycle_detector.transient
 
     def initialize(self) -> None:
         # Initialize with a random pattern
-        import random
-
-        for y in range(self.environment.height):
-            for x in range(self.environment.width):
-                self.environment.grid[y][x] = random.random() < 0.2
+        env = self.environment
+        if env.backend != "python" or self.seed is not None:
+            env.set_grid(random_cells(env.width, env.height, self.seed))
+        else:
+            for y in range(env.height):
+                for x in range(env.width):
+                    env.grid[y][x] = random.random() < INITIAL_DENSITY
+            env.version += 1
+        self.cycle_detector.reset()
+        self._observe(rehash=True)
 
     def run_step(self) -> None:
         self.environment.update()
         self.generation += 1
+        self._observe()
+
+    def run_steps(self, generations: int) -> None:
+        """
+        Run the given number of generations at once.
+
+        With the "hashlife" backend this is much faster than calling run_step()
+        repeatedly, since large power-of-two jumps are memoized. Skipped
+        generations cannot be checked for cycles, so the hashlife backend
+        restarts cycle detection from the state after the jump unless a cycle
+        was already found.
+
+        Args:
+            generations (int): The number of generations to run.
+        """
+        if self.environment.backend != "hashlife":
+            for _ in range(generations):
+                self.run_step()
+            return
+
+        self.environment.advance(generations)
+        self.generation += generations
+        if self.period is None:
+            self.cycle_detector.reset()
+            self._observe(rehash=True)
 
     def is_complete(self) -> bool:
-        # Run for a fixed number of generations
-        return self.generation >= 100
+        # Run for a fixed number of generations, or until the board repeats
+        return self.generation >= self.max_generations or self.period is not None
 
     def get_state(self) -> dict:
-        return {"generation": self.generation, "grid": self.environment.get_state()}
+        return {
+            "generation": self.generation,
+            "grid": self.environment.get_state(),
+            "period": self.period,
+            "transient": self.transient,
+        }
 
     def reset(self) -> None:
         self.generation = 0
         self.initialize()
+
+    def state_view(self) -> Dict[str, Any]:
+        """
+        Get the state without copying the grid where the backend allows it.
+
+        Returns:
+            Dict[str, Any]: The generation, the cycle found if any, and the
+            version and read-only grid of the environment's state_view().
+        """
+        return {
+            "generation": self.generation,
+            "period": self.period,
+            "transient": self.transient,
+            **self.environment.state_view(),
+        }
+
+    def _checkpoint_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        env = self.environment
+        history = self.cycle_detector.history()
+        metadata = {
+            "width": env.width,
+            "height": env.height,
+            "rule": str(env.rule),
+            "generation": self.generation,
+            "period": self.period,
+            "transient": self.transient,
+        }
+        arrays = {
+            "grid": np.asarray(env.get_state(), dtype=bool),
+            "history_hashes": np.array([h for h, _ in history], dtype=np.uint64),
+            "history_generations": np.array([g for _, g in history], dtype=np.int64),
+        }
+        return metadata, arrays
+
+    def _restore_checkpoint(
+        self, metadata: Dict[str, Any], arrays: Dict[str, np.ndarray]
+    ) -> None:
+        env = self.environment
+        if (metadata["width"], metadata["height"]) != (env.width, env.height):
+            raise ValueError("Checkpoint grid size does not match the simulation")
+        if metadata["rule"] != str(env.rule):
+            raise ValueError("Checkpoint rule does not match the simulation")
+        if env.backend in ("numpy", "sparse"):
+            env.set_grid(arrays["grid"], copy=False)
+        else:
+            env.set_grid(arrays["grid"])
+        self.generation = metadata["generation"]
+        history = zip(
+            arrays["history_hashes"].tolist(), arrays["history_generations"].tolist()
+        )
+        self.cycle_detector.restore(
+            list(history), metadata["period"], metadata["transient"]
+        )
+        if self.detect_cycles:
+            self._state_hash(rehash=True)
+
+    def _state_hash(self, rehash: bool) -> int:
+        env = self.environment
+        if env.backend == "bitpacked":
+            return int(hash_words(env.get_state(packed=True).reshape(-1)))
+        if env.backend == "sparse" and not rehash and env._changed is not None:
+            # Only the words holding cells flipped by the last update change
+            return self._hasher.update(env.grid, env._changed)
+        return self._hasher.rehash(env.get_state())
+
+    def _observe(self, rehash: bool = False) -> None:
+        if not self.detect_cycles or self.period is not None:
+            return
+        self.cycle_detector.observe(self._state_hash(rehash), self.generation)
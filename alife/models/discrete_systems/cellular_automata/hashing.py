@@ -0,0 +1,210 @@
+# alife/models/cellular_automata/hashing.py
+
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Fixed seed for the per-word keys, so hashes are stable across runs
+_KEY_SEED = 0x5EED
+
+
+@lru_cache(maxsize=None)
+def _word_keys(count: int) -> np.ndarray:
+    keys = np.random.default_rng(_KEY_SEED).integers(
+        0, 2**64, size=count, dtype=np.uint64
+    )
+    keys.flags.writeable = False
+    return keys
+
+
+def _mix(words: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer: a bijective scramble of every 64-bit word
+    words = (words ^ (words >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    words = (words ^ (words >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return words ^ (words >> np.uint64(31))
+
+
+def hash_words(words: np.ndarray) -> np.ndarray:
+    """
+    Hash packed boards to 64-bit values.
+
+    Args:
+        words (np.ndarray): A (..., n) uint64 array; the last axis holds the
+            packed cells of one board.
+
+    Returns:
+        np.ndarray: A uint64 array of hashes with the leading shape of words.
+    """
+    keys = _word_keys(words.shape[-1])
+    return _mix(words ^ keys).sum(axis=-1, dtype=np.uint64)
+
+
+def grid_hashes(cells) -> np.ndarray:
+    """
+    Hash one or more boards to 64-bit values.
+
+    Each board is packed eight cells per byte and hashed a 64-bit word at a
+    time, so equal boards always get equal hashes and different boards collide
+    with negligible probability.
+
+    Args:
+        cells: A (..., height, width) bool array-like. Leading axes index
+            independent boards.
+
+    Returns:
+        np.ndarray: A uint64 array of hashes with the leading shape of cells.
+    """
+    cells = np.asarray(cells, dtype=bool)
+    leading = cells.shape[:-2]
+    packed = np.packbits(cells.reshape(leading + (-1,)), axis=-1)
+    padding = -packed.shape[-1] % 8
+    if padding:
+        packed = np.concatenate(
+            [packed, np.zeros(leading + (padding,), dtype=np.uint8)], axis=-1
+        )
+    words = np.ascontiguousarray(packed).view("<u8").astype(np.uint64)
+    return hash_words(words)
+
+
+class GridHasher:
+    """
+    Keeps the grid_hashes() value of one board up to date as cells change.
+
+    The hash is a sum of independently scrambled 64-cell words, so when only a
+    few cells change, only the words holding them are re-read and their
+    contributions swapped, which costs time proportional to the changes.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.value = 0
+        self._area = width * height
+        self._word_count = -(-self._area // 64)
+        self._contributions = np.zeros(self._word_count, dtype=np.uint64)
+
+    def rehash(self, cells) -> int:
+        """
+        Hash the whole board.
+
+        Args:
+            cells: A (height, width) bool array-like.
+
+        Returns:
+            int: The hash of the board.
+        """
+        flat = np.zeros(self._word_count * 64, dtype=bool)
+        flat[: self._area] = np.asarray(cells, dtype=bool).reshape(-1)
+        words = np.packbits(flat).view("<u8").astype(np.uint64)
+        self._contributions = _mix(words ^ _word_keys(self._word_count))
+        self.value = int(self._contributions.sum(dtype=np.uint64))
+        return self.value
+
+    def update(self, cells: np.ndarray, changed: np.ndarray) -> int:
+        """
+        Update the hash after some cells changed.
+
+        Args:
+            cells (np.ndarray): The (height, width) bool board after the change.
+            changed (np.ndarray): Flat indices of every cell that changed since
+                the last rehash() or update().
+
+        Returns:
+            int: The hash of the board.
+        """
+        if len(changed) == 0:
+            return self.value
+        words = np.unique(np.asarray(changed) // 64)
+        indices = words[:, None] * 64 + np.arange(64)
+        valid = indices < self._area
+        flat = np.asarray(cells).reshape(-1)
+        bits = np.where(valid, flat[np.where(valid, indices, 0)], False)
+        packed = np.packbits(bits, axis=1).view("<u8").astype(np.uint64)[:, 0]
+        contributions = _mix(packed ^ _word_keys(self._word_count)[words])
+
+        old = int(self._contributions[words].sum(dtype=np.uint64))
+        new = int(contributions.sum(dtype=np.uint64))
+        self._contributions[words] = contributions
+        self.value = (self.value - old + new) % 2**64
+        return self.value
+
+
+class CycleDetector:
+    """
+    Detects when a deterministic system returns to an earlier state.
+
+    Hashes of the most recent max_history states are kept with the generation
+    at which they were seen. When a hash repeats, the gap between the two
+    generations is the period of the cycle and the earlier generation is the
+    length of the transient before it, as long as the period is at most
+    max_history.
+    """
+
+    def __init__(self, max_history: int = 1024):
+        self.max_history = max_history
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every recorded state."""
+        self.period: Optional[int] = None
+        self.transient: Optional[int] = None
+        self._seen: Dict[int, int] = {}
+        self._order: Deque[int] = deque()
+
+    def observe(self, state_hash: int, generation: int) -> bool:
+        """
+        Record the state at a generation.
+
+        Args:
+            state_hash (int): The hash of the state.
+            generation (int): The generation of the state.
+
+        Returns:
+            bool: True if a cycle has been found.
+        """
+        if self.period is not None:
+            return True
+        previous = self._seen.get(state_hash)
+        if previous is not None:
+            self.period = generation - previous
+            self.transient = previous
+            return True
+
+        self._seen[state_hash] = generation
+        self._order.append(state_hash)
+        if len(self._order) > self.max_history:
+            del self._seen[self._order.popleft()]
+        return False
+
+    def history(self) -> List[Tuple[int, int]]:
+        """
+        Get the recorded states.
+
+        Returns:
+            List[Tuple[int, int]]: (hash, generation) pairs, oldest first.
+        """
+        return [(state_hash, self._seen[state_hash]) for state_hash in self._order]
+
+    def restore(
+        self,
+        history: List[Tuple[int, int]],
+        period: Optional[int] = None,
+        transient: Optional[int] = None,
+    ) -> None:
+        """
+        Replace the recorded states, for example from a checkpoint.
+
+        Args:
+            history (List[Tuple[int, int]]): (hash, generation) pairs, oldest
+                first, as returned by history().
+            period (Optional[int]): The period found, if any.
+            transient (Optional[int]): The transient found, if any.
+        """
+        self.reset()
+        for state_hash, generation in history[-self.max_history :]:
+            self._seen[int(state_hash)] = int(generation)
+            self._order.append(int(state_hash))
+        self.period = period
+        self.transient = transient
@@ -0,0 +1,343 @@
+# alife/models/cellular_automata/hashlife.py
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from alife.core import Environment
+from alife.models.discrete_systems.cellular_automata.bitpacked import pack_grid
+from alife.models.discrete_systems.cellular_automata.rules import (
+    CONWAY,
+    LifeRule,
+    as_rule,
+)
+from alife.utils.views import read_only
+
+
+class HashLifeNode:
+    """
+    A canonical quadtree node covering a 2^level x 2^level square of cells.
+
+    Nodes are immutable and interned by HashLife, so two nodes with the same
+    contents are the same object and can be compared and hashed by identity.
+    """
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population")
+
+    def __init__(
+        self,
+        level: int,
+        nw: Optional["HashLifeNode"] = None,
+        ne: Optional["HashLifeNode"] = None,
+        sw: Optional["HashLifeNode"] = None,
+        se: Optional["HashLifeNode"] = None,
+        population: int = 0,
+    ):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+
+class HashLife:
+    """
+    A HashLife universe holding a square toroidal board of 2^level cells a side.
+
+    The torus is stepped by tiling it into a node twice its size and taking the
+    memoized centre result of that node, which lets a single call advance the
+    board by up to 2^(level - 1) generations. Interned nodes and memoized
+    results are dropped by a collection pass once their number exceeds
+    max_nodes, keeping only the nodes reachable from the current board.
+    """
+
+    def __init__(self, level: int, max_nodes: int = 1_000_000, rule: LifeRule = CONWAY):
+        if level < 1:
+            raise ValueError("HashLife needs a board of at least 2x2 cells")
+        if 0 in rule.birth:
+            raise ValueError("HashLife does not support rules with birth on 0")
+        self.level = level
+        self.rule = rule
+        self.max_nodes = max_nodes
+        self.collections = 0
+        self._nodes: Dict[Tuple[HashLifeNode, ...], HashLifeNode] = {}
+        self._results: Dict[Tuple[HashLifeNode, int], HashLifeNode] = {}
+        self._off = HashLifeNode(0)
+        self._on = HashLifeNode(0, population=1)
+        self._empty: List[HashLifeNode] = [self._off]
+        self.root = self.empty(level)
+
+    @property
+    def size(self) -> int:
+        return 1 << self.level
+
+    @property
+    def cache_size(self) -> int:
+        return len(self._nodes) + len(self._results)
+
+    def join(
+        self, nw: HashLifeNode, ne: HashLifeNode, sw: HashLifeNode, se: HashLifeNode
+    ) -> HashLifeNode:
+        """Return the canonical node with the given quadrants."""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = HashLifeNode(nw.level + 1, nw, ne, sw, se, population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level: int) -> HashLifeNode:
+        """Return the canonical empty node of the given level."""
+        while len(self._empty) <= level:
+            smaller = self._empty[-1]
+            self._empty.append(self.join(smaller, smaller, smaller, smaller))
+        return self._empty[level]
+
+    def load(self, cells) -> None:
+        """
+        Replace the board with the given cells.
+
+        Args:
+            cells: A (size, size) array-like of booleans.
+        """
+        cells = np.asarray(cells, dtype=bool)
+        if cells.shape != (self.size, self.size):
+            raise ValueError(f"Expected a {self.size}x{self.size} grid")
+        self.root = self._build(cells, self.level)
+        self._maybe_collect()
+
+    def to_array(self) -> np.ndarray:
+        """Return the board as a (size, size) bool array."""
+        cells = np.zeros((self.size, self.size), dtype=bool)
+        self._fill(self.root, cells, 0, 0)
+        return cells
+
+    def advance(self, generations: int) -> None:
+        """
+        Advance the board by the given number of generations.
+
+        The count is split into power-of-two jumps of at most 2^(level - 1)
+        generations, each of which is a single memoized lookup once cached.
+        """
+        if generations < 0:
+            raise ValueError("Cannot advance by a negative number of generations")
+        while generations > 0:
+            j = min(generations.bit_length() - 1, self.level - 1)
+            self._jump(j)
+            generations -= 1 << j
+            self._maybe_collect()
+
+    def collect(self) -> None:
+        """Drop memoized results and every node not reachable from the board."""
+        self._results.clear()
+        self._nodes = {}
+        seen = set()
+        stack = [self.root] + self._empty
+        while stack:
+            node = stack.pop()
+            if node.level == 0 or id(node) in seen:
+                continue
+            seen.add(id(node))
+            self._nodes[(node.nw, node.ne, node.sw, node.se)] = node
+            stack.extend((node.nw, node.ne, node.sw, node.se))
+        self.collections += 1
+
+    def _maybe_collect(self) -> None:
+        if self.cache_size > self.max_nodes:
+            self.collect()
+
+    def _jump(self, j: int) -> None:
+        # The centre of a 2x2 tiling of the torus is the torus shifted by half
+        # its size; swapping the quadrants of the result undoes the shift.
+        root = self.root
+        result = self._successor(self.join(root, root, root, root), j)
+        self.root = self.join(result.se, result.sw, result.ne, result.nw)
+
+    def _build(self, cells: np.ndarray, level: int) -> HashLifeNode:
+        if level == 0:
+            return self._on if cells[0, 0] else self._off
+        if not cells.any():
+            return self.empty(level)
+        half = 1 << (level - 1)
+        return self.join(
+            self._build(cells[:half, :half], level - 1),
+            self._build(cells[:half, half:], level - 1),
+            self._build(cells[half:, :half], level - 1),
+            self._build(cells[half:, half:], level - 1),
+        )
+
+    def _fill(self, node: HashLifeNode, cells: np.ndarray, x: int, y: int) -> None:
+        if node.population == 0:
+            return
+        if node.level == 0:
+            cells[y, x] = True
+            return
+        half = 1 << (node.level - 1)
+        self._fill(node.nw, cells, x, y)
+        self._fill(node.ne, cells, x + half, y)
+        self._fill(node.sw, cells, x, y + half)
+        self._fill(node.se, cells, x + half, y + half)
+
+    def _centre(self, node: HashLifeNode) -> HashLifeNode:
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _life_4x4(self, node: HashLifeNode) -> HashLifeNode:
+        quadrants = ((node.nw, node.ne), (node.sw, node.se))
+        cells = [[0] * 4 for _ in range(4)]
+        for qy in range(2):
+            for qx in range(2):
+                quadrant = quadrants[qy][qx]
+                cells[2 * qy][2 * qx] = quadrant.nw.population
+                cells[2 * qy][2 * qx + 1] = quadrant.ne.population
+                cells[2 * qy + 1][2 * qx] = quadrant.sw.population
+                cells[2 * qy + 1][2 * qx + 1] = quadrant.se.population
+
+        def next_cell(x: int, y: int) -> HashLifeNode:
+            live_neighbors = (
+                sum(cells[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1))
+                - cells[y][x]
+            )
+            alive = self.rule.next_state(cells[y][x], live_neighbors)
+            return self._on if alive else self._off
+
+        return self.join(
+            next_cell(1, 1), next_cell(2, 1), next_cell(1, 2), next_cell(2, 2)
+        )
+
+    def _successor(self, node: HashLifeNode, j: int) -> HashLifeNode:
+        # Returns the centre half of node advanced by 2^j generations, where
+        # j <= node.level - 2.
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.population == 0:
+            result = node.nw
+        elif node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            parts = [
+                nw,
+                self.join(nw.ne, ne.nw, nw.se, ne.sw),
+                ne,
+                self.join(nw.sw, nw.se, sw.nw, sw.ne),
+                self._centre(node),
+                self.join(ne.sw, ne.se, se.nw, se.ne),
+                sw,
+                self.join(sw.ne, se.nw, sw.se, se.sw),
+                se,
+            ]
+            if j == node.level - 2:
+                # Full speed: both halves of the jump advance 2^(j - 1)
+                parts = [self._successor(part, j - 1) for part in parts]
+                j -= 1
+            else:
+                parts = [self._centre(part) for part in parts]
+            c1, c2, c3, c4, c5, c6, c7, c8, c9 = parts
+            result = self.join(
+                self._successor(self.join(c1, c2, c4, c5), j),
+                self._successor(self.join(c2, c3, c5, c6), j),
+                self._successor(self.join(c4, c5, c7, c8), j),
+                self._successor(self.join(c5, c6, c8, c9), j),
+            )
+
+        self._results[key] = result
+        return result
+
+
+def _power_of_two_exponent(value: int) -> Optional[int]:
+    if value < 1 or value & (value - 1):
+        return None
+    return value.bit_length() - 1
+
+
+class HashLifeEnvironment(Environment):
+    """
+    A toroidal Game of Life board stepped with HashLife.
+
+    Both sides of the board must be powers of two. A rectangular board is run
+    as a square torus tiled with copies of it, which evolves identically.
+    """
+
+    backend = "hashlife"
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        max_nodes: int = 1_000_000,
+        rule: Union[str, LifeRule] = CONWAY,
+    ):
+        width_exponent = _power_of_two_exponent(width)
+        height_exponent = _power_of_two_exponent(height)
+        if width_exponent is None or height_exponent is None:
+            raise ValueError("HashLife needs a width and height that are powers of two")
+        self.width = width
+        self.height = height
+        self.rule = as_rule(rule)
+        level = max(width_exponent, height_exponent, 1)
+        self.universe = HashLife(level, max_nodes, self.rule)
+        # Incremented whenever the grid changes
+        self.version = 0
+
+    def get_state(self, packed: bool = False) -> Any:
+        """
+        Get the current grid.
+
+        Args:
+            packed (bool): If True, return the grid packed 64 cells per uint64
+                word instead of one value per cell.
+
+        Returns:
+            A new (height, width) bool array, or its packed form.
+        """
+        cells = self.universe.to_array()[: self.height, : self.width]
+        return pack_grid(cells) if packed else cells
+
+    def state_view(self) -> Dict[str, Any]:
+        """
+        Get the version, which changes whenever the grid changes, and the
+        grid as a read-only bool array. The grid is built from the quadtree,
+        so it is a new array and does not follow later changes.
+        """
+        return {"version": self.version, "grid": read_only(self.get_state())}
+
+    def set_grid(self, cells) -> None:
+        """
+        Replace the grid with the given cells.
+
+        Args:
+            cells: A (height, width) array-like of booleans.
+        """
+        self.version += 1
+        cells = np.asarray(cells, dtype=bool)
+        size = self.universe.size
+        self.universe.load(np.tile(cells, (size // self.height, size // self.width)))
+
+    def update(self) -> None:
+        self.version += 1
+        self.universe.advance(1)
+
+    def advance(self, generations: int) -> None:
+        self.version += 1
+        self.universe.advance(generations)
+
+    def interact(self, entity, action: str, **kwargs) -> dict:
+        # Not used in Game of Life
+        pass
+
+    def add_entity(self, entity) -> None:
+        # Not used in Game of Life
+        pass
+
+    def remove_entity(self, entity) -> None:
+        # Not used in Game of Life
+        pass
+
+    def get_entities(self) -> List:
+        # Not used in Game of Life
+        return []
@@ -0,0 +1,176 @@
+# alife/models/cellular_automata/rules.py
+
+import re
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+_RULESTRING = re.compile(r"^B(?P<birth>\d*)/S(?P<survival>\d*)$", re.IGNORECASE)
+_SURVIVAL_FIRST = re.compile(r"^S(?P<survival>\d*)/B(?P<birth>\d*)$", re.IGNORECASE)
+_LEGACY = re.compile(r"^(?P<survival>\d*)/(?P<birth>\d*)$")
+
+
+class LifeRule:
+    """
+    An outer-totalistic ("Life-like") rule.
+
+    A dead cell becomes alive when its number of live neighbors is in birth,
+    and a live cell stays alive when its number of live neighbors is in
+    survival. Rules are applied through a lookup table indexed by the cell's
+    state and the live-cell total of its neighborhood including itself, so any
+    rule costs one gather per cell.
+    """
+
+    # Tables with at most this many live entries are applied as a chain of
+    # comparisons, which beats a gather for rules like B3/S23.
+    MAX_COMPARISONS = 4
+
+    def __init__(self, birth: Iterable[int], survival: Iterable[int]):
+        self.birth = frozenset(int(n) for n in birth)
+        self.survival = frozenset(int(n) for n in survival)
+        if any(n < 0 for n in self.birth | self.survival):
+            raise ValueError("Neighbor counts cannot be negative")
+        self._tables: Dict[int, np.ndarray] = {}
+        self._byte_tables: Dict[int, bytes] = {}
+
+    @classmethod
+    def from_string(cls, rulestring: str) -> "LifeRule":
+        """
+        Parse a rule in B/S notation, such as "B3/S23" for Conway's Game of
+        Life. "S23/B3" and the older "23/3" (survival/birth) forms are also
+        accepted.
+
+        Args:
+            rulestring (str): The rule to parse.
+
+        Returns:
+            LifeRule: The parsed rule.
+
+        Raises:
+            ValueError: If the string is not a valid rule.
+        """
+        text = rulestring.strip()
+        match = (
+            _RULESTRING.match(text)
+            or _SURVIVAL_FIRST.match(text)
+            or _LEGACY.match(text)
+        )
+        if match is None:
+            raise ValueError(f"Invalid rulestring: {rulestring}")
+        birth = [int(digit) for digit in match.group("birth")]
+        survival = [int(digit) for digit in match.group("survival")]
+        if any(n > 8 for n in birth + survival):
+            raise ValueError(f"Invalid rulestring: {rulestring}")
+        return cls(birth, survival)
+
+    def next_state(self, alive: bool, live_neighbors: int) -> bool:
+        """Return the next state of a single cell."""
+        if alive:
+            return live_neighbors in self.survival
+        return live_neighbors in self.birth
+
+    def lookup_table(self, neighbors: int = 8) -> np.ndarray:
+        """
+        Get the flat lookup table for a neighborhood of the given size.
+
+        The next state of a cell is table[alive * (neighbors + 2) + total],
+        where total is the number of live cells in the neighborhood including
+        the cell itself.
+
+        Args:
+            neighbors (int): The number of neighbors of each cell.
+
+        Returns:
+            np.ndarray: A read-only bool array of length 2 * (neighbors + 2).
+        """
+        table = self._tables.get(neighbors)
+        if table is None:
+            totals = np.arange(neighbors + 2)
+            table = np.concatenate(
+                [
+                    np.isin(totals, list(self.birth)),
+                    np.isin(totals - 1, list(self.survival)),
+                ]
+            )
+            table.flags.writeable = False
+            self._tables[neighbors] = table
+        return table
+
+    def apply(self, index: np.ndarray, neighbors: int = 8) -> np.ndarray:
+        """
+        Look up the next state of many cells at once.
+
+        Args:
+            index (np.ndarray): A uint8 array of table indices, computed as
+                alive * (neighbors + 2) + total.
+            neighbors (int): The number of neighbors of each cell.
+
+        Returns:
+            np.ndarray: A bool array of next states with the shape of index.
+        """
+        table = self.lookup_table(neighbors)
+        live = np.flatnonzero(table)
+        if len(live) <= self.MAX_COMPARISONS:
+            result = np.zeros(index.shape, dtype=bool)
+            for value in live.tolist():
+                result |= index == value
+            return result
+
+        # bytes.translate is a byte-to-byte table lookup, which avoids the
+        # conversion of every index to a full-width integer that np.take does.
+        byte_table = self._byte_tables.get(neighbors)
+        if byte_table is None:
+            byte_table = bytes(table.astype(np.uint8)) + bytes(256 - len(table))
+            self._byte_tables[neighbors] = byte_table
+        # A bytearray keeps the result writable
+        flat = bytearray(np.ascontiguousarray(index, dtype=np.uint8))
+        result = np.frombuffer(flat.translate(byte_table), dtype=bool)
+        return result.reshape(index.shape)
+
+    def __str__(self) -> str:
+        birth = "".join(str(n) for n in sorted(self.birth))
+        survival = "".join(str(n) for n in sorted(self.survival))
+        return f"B{birth}/S{survival}"
+
+    def __repr__(self) -> str:
+        return f"LifeRule.from_string({str(self)!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LifeRule):
+            return NotImplemented
+        return self.birth == other.birth and self.survival == other.survival
+
+    def __hash__(self) -> int:
+        return hash((self.birth, self.survival))
+
+
+CONWAY = LifeRule.from_string("B3/S23")
+
+NAMED_RULES: Dict[str, LifeRule] = {
+    "life": CONWAY,
+    "highlife": LifeRule.from_string("B36/S23"),
+    "seeds": LifeRule.from_string("B2/S"),
+    "day_and_night": LifeRule.from_string("B3678/S34678"),
+    "life_without_death": LifeRule.from_string("B3/S012345678"),
+    "maze": LifeRule.from_string("B3/S12345"),
+    "replicator": LifeRule.from_string("B1357/S1357"),
+    "2x2": LifeRule.from_string("B36/S125"),
+}
+
+
+def as_rule(rule: Union[str, LifeRule]) -> LifeRule:
+    """
+    Convert a rule name from NAMED_RULES or a rulestring into a LifeRule.
+
+    Args:
+        rule (Union[str, LifeRule]): The rule, its name, or its rulestring.
+
+    Returns:
+        LifeRule: The corresponding rule.
+    """
+    if isinstance(rule, LifeRule):
+        return rule
+    named = NAMED_RULES.get(rule.strip().lower())
+    if named is not None:
+        return named
+    return LifeRule.from_string(rule)
@@ -0,0 +1,123 @@
+# alife/models/discrete_systems/chunked_grid.py
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+class ChunkedGrid:
+    """
+    An unbounded 2-D grid of byte-valued cells.
+
+    Cells are stored in square chunks of chunk_size x chunk_size bytes, kept in
+    a dictionary keyed by chunk coordinates. A chunk is allocated the first
+    time a cell in it is written, so memory grows only with the area visited.
+    Unallocated cells read as 0. Coordinates may be negative.
+    """
+
+    def __init__(self, chunk_size: int = 64):
+        """
+        Initialize an empty grid.
+
+        Args:
+            chunk_size (int): The side of each chunk, a power of two.
+
+        Raises:
+            ValueError: If chunk_size is not a positive power of two.
+        """
+        if chunk_size <= 0 or chunk_size & (chunk_size - 1):
+            raise ValueError("chunk_size must be a positive power of two")
+        self.chunk_size = chunk_size
+        self.shift = chunk_size.bit_length() - 1
+        self.mask = chunk_size - 1
+        self.chunks: Dict[Tuple[int, int], bytearray] = {}
+
+    def chunk(self, cx: int, cy: int) -> bytearray:
+        """
+        Get a chunk, allocating it if needed.
+
+        Cell (x, y) of the grid is byte (y & mask) * chunk_size + (x & mask) of
+        chunk (x >> shift, y >> shift).
+
+        Args:
+            cx (int): The chunk column.
+            cy (int): The chunk row.
+
+        Returns:
+            bytearray: The row-major cells of the chunk.
+        """
+        cells = self.chunks.get((cx, cy))
+        if cells is None:
+            cells = bytearray(self.chunk_size * self.chunk_size)
+            self.chunks[(cx, cy)] = cells
+        return cells
+
+    def __getitem__(self, position: Tuple[int, int]) -> int:
+        x, y = position
+        cells = self.chunks.get((x >> self.shift, y >> self.shift))
+        if cells is None:
+            return 0
+        return cells[((y & self.mask) << self.shift) | (x & self.mask)]
+
+    def __setitem__(self, position: Tuple[int, int], value: int) -> None:
+        x, y = position
+        cells = self.chunk(x >> self.shift, y >> self.shift)
+        cells[((y & self.mask) << self.shift) | (x & self.mask)] = value
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes held by allocated chunks."""
+        return len(self.chunks) * self.chunk_size * self.chunk_size
+
+    def bounds(self) -> Tuple[int, int, int, int]:
+        """
+        Get the bounding box of the allocated chunks.
+
+        Returns:
+            Tuple[int, int, int, int]: (x0, y0, x1, y1) with x1 and y1
+            exclusive, or all zeros if nothing has been allocated.
+        """
+        if not self.chunks:
+            return (0, 0, 0, 0)
+        xs = [cx for cx, _ in self.chunks]
+        ys = [cy for _, cy in self.chunks]
+        size = self.chunk_size
+        return (
+            min(xs) * size,
+            min(ys) * size,
+            (max(xs) + 1) * size,
+            (max(ys) + 1) * size,
+        )
+
+    def to_array(
+        self, bounds: Optional[Tuple[int, int, int, int]] = None
+    ) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Copy part of the grid into a dense array.
+
+        Args:
+            bounds (Optional[Tuple[int, int, int, int]]): The (x0, y0, x1, y1)
+                window to copy, with x1 and y1 exclusive. Defaults to bounds().
+
+        Returns:
+            Tuple of the (height, width) uint8 array covering the window and
+            the (x, y) grid coordinates of its top-left cell.
+        """
+        x0, y0, x1, y1 = self.bounds() if bounds is None else bounds
+        array = np.zeros((max(y1 - y0, 0), max(x1 - x0, 0)), dtype=np.uint8)
+        size = self.chunk_size
+        for (cx, cy), cells in self.chunks.items():
+            left, top = cx * size, cy * size
+            # Overlap of the chunk with the window, in grid coordinates
+            ax0, ay0 = max(left, x0), max(top, y0)
+            ax1, ay1 = min(left + size, x1), min(top + size, y1)
+            if ax0 >= ax1 or ay0 >= ay1:
+                continue
+            chunk = np.frombuffer(cells, dtype=np.uint8).reshape(size, size)
+            array[ay0 - y0 : ay1 - y0, ax0 - x0 : ax1 - x0] = chunk[
+                ay0 - top : ay1 - top, ax0 - left : ax1 - left
+            ]
+        return array, (x0, y0)
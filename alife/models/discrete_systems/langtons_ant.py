@@ -1,8 +1,29 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 from alife.core import Environment, Simulation
+from alife.models.discrete_systems.chunked_grid import ChunkedGrid
+from alife.utils.views import read_only
+
+# Cell offsets of one move in each direction: up, right, down, left
+DX = (0, 1, 0, -1)
+DY = (-1, 0, 1, 0)
+
+# Highway skipping looks for a highway once every HIGHWAY_CHECK_INTERVAL steps,
+# trying periods up to HIGHWAY_MAX_PERIOD whose start and end match on the
+# direction and the colors within HIGHWAY_RADIUS cells of the ant.
+HIGHWAY_CHECK_INTERVAL = 10_000
+HIGHWAY_MAX_PERIOD = 256
+HIGHWAY_RADIUS = 2
+
+# Skips of more highway periods than this keep the cells painted by all but
+# the last few periods in closed form instead of writing them to the grid.
+MATERIALIZE_WINDOWS = 10_000
+
+# Once highways have been skipped, get_state() without bounds copies at most a
+# window this many cells wide and high around the ant
+DEFAULT_WINDOW = 1024
 
 
 class LangtonAnt:
@@ -28,20 +49,254 @@ class LangtonAnt:
         self.direction = (self.direction - 1) % 4
 
 
+class Highway:
+    """
+    The cells flipped by an ant that repeats one period of moves over and
+    over, each repetition shifted by the same displacement.
+
+    Repetition i (0 <= i < windows) flips the cells at origin + i *
+    displacement + t for every offset t in toggles.
+    """
+
+    def __init__(
+        self,
+        origin: Tuple[int, int],
+        displacement: Tuple[int, int],
+        toggles: Sequence[Tuple[int, int]],
+        windows: int,
+    ):
+        self.origin = origin
+        self.displacement = displacement
+        self.toggles = list(toggles)
+        self.windows = windows
+
+    def color_at(self, x: int, y: int) -> int:
+        """Return 1 if the highway flips cell (x, y) an odd number of times."""
+        vx, vy = self.displacement
+        flips = 0
+        for tx, ty in self.toggles:
+            dx = x - self.origin[0] - tx
+            dy = y - self.origin[1] - ty
+            if vx:
+                i, remainder = divmod(dx, vx)
+                if remainder or i * vy != dy:
+                    continue
+            else:
+                i, remainder = divmod(dy, vy)
+                if remainder or dx:
+                    continue
+            if 0 <= i < self.windows:
+                flips += 1
+        return flips & 1
+
+    def paint(self, cells: np.ndarray, origin: Tuple[int, int]) -> None:
+        """
+        Flip the cells of the highway that fall inside a dense window.
+
+        Args:
+            cells (np.ndarray): A (height, width) window of the grid, modified
+                in place.
+            origin (Tuple[int, int]): The grid coordinates of cells[0, 0].
+        """
+        height, width = cells.shape
+        vx, vy = self.displacement
+        for tx, ty in self.toggles:
+            # Repetitions that put this offset inside the window on each axis
+            first, stop = 0, self.windows
+            for start, step, size in (
+                (self.origin[0] + tx - origin[0], vx, width),
+                (self.origin[1] + ty - origin[1], vy, height),
+            ):
+                if step == 0:
+                    if not 0 <= start < size:
+                        stop = 0
+                    continue
+                # 0 <= start + i * step < size, in integer arithmetic
+                low, high = -start, size - 1 - start
+                if step < 0:
+                    low, high = high, low
+                first = max(first, -(-low // step))
+                stop = min(stop, high // step + 1)
+            for i in range(first, stop):
+                x = self.origin[0] + tx + i * vx - origin[0]
+                y = self.origin[1] + ty + i * vy - origin[1]
+                cells[y, x] ^= 1
+
+
+class _HighwayPeriod:
+    # One proven period of a highway: after period steps the ant is back in
+    # the same direction, displaced, and will repeat the same moves forever.
+    def __init__(
+        self,
+        period: int,
+        displacement: Tuple[int, int],
+        toggles: List[Tuple[int, int]],
+        reach: int,
+    ):
+        self.period = period
+        self.displacement = displacement
+        self.toggles = toggles
+        # Cells flipped by a period can only be read again within this many
+        # periods
+        self.reach = reach
+
+
+def _periods_to_leave(
+    position: int, step: int, low: int, high: int, lo: int, hi: int
+) -> Optional[int]:
+    # Periods after which [position + j * step + low, position + j * step +
+    # high] lies outside [lo, hi) for every later j, or None if never
+    if step > 0:
+        return -(-(hi - position - low) // step)
+    if step < 0:
+        return (position + high - lo) // -step + 1
+    return None
+
+
 class LangtonAntEnvironment(Environment):
-    def __init__(self, width: int, height: int):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        unbounded: bool = False,
+        chunk_size: int = 64,
+        skip_highways: bool = False,
+    ):
+        """
+        Initialize the environment with the ant in the middle.
+
+        Args:
+            width (int): The number of columns of the torus.
+            height (int): The number of rows of the torus.
+            unbounded (bool): If True, the ant walks on an infinite plane
+                instead of a width x height torus. Cells are then stored in a
+                ChunkedGrid, which allocates chunks only where the ant goes.
+            chunk_size (int): The side of each chunk in unbounded mode, a
+                power of two.
+            skip_highways (bool): If True, look for a highway every
+                HIGHWAY_CHECK_INTERVAL steps. Once one is proven to continue
+                forever, advance() jumps over whole periods of it in constant
+                time. Requires unbounded mode.
+
+        Raises:
+            ValueError: If skip_highways is set without unbounded.
+        """
+        if skip_highways and not unbounded:
+            raise ValueError("Highway skipping requires an unbounded world")
         self.width = width
         self.height = height
-        self.grid = np.zeros((height, width), dtype=bool)
+        self.unbounded = unbounded
+        self.chunk_size = chunk_size
+        self.skip_highways = skip_highways
+        # Skipped highway periods that were not written to the grid
+        self.highways: List[Highway] = []
+        self._highway: Optional[_HighwayPeriod] = None
+        self._unchecked = 0
+        self._phase = 0
+        # Incremented whenever the grid or the ant changes
+        self.version = 0
+        self.grid: Union[np.ndarray, ChunkedGrid]
+        if unbounded:
+            self.grid = ChunkedGrid(chunk_size)
+        else:
+            self.grid = np.zeros((height, width), dtype=bool)
         self.ant = LangtonAnt(width // 2, height // 2)
+        if unbounded:
+            self.grid.chunk(
+                self.ant.x >> self.grid.shift, self.ant.y >> self.grid.shift
+            )
+
+    def get_state(
+        self, bounds: Optional[Tuple[int, int, int, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get the grid and the ant.
 
-    def get_state(self) -> Dict[str, Any]:
+        In unbounded mode the grid covers the bounding box of the visited
+        chunks, or the given bounds, and origin holds the coordinates of its
+        top-left cell, so the ant is at grid[y - origin[1], x - origin[0]].
+        Once highways have been skipped the visited area can be far too large
+        to copy, so the default is then the part of it within a
+        DEFAULT_WINDOW-wide square centered on the ant; pass bounds to look
+        elsewhere.
+
+        Args:
+            bounds (Optional[Tuple[int, int, int, int]]): In unbounded mode,
+                the (x0, y0, x1, y1) window to copy, with x1 and y1 exclusive.
+
+        Returns:
+            Dict[str, Any]: The grid, its origin, the ant as (x, y, direction),
+            and the highway periods skipped in closed form.
+        """
+        if self.unbounded:
+            if bounds is None and self.highways:
+                bounds = self._window_around_ant()
+            cells, origin = self.grid.to_array(bounds)
+            for highway in self.highways:
+                highway.paint(cells, origin)
+            grid = cells.astype(bool)
+        else:
+            grid, origin = self.grid.copy(), (0, 0)
         return {
-            "grid": self.grid.copy(),
+            "grid": grid,
+            "origin": origin,
             "ant": (self.ant.x, self.ant.y, self.ant.direction),
+            "highways": list(self.highways),
         }
 
+    def _window_around_ant(self) -> Tuple[int, int, int, int]:
+        x0, y0, x1, y1 = self.grid.bounds()
+        half = DEFAULT_WINDOW // 2
+        ax, ay = self.ant.x, self.ant.y
+        return (
+            max(x0, ax - half),
+            max(y0, ay - half),
+            min(x1, ax + half),
+            min(y1, ay + half),
+        )
+
+    def state_view(self) -> Dict[str, Any]:
+        """
+        Get the state without copying the grid, for polling.
+
+        Returns:
+            Dict[str, Any]: The version, which changes whenever the grid or
+            the ant changes; the ant as (x, y, direction); the color_at()
+            accessor; and in bounded mode the grid as a read-only view that
+            follows later steps. Copy it to keep a snapshot, or use
+            get_state(), which always copies.
+        """
+        return {
+            "version": self.version,
+            "ant": (self.ant.x, self.ant.y, self.ant.direction),
+            "color_at": self.color_at,
+            "grid": None if self.unbounded else read_only(self.grid),
+        }
+
+    def color_at(self, x: int, y: int) -> bool:
+        """
+        Get the color of one cell, including cells painted by skipped highways.
+
+        Args:
+            x (int): The column, wrapped around on the torus.
+            y (int): The row, wrapped around on the torus.
+
+        Returns:
+            bool: True for a black cell.
+        """
+        if not self.unbounded:
+            return bool(self.grid[y % self.height, x % self.width])
+        color = self.grid[x, y]
+        for highway in self.highways:
+            color ^= highway.color_at(x, y)
+        return bool(color)
+
     def update(self) -> None:
+        if self.unbounded:
+            self.advance(1)
+            return
+
+        self.version += 1
         x, y = self.ant.x, self.ant.y
         if self.grid[y, x]:
             self.grid[y, x] = False
@@ -53,6 +308,201 @@ class LangtonAntEnvironment(Environment):
         self.ant.x %= self.width
         self.ant.y %= self.height
 
+    def advance(self, steps: int) -> None:
+        """
+        Advance the ant by the given number of steps.
+
+        Produces the same grid and ant as calling update() steps times, but
+        runs the whole loop on local variables over a flat copy of the grid
+        and writes the grid back once at the end.
+
+        Args:
+            steps (int): The number of steps to run.
+        """
+        if steps:
+            self.version += 1
+        if self.skip_highways:
+            self._advance_skipping(steps)
+            return
+        if self.unbounded:
+            self._advance_unbounded(steps)
+            return
+
+        width, height = self.width, self.height
+        cells = bytearray(np.ascontiguousarray(self.grid, dtype=bool).tobytes())
+        x, y, direction = self.ant.x, self.ant.y, self.ant.direction
+        dx, dy = DX, DY
+        for _ in range(steps):
+            i = y * width + x
+            color = cells[i]
+            cells[i] = color ^ 1
+            # Turn right on a white cell and left on a black one
+            direction = (direction + 1 - 2 * color) & 3
+            x = (x + dx[direction]) % width
+            y = (y + dy[direction]) % height
+
+        self.grid[...] = np.frombuffer(cells, dtype=bool).reshape(height, width)
+        self.ant.x, self.ant.y, self.ant.direction = x, y, direction
+
+    def _advance_unbounded(self, steps: int) -> None:
+        grid = self.grid
+        shift, mask = grid.shift, grid.mask
+        outside = ~mask
+        x, y, direction = self.ant.x, self.ant.y, self.ant.direction
+        cx, cy = x >> shift, y >> shift
+        lx, ly = x & mask, y & mask
+        cells = grid.chunk(cx, cy)
+        dx, dy = DX, DY
+        for _ in range(steps):
+            i = (ly << shift) | lx
+            color = cells[i]
+            cells[i] = color ^ 1
+            direction = (direction + 1 - 2 * color) & 3
+            lx += dx[direction]
+            ly += dy[direction]
+            if (lx | ly) & outside:
+                # Stepped into a neighboring chunk
+                cx += lx >> shift
+                cy += ly >> shift
+                lx &= mask
+                ly &= mask
+                cells = grid.chunk(cx, cy)
+
+        self.ant.x = (cx << shift) | lx
+        self.ant.y = (cy << shift) | ly
+        self.ant.direction = direction
+
+    def _advance_skipping(self, steps: int) -> None:
+        while steps and self._highway is None:
+            run = min(steps, HIGHWAY_CHECK_INTERVAL - self._unchecked)
+            self._advance_unbounded(run)
+            steps -= run
+            self._unchecked += run
+            if self._unchecked == HIGHWAY_CHECK_INTERVAL:
+                self._unchecked = 0
+                self._highway = self._find_highway()
+        if not steps:
+            return
+
+        # Finish the current period, jump over whole ones, then run the rest
+        period = self._highway.period
+        if self._phase:
+            run = min(steps, period - self._phase)
+            self._advance_unbounded(run)
+            steps -= run
+            self._phase = (self._phase + run) % period
+        windows, rest = divmod(steps, period)
+        if windows:
+            self._skip_periods(windows)
+        if rest:
+            self._advance_unbounded(rest)
+            self._phase = rest
+
+    def _find_highway(self) -> Optional[_HighwayPeriod]:
+        # Walk ahead without changing the grid and try every step at which
+        # the ant is somewhere else but sees the same neighborhood again.
+        grid = self.grid
+        overlay: Dict[Tuple[int, int], int] = {}
+        radius = range(-HIGHWAY_RADIUS, HIGHWAY_RADIUS + 1)
+        start_x, start_y = self.ant.x, self.ant.y
+        x, y, direction = start_x, start_y, self.ant.direction
+        start = None
+        for step in range(HIGHWAY_MAX_PERIOD + 1):
+            key = (
+                direction,
+                tuple(
+                    overlay.get((x + i, y + j), grid[x + i, y + j])
+                    for j in radius
+                    for i in radius
+                ),
+            )
+            if start is None:
+                start = key
+            elif key == start and (x, y) != (start_x, start_y):
+                highway = self._prove_highway(step)
+                if highway is not None:
+                    return highway
+            color = overlay.get((x, y), grid[x, y])
+            overlay[(x, y)] = color ^ 1
+            direction = (direction + 1 - 2 * color) & 3
+            x += DX[direction]
+            y += DY[direction]
+        return None
+
+    def _prove_highway(self, period: int) -> Optional[_HighwayPeriod]:
+        # Run one period on an overlay, recording the cells read and flipped
+        grid = self.grid
+        px, py, start_direction = self.ant.x, self.ant.y, self.ant.direction
+        overlay: Dict[Tuple[int, int], int] = {}
+        reads = set()
+        x, y, direction = px, py, start_direction
+        for _ in range(period):
+            reads.add((x - px, y - py))
+            color = overlay.get((x, y), grid[x, y])
+            overlay[(x, y)] = color ^ 1
+            direction = (direction + 1 - 2 * color) & 3
+            x += DX[direction]
+            y += DY[direction]
+        vx, vy = x - px, y - py
+        if direction != start_direction or (vx, vy) == (0, 0):
+            return None
+        toggles = {
+            (cx - px, cy - py)
+            for (cx, cy), color in overlay.items()
+            if color != grid[cx, cy]
+        }
+
+        # Period j repeats period 0 if every cell it reads holds the color
+        # that period 0 read there: its color now, flipped once for each
+        # earlier period that flips it. Beyond reach periods no earlier
+        # period flips the cells read, and beyond the allocated chunks the
+        # cells are all white, so checking up to the later of the two proves
+        # the highway goes on forever.
+        offsets = reads | toggles
+        extent = 2 * max(max(abs(a), abs(b)) for a, b in offsets)
+        reach = extent // max(abs(vx), abs(vy)) + 1
+        x0, y0, x1, y1 = grid.bounds()
+        xs = [rx for rx, _ in reads]
+        ys = [ry for _, ry in reads]
+        leave = [
+            j
+            for j in (
+                _periods_to_leave(px, vx, min(xs), max(xs), x0, x1),
+                _periods_to_leave(py, vy, min(ys), max(ys), y0, y1),
+            )
+            if j is not None
+        ]
+        last = max(reach, min(leave), 1)
+
+        reads = sorted(reads)
+        expected = [grid[px + rx, py + ry] for rx, ry in reads]
+        flips = [0] * len(reads)
+        for j in range(1, last + 1):
+            for k, (rx, ry) in enumerate(reads):
+                if (rx + j * vx, ry + j * vy) in toggles:
+                    flips[k] ^= 1
+                if grid[px + j * vx + rx, py + j * vy + ry] ^ flips[k] != expected[k]:
+                    return None
+        return _HighwayPeriod(period, (vx, vy), sorted(toggles), reach)
+
+    def _skip_periods(self, windows: int) -> None:
+        highway = self._highway
+        grid = self.grid
+        px, py = self.ant.x, self.ant.y
+        vx, vy = highway.displacement
+        # Cells the ant may still read are written to the grid; older ones
+        # can stay in closed form.
+        kept = 0
+        if windows > MATERIALIZE_WINDOWS:
+            kept = windows - highway.reach - 1
+            self.highways.append(Highway((px, py), (vx, vy), highway.toggles, kept))
+        for i in range(kept, windows):
+            for tx, ty in highway.toggles:
+                cell = (px + i * vx + tx, py + i * vy + ty)
+                grid[cell] ^= 1
+        self.ant.x = px + windows * vx
+        self.ant.y = py + windows * vy
+
     def interact(self, entity: Any, action: str, **kwargs) -> Dict[str, Any]:
         raise NotImplementedError(
             "LangtonAntEnvironment does not support entity interactions"
@@ -73,8 +523,17 @@ class LangtonAntEnvironment(Environment):
 
 
 class LangtonAntSimulation(Simulation):
-    def __init__(self, width: int, height: int):
-        environment = LangtonAntEnvironment(width, height)
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        unbounded: bool = False,
+        chunk_size: int = 64,
+        skip_highways: bool = False,
+    ):
+        environment = LangtonAntEnvironment(
+            width, height, unbounded, chunk_size, skip_highways
+        )
         super().__init__(environment)
         self.steps = 0
 
@@ -85,15 +544,110 @@ class LangtonAntSimulation(Simulation):
         self.environment.update()
         self.steps += 1
 
+    def run_steps(self, steps: int) -> None:
+        """
+        Run the given number of steps at once.
+
+        This is much faster than calling run_step() repeatedly and ends in
+        exactly the same state.
+
+        Args:
+            steps (int): The number of steps to run.
+        """
+        self.environment.advance(steps)
+        self.steps += steps
+
     def is_complete(self) -> bool:
         return False  # The simulation runs indefinitely
 
-    def get_state(self) -> Dict[str, Any]:
-        env_state = self.environment.get_state()
-        return {"steps": self.steps, "grid": env_state["grid"], "ant": env_state["ant"]}
+    def get_state(
+        self, bounds: Optional[Tuple[int, int, int, int]] = None
+    ) -> Dict[str, Any]:
+        env_state = self.environment.get_state(bounds)
+        return {
+            "steps": self.steps,
+            "grid": env_state["grid"],
+            "origin": env_state["origin"],
+            "ant": env_state["ant"],
+            "highways": env_state["highways"],
+        }
+
+    def state_view(self) -> Dict[str, Any]:
+        """
+        Get the number of steps and the environment's state_view(), without
+        copying the grid.
+        """
+        return {"steps": self.steps, **self.environment.state_view()}
 
     def reset(self) -> None:
         self.initialize()
+        env = self.environment
         self.environment = LangtonAntEnvironment(
-            self.environment.width, self.environment.height
+            env.width, env.height, env.unbounded, env.chunk_size, env.skip_highways
         )
+
+    def _checkpoint_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        env = self.environment
+        metadata = {
+            "width": env.width,
+            "height": env.height,
+            "unbounded": env.unbounded,
+            "chunk_size": env.chunk_size,
+            "steps": self.steps,
+            "ant": [env.ant.x, env.ant.y, env.ant.direction],
+            "highways": [
+                {
+                    "origin": list(highway.origin),
+                    "displacement": list(highway.displacement),
+                    "toggles": [list(toggle) for toggle in highway.toggles],
+                    "windows": highway.windows,
+                }
+                for highway in env.highways
+            ],
+        }
+        if not env.unbounded:
+            return metadata, {"grid": env.grid}
+        size = env.chunk_size
+        keys = list(env.grid.chunks)
+        chunks = np.zeros((len(keys), size, size), dtype=np.uint8)
+        for i, key in enumerate(keys):
+            chunks[i] = np.frombuffer(env.grid.chunks[key], np.uint8).reshape(
+                size, size
+            )
+        arrays = {
+            "chunk_keys": np.array(keys, dtype=np.int64).reshape(-1, 2),
+            "chunks": chunks,
+        }
+        return metadata, arrays
+
+    def _restore_checkpoint(
+        self, metadata: Dict[str, Any], arrays: Dict[str, np.ndarray]
+    ) -> None:
+        env = self.environment
+        saved = (metadata["unbounded"], metadata["chunk_size"])
+        if saved != (env.unbounded, env.chunk_size) or (
+            not env.unbounded
+            and (metadata["width"], metadata["height"]) != (env.width, env.height)
+        ):
+            raise ValueError("Checkpoint world does not match the simulation")
+        self.reset()
+        env = self.environment
+        if env.unbounded:
+            env.grid.chunks = {
+                (int(cx), int(cy)): bytearray(chunk)
+                for (cx, cy), chunk in zip(arrays["chunk_keys"], arrays["chunks"])
+            }
+        else:
+            # Bounded grids are updated in place, so a mapped grid is used as is
+            env.grid = arrays["grid"]
+        env.ant.x, env.ant.y, env.ant.direction = metadata["ant"]
+        env.highways = [
+            Highway(
+                tuple(highway["origin"]),
+                tuple(highway["displacement"]),
+                [tuple(toggle) for toggle in highway["toggles"]],
+                highway["windows"],
+            )
+            for highway in metadata["highways"]
+        ]
+        self.steps = metadata["steps"]
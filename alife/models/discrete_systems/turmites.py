@@ -0,0 +1,323 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from alife.core import Environment, Simulation
+from alife.models.discrete_systems.langtons_ant import DX, DY
+from alife.utils.views import read_only
+
+# Relative turns, added to the direction (0: Up, 1: Right, 2: Down, 3: Left)
+TURNS = {"N": 0, "R": 1, "U": 2, "L": 3}
+
+_DX = np.array(DX, dtype=np.int64)
+_DY = np.array(DY, dtype=np.int64)
+
+
+class TurmiteRule:
+    """
+    A turmite rule as a transition table indexed by (state, color).
+
+    An ant in a given state standing on a cell of a given color writes
+    write[state, color] to the cell, turns by turn[state, color] quarter turns
+    clockwise, moves forward one cell and switches to next_state[state, color].
+    """
+
+    def __init__(self, write, turn, next_state):
+        """
+        Initialize a rule from its tables.
+
+        Args:
+            write: A (states, colors) array-like of colors to write.
+            turn: A (states, colors) array-like of clockwise quarter turns.
+            next_state: A (states, colors) array-like of next states.
+
+        Raises:
+            ValueError: If the tables do not have the same 2-D shape or hold
+                out-of-range values.
+        """
+        self.write = np.array(write, dtype=np.uint8)
+        self.turn = np.array(turn, dtype=np.int64) % 4
+        self.next_state = np.array(next_state, dtype=np.int64)
+        if self.write.ndim != 2 or not (
+            self.write.shape == self.turn.shape == self.next_state.shape
+        ):
+            raise ValueError("Rule tables must have the same (states, colors) shape")
+        self.states, self.colors = self.write.shape
+        if self.write.max() >= self.colors:
+            raise ValueError("Rule writes a color outside the table")
+        if self.next_state.min() < 0 or self.next_state.max() >= self.states:
+            raise ValueError("Rule switches to a state outside the table")
+        for table in (self.write, self.turn, self.next_state):
+            table.flags.writeable = False
+
+    @classmethod
+    def from_string(cls, rulestring: str) -> "TurmiteRule":
+        """
+        Parse a single-state rule such as "RL" (Langton's ant) or "LLRR".
+
+        Letter c gives the turn made on color c, one of L, R, N (no turn) and
+        U (U-turn). The cell is then advanced to the next color, cyclically.
+
+        Args:
+            rulestring (str): The rule to parse.
+
+        Returns:
+            TurmiteRule: The parsed rule.
+
+        Raises:
+            ValueError: If the string is not a valid rule.
+        """
+        letters = rulestring.strip().upper()
+        if len(letters) < 2 or any(letter not in TURNS for letter in letters):
+            raise ValueError(f"Invalid turmite rulestring: {rulestring}")
+        colors = len(letters)
+        write = [[(color + 1) % colors for color in range(colors)]]
+        turn = [[TURNS[letter] for letter in letters]]
+        return cls(write, turn, [[0] * colors])
+
+
+LANGTON = TurmiteRule.from_string("RL")
+
+
+def as_turmite_rule(rule: Union[str, TurmiteRule]) -> TurmiteRule:
+    """Convert a rulestring into a TurmiteRule."""
+    if isinstance(rule, TurmiteRule):
+        return rule
+    return TurmiteRule.from_string(rule)
+
+
+class TurmiteEnvironment(Environment):
+    """
+    Any number of turmites sharing one toroidal grid of colored cells.
+
+    Ants are stored as parallel arrays (x, y, direction, state) and all of them
+    advance together in one vectorized step. Every ant first reads the color
+    of its cell; then each cell occupied by ants is written by the ant with the
+    lowest index, and every ant turns, moves and changes state according to
+    the color it read.
+    """
+
+    def __init__(
+        self, width: int, height: int, rule: Union[str, TurmiteRule] = LANGTON
+    ):
+        self.width = width
+        self.height = height
+        self.rule = as_turmite_rule(rule)
+        self.grid = np.zeros((height, width), dtype=np.uint8)
+        self.x = np.zeros(0, dtype=np.int64)
+        self.y = np.zeros(0, dtype=np.int64)
+        self.direction = np.zeros(0, dtype=np.int64)
+        self.state = np.zeros(0, dtype=np.int64)
+        # Incremented whenever the grid or the ants change
+        self.version = 0
+
+    @property
+    def num_ants(self) -> int:
+        return len(self.x)
+
+    def add_ants(self, x, y, direction=0, state=0) -> None:
+        """
+        Add ants after the existing ones.
+
+        Args:
+            x: Column or array of columns.
+            y: Row or array of rows.
+            direction: Direction or array of directions (0: Up, 1: Right,
+                2: Down, 3: Left).
+            state: Rule state or array of rule states.
+
+        Raises:
+            ValueError: If an ant is outside the grid or in an unknown state.
+        """
+        self.version += 1
+        x, y, direction, state = np.broadcast_arrays(
+            np.atleast_1d(x), np.atleast_1d(y), direction, state
+        )
+        if (x < 0).any() or (x >= self.width).any():
+            raise ValueError("Ant x must be within the grid")
+        if (y < 0).any() or (y >= self.height).any():
+            raise ValueError("Ant y must be within the grid")
+        if (state < 0).any() or (state >= self.rule.states).any():
+            raise ValueError("Ant state must be a state of the rule")
+        self.x = np.concatenate([self.x, x.astype(np.int64)])
+        self.y = np.concatenate([self.y, y.astype(np.int64)])
+        self.direction = np.concatenate(
+            [self.direction, direction.astype(np.int64) % 4]
+        )
+        self.state = np.concatenate([self.state, state.astype(np.int64)])
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            "grid": self.grid.copy(),
+            "x": self.x.copy(),
+            "y": self.y.copy(),
+            "direction": self.direction.copy(),
+            "state": self.state.copy(),
+        }
+
+    def state_view(self) -> Dict[str, Any]:
+        """
+        Get the state without copying it, for polling.
+
+        Returns:
+            Dict[str, Any]: The version, which changes whenever the grid or
+            the ants change, and read-only views of the grid and the ant
+            arrays. The grid view follows later steps; copy it to keep a
+            snapshot, or use get_state(), which always copies.
+        """
+        return {
+            "version": self.version,
+            "grid": read_only(self.grid),
+            "x": read_only(self.x),
+            "y": read_only(self.y),
+            "direction": read_only(self.direction),
+            "state": read_only(self.state),
+        }
+
+    def update(self) -> None:
+        self.version += 1
+        rule = self.rule
+        flat = self.y * self.width + self.x
+        colors = self.grid.reshape(-1)[flat]
+        write = rule.write[self.state, colors]
+
+        # np.unique returns the first index of each cell, so the
+        # lowest-numbered ant on a shared cell decides its new color.
+        cells, first = np.unique(flat, return_index=True)
+        self.grid.reshape(-1)[cells] = write[first]
+
+        self.direction = (self.direction + rule.turn[self.state, colors]) & 3
+        self.state = rule.next_state[self.state, colors]
+        self.x = (self.x + _DX[self.direction]) % self.width
+        self.y = (self.y + _DY[self.direction]) % self.height
+
+    def advance(self, steps: int) -> None:
+        """
+        Advance all ants by the given number of steps.
+
+        Args:
+            steps (int): The number of steps to run.
+        """
+        for _ in range(steps):
+            self.update()
+
+    def interact(self, entity: Any, action: str, **kwargs) -> Dict[str, Any]:
+        raise NotImplementedError(
+            "TurmiteEnvironment does not support entity interactions"
+        )
+
+    def add_entity(self, entity: Any) -> None:
+        raise NotImplementedError("TurmiteEnvironment does not support adding entities")
+
+    def remove_entity(self, entity: Any) -> None:
+        raise NotImplementedError(
+            "TurmiteEnvironment does not support removing entities"
+        )
+
+    def get_entities(self) -> List[Any]:
+        return []
+
+
+class TurmiteSimulation(Simulation):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        rule: Union[str, TurmiteRule] = LANGTON,
+        num_ants: int = 1,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize a turmite simulation.
+
+        Args:
+            width (int): The number of columns.
+            height (int): The number of rows.
+            rule (Union[str, TurmiteRule]): The rule, or its rulestring.
+            num_ants (int): The number of ants. A single ant starts in the
+                middle of the grid facing up; several ants start on random
+                cells facing random directions.
+            seed (Optional[int]): Seed for the random ant placement.
+        """
+        super().__init__(TurmiteEnvironment(width, height, rule))
+        self.num_ants = num_ants
+        self.seed = seed
+        self.steps = 0
+
+    def initialize(self) -> None:
+        env = self.environment
+        self.environment = env = TurmiteEnvironment(env.width, env.height, env.rule)
+        if self.num_ants == 1:
+            env.add_ants(env.width // 2, env.height // 2)
+        else:
+            rng = np.random.default_rng(self.seed)
+            env.add_ants(
+                rng.integers(0, env.width, self.num_ants),
+                rng.integers(0, env.height, self.num_ants),
+                rng.integers(0, 4, self.num_ants),
+            )
+        self.steps = 0
+
+    def run_step(self) -> None:
+        self.environment.update()
+        self.steps += 1
+
+    def run_steps(self, steps: int) -> None:
+        """
+        Run the given number of steps.
+
+        Args:
+            steps (int): The number of steps to run.
+        """
+        self.environment.advance(steps)
+        self.steps += steps
+
+    def is_complete(self) -> bool:
+        return False  # The simulation runs indefinitely
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"steps": self.steps, **self.environment.get_state()}
+
+    def state_view(self) -> Dict[str, Any]:
+        """
+        Get the number of steps and the environment's state_view(), without
+        copying anything.
+        """
+        return {"steps": self.steps, **self.environment.state_view()}
+
+    def reset(self) -> None:
+        self.initialize()
+
+    def _checkpoint_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        env = self.environment
+        metadata = {"width": env.width, "height": env.height, "steps": self.steps}
+        arrays = {
+            "grid": env.grid,
+            "x": env.x,
+            "y": env.y,
+            "direction": env.direction,
+            "state": env.state,
+            "rule_write": env.rule.write,
+            "rule_turn": env.rule.turn,
+            "rule_next_state": env.rule.next_state,
+        }
+        return metadata, arrays
+
+    def _restore_checkpoint(
+        self, metadata: Dict[str, Any], arrays: Dict[str, np.ndarray]
+    ) -> None:
+        env = self.environment
+        if (metadata["width"], metadata["height"]) != (env.width, env.height):
+            raise ValueError("Checkpoint grid size does not match the simulation")
+        rule = env.rule
+        for name, table in [
+            ("rule_write", rule.write),
+            ("rule_turn", rule.turn),
+            ("rule_next_state", rule.next_state),
+        ]:
+            if not np.array_equal(arrays[name], table):
+                raise ValueError("Checkpoint rule does not match the simulation")
+        self.environment = env = TurmiteEnvironment(env.width, env.height, rule)
+        env.grid = arrays["grid"]
+        env.add_ants(arrays["x"], arrays["y"], arrays["direction"], arrays["state"])
+        self.steps = metadata["steps"]
@@ -0,0 +1,412 @@
+# alife/organisms/population.py
+
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from alife.core import Environment, Organism, Resource
+
+# Columns every population has, besides one float column per resource
+_BASE_COLUMNS = {"x": np.int64, "y": np.int64, "age": np.int64, "alive": bool}
+
+# Compaction runs once vacant rows outnumber present ones, and at least this
+# many rows are vacant, so its cost is spread over the removals that caused it
+_MIN_VACANT = 1024
+
+
+class Population:
+    """
+    Many organisms stored as columns of a table, one row per organism.
+
+    The position, age, alive flag and resource levels of every organism are
+    held in contiguous NumPy arrays, so a population of millions takes a few
+    dozen bytes per organism and can be updated with whole-array operations.
+    Each organism has a stable integer id. Rows are kept in id order; removed
+    rows are only marked vacant, and the columns are compacted once vacant
+    rows make up half the table, so removal costs amortized O(1) per organism.
+
+    Columns are read and written through population[name], which returns a
+    view of the first size rows, vacant ones included. Vacant rows always
+    have alive set to False.
+    """
+
+    def __init__(self, resources: Iterable[str] = ("energy",), capacity: int = 1024):
+        """
+        Initialize an empty population.
+
+        Args:
+            resources (Iterable[str]): The names of the resource columns.
+            capacity (int): The number of rows to allocate up front. The
+                columns double in size whenever they fill up.
+
+        Raises:
+            ValueError: If a resource name clashes with a built-in column.
+        """
+        self.resources = list(resources)
+        for name in self.resources:
+            if name in _BASE_COLUMNS or name in ("id", "present"):
+                raise ValueError(f"Invalid resource name: {name}")
+        capacity = max(capacity, 1)
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=dtype)
+            for name, dtype in _BASE_COLUMNS.items()
+        }
+        for name in self.resources:
+            self._columns[name] = np.zeros(capacity, dtype=np.float64)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._present = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self._vacant = 0
+        self._next_id = 0
+        # Bumped whenever rows move, so proxies know to look their row up again
+        self._layout = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._ids)
+
+    @property
+    def ids(self) -> np.ndarray:
+        """The id of every row, vacant ones included, as a read-only view."""
+        view = self._ids[: self.size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def present(self) -> np.ndarray:
+        """Whether each row holds an organism, as a read-only view."""
+        view = self._present[: self.size]
+        view.flags.writeable = False
+        return view
+
+    def __len__(self) -> int:
+        return self.size - self._vacant
+
+    def __contains__(self, organism_id: int) -> bool:
+        return self._find(organism_id) >= 0
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """
+        Get a column as a writable view of the first size rows.
+
+        Args:
+            column (str): "x", "y", "age", "alive" or a resource name.
+
+        Returns:
+            np.ndarray: The column. The view is invalidated by add() and
+            compact(), which may reallocate or move the rows.
+
+        Raises:
+            KeyError: If there is no such column.
+        """
+        return self._columns[column][: self.size]
+
+    def __setitem__(self, column: str, values) -> None:
+        self._columns[column][: self.size] = values
+
+    def add(self, count: int = 1, x=0, y=0, age=0, **levels: Any) -> np.ndarray:
+        """
+        Add organisms after the existing ones.
+
+        Args:
+            count (int): The number of organisms to add.
+            x: Column or array of columns.
+            y: Row or array of rows.
+            age: Age or array of ages.
+            **levels: Initial level or array of levels for each resource,
+                by name. Resources not given start at 0.
+
+        Returns:
+            np.ndarray: The ids of the new organisms.
+
+        Raises:
+            ValueError: If count is negative or a resource is unknown.
+        """
+        if count < 0:
+            raise ValueError("Cannot add a negative number of organisms")
+        for name in levels:
+            if name not in self.resources:
+                raise ValueError(f"Unknown resource: {name}")
+        self._reserve(self.size + count)
+        rows = slice(self.size, self.size + count)
+        columns = self._columns
+        columns["x"][rows] = x
+        columns["y"][rows] = y
+        columns["age"][rows] = age
+        columns["alive"][rows] = True
+        for name in self.resources:
+            columns[name][rows] = levels.get(name, 0)
+        ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+        self._ids[rows] = ids
+        self._present[rows] = True
+        self._next_id += count
+        self.size += count
+        return ids
+
+    def remove(self, ids) -> None:
+        """
+        Remove organisms.
+
+        Args:
+            ids: An id or array-like of ids.
+
+        Raises:
+            ValueError: If an id is not in the population.
+        """
+        rows = self.rows(ids)
+        if len(np.unique(rows)) != len(rows):
+            raise ValueError("Cannot remove an organism twice")
+        self._present[rows] = False
+        self._columns["alive"][rows] = False
+        self._vacant += len(rows)
+        if self._vacant >= _MIN_VACANT and 2 * self._vacant >= self.size:
+            self.compact()
+
+    def remove_dead(self) -> np.ndarray:
+        """
+        Remove every organism whose alive flag is False.
+
+        Returns:
+            np.ndarray: The ids of the removed organisms.
+        """
+        dead = self._present[: self.size] & ~self._columns["alive"][: self.size]
+        ids = self._ids[: self.size][dead]
+        if len(ids):
+            self.remove(ids)
+        return ids
+
+    def compact(self) -> None:
+        """Drop vacant rows, keeping the remaining rows in id order."""
+        if not self._vacant:
+            return
+        keep = np.flatnonzero(self._present[: self.size])
+        count = len(keep)
+        for column in self._columns.values():
+            column[:count] = column[keep]
+        self._ids[:count] = self._ids[keep]
+        self._present[:count] = True
+        self._present[count : self.size] = False
+        self.size = count
+        self._vacant = 0
+        self._layout += 1
+
+    def rows(self, ids) -> np.ndarray:
+        """
+        Find the current rows of organisms.
+
+        Args:
+            ids: An id or array-like of ids.
+
+        Returns:
+            np.ndarray: The row of each id.
+
+        Raises:
+            ValueError: If an id is not in the population.
+        """
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        # Ids only ever increase, so the id column is sorted
+        rows = np.searchsorted(self._ids[: self.size], ids)
+        found = rows < self.size
+        found[found] = self._ids[rows[found]] == ids[found]
+        found[found] = self._present[rows[found]]
+        if not found.all():
+            missing = ids[~found][0]
+            raise ValueError(f"Organism {missing} is not in the population")
+        return rows
+
+    def update_alive(self) -> np.ndarray:
+        """
+        Mark organisms that ran out of any resource as dead.
+
+        Returns:
+            np.ndarray: The ids of the organisms that died.
+        """
+        alive = self._columns["alive"][: self.size]
+        dying = alive & ~self._all_positive()
+        alive[dying] = False
+        return self._ids[: self.size][dying]
+
+    def agent(self, organism_id: int) -> "PopulationMember":
+        """
+        Get a proxy for one organism.
+
+        Args:
+            organism_id (int): The id of the organism.
+
+        Returns:
+            PopulationMember: An Organism that reads and writes the row.
+
+        Raises:
+            ValueError: If the id is not in the population.
+        """
+        self.rows(organism_id)
+        return PopulationMember(self, int(organism_id))
+
+    def __iter__(self) -> Iterator["PopulationMember"]:
+        for organism_id in self._ids[: self.size][self._present[: self.size]]:
+            yield PopulationMember(self, int(organism_id))
+
+    def _all_positive(self) -> np.ndarray:
+        positive = np.ones(self.size, dtype=bool)
+        for name in self.resources:
+            positive &= self._columns[name][: self.size] > 0
+        return positive
+
+    def _find(self, organism_id: int) -> int:
+        # The row of an id, or -1 if it is not in the population
+        row = int(np.searchsorted(self._ids[: self.size], organism_id))
+        if row < self.size and self._ids[row] == organism_id and self._present[row]:
+            return row
+        return -1
+
+    def _reserve(self, size: int) -> None:
+        capacity = self.capacity
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.size] = column[: self.size]
+            self._columns[name] = grown
+        for name in ("_ids", "_present"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.size] = column[: self.size]
+            setattr(self, name, grown)
+
+
+class ColumnResource(Resource):
+    """
+    A resource backed by one cell of a Population column.
+
+    It behaves like a FiniteResource: amounts must be non-negative and an
+    organism cannot consume more than it has.
+    """
+
+    def __init__(self, member: "PopulationMember", name: str):
+        self._member = member
+        self._name = name
+
+    def consume(self, amount: float) -> None:
+        if amount < 0:
+            raise ValueError("Cannot consume negative amount of resource.")
+        column = self._member.population[self._name]
+        row = self._member.row
+        if column[row] < amount:
+            raise ValueError("Insufficient resource.")
+        column[row] -= amount
+
+    def produce(self, amount: float) -> None:
+        if amount < 0:
+            raise ValueError("Cannot produce negative amount of resource.")
+        self._member.population[self._name][self._member.row] += amount
+
+    def get_level(self) -> float:
+        return float(self._member.population[self._name][self._member.row])
+
+
+class PopulationMember(Organism):
+    """
+    An Organism whose state lives in a row of a Population.
+
+    Proxies hold only the population and the organism's id, so they can be
+    created on demand and thrown away. Every attribute is read from and
+    written to the columns, so changes made through a proxy and through
+    whole-column operations are seen by both.
+    """
+
+    def __init__(self, population: Population, organism_id: int):
+        # Entity.__init__ is not called: resources are the population's columns
+        self.population = population
+        self.id = organism_id
+        self._row = -1
+        self._layout = -1
+
+    @property
+    def row(self) -> int:
+        """
+        The current row of the organism.
+
+        Raises:
+            ValueError: If the organism has been removed.
+        """
+        population = self.population
+        if self._layout != population._layout or self._row >= population.size:
+            self._row = int(population.rows(self.id)[0])
+            self._layout = population._layout
+        elif not population._present[self._row]:
+            raise ValueError(f"Organism {self.id} is not in the population")
+        return self._row
+
+    @property
+    def resources(self) -> Dict[str, Resource]:
+        return {name: ColumnResource(self, name) for name in self.population.resources}
+
+    def add_resource(self, name: str, resource: Resource) -> None:
+        """
+        Set the level of one of the population's resources.
+
+        Args:
+            name (str): The name of the resource column.
+            resource (Resource): A resource whose current level is copied.
+
+        Raises:
+            ValueError: If the population has no such resource.
+        """
+        if name not in self.population.resources:
+            raise ValueError(f"Unknown resource: {name}")
+        self.population[name][self.row] = resource.get_level()
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        row = self.row
+        return int(self.population["x"][row]), int(self.population["y"][row])
+
+    @position.setter
+    def position(self, position: Tuple[int, int]) -> None:
+        row = self.row
+        self.population["x"][row], self.population["y"][row] = position
+
+    @property
+    def age(self) -> int:
+        return int(self.population["age"][self.row])
+
+    @age.setter
+    def age(self, age: int) -> None:
+        self.population["age"][self.row] = age
+
+    def is_alive(self) -> bool:
+        """
+        Check if the organism is alive.
+
+        Returns:
+            bool: True if the organism is still in the population, its alive
+            flag is set and all its resource levels are above 0.
+        """
+        row = self.population._find(self.id)
+        if row < 0 or not self.population["alive"][row]:
+            return False
+        return all(self.population[name][row] > 0 for name in self.population.resources)
+
+    def interact(self, environment: Environment) -> None:
+        # Population members are updated by whole-column operations
+        pass
+
+    def act(self, environment: Environment) -> None:
+        # Population members are updated by whole-column operations
+        pass
+
+    def reproduce(self) -> Optional["PopulationMember"]:
+        return None
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PopulationMember):
+            return NotImplemented
+        return self.population is other.population and self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash((id(self.population), self.id))
+
+    def __repr__(self) -> str:
+        return f"PopulationMember(id={self.id})"
@@ -8,6 +8,8 @@ from alife.core import Resource
 class FiniteResource(Resource):
     """A resource with a finite amount that cannot go below zero."""
 
+    reports_changes = True
+
     def __init__(self, initial_amount: float = 0):
         self._amount = max(0, initial_amount)
 
@@ -16,12 +18,16 @@ class FiniteResource(Resource):
             raise ValueError("Cannot consume negative amount of resource.")
         if self._amount < amount:
             raise ValueError("Insufficient resource.")
+        old = self._amount
         self._amount -= amount
+        self._level_changed(old, self._amount)
 
     def produce(self, amount: float) -> None:
         if amount < 0:
             raise ValueError("Cannot produce negative amount of resource.")
+        old = self._amount
         self._amount += amount
+        self._level_changed(old, self._amount)
 
     def get_level(self) -> float:
         return self._amount
@@ -30,6 +36,8 @@ class FiniteResource(Resource):
 class InfiniteResource(Resource):
     """A resource with an infinite amount."""
 
+    reports_changes = True  # The level never changes
+
     def consume(self, amount: float) -> None:
         if amount < 0:
             raise ValueError("Cannot consume negative amount of resource.")
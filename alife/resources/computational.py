@@ -2,16 +2,22 @@ from alife.core import Resource
 
 
 class ComputationalResource(Resource):
+    reports_changes = True
+
     def __init__(self, initial_level: float):
         self._level = initial_level
 
     def consume(self, amount: float) -> None:
+        old = self._level
         self._level -= amount
         if self._level < 0:
             self._level = 0
+        self._level_changed(old, self._level)
 
     def produce(self, amount: float) -> None:
+        old = self._level
         self._level += amount
+        self._level_changed(old, self._level)
 
     def get_level(self) -> float:
         return self._level
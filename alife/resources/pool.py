@@ -0,0 +1,173 @@
+# alife/resources/pool.py
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+from alife.core import Resource
+from alife.resources.base import RegeneratingResource
+
+
+def _amounts(pool: "ResourcePool", amounts, mask) -> np.ndarray:
+    # The amount applied to every element, 0 where mask is False
+    amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float64), pool.levels.shape)
+    if mask is None:
+        return amounts
+    return np.where(mask, amounts, 0.0)
+
+
+class ResourcePool:
+    """
+    N regenerating finite resources, held as arrays of levels and rates.
+
+    Each element behaves like a RegeneratingResource, but a batch operation
+    acts on every element at once. Invalid requests do not raise: an element
+    whose amount is negative, or that has too little left to consume, is left
+    unchanged and flagged in the returned failure mask.
+    """
+
+    def __init__(self, levels, regeneration_rates=0):
+        """
+        Initialize a pool.
+
+        Args:
+            levels: The initial level of each element. Negative levels are
+                raised to 0.
+            regeneration_rates: A rate for every element, or one rate for
+                all. Negative rates are raised to 0.
+
+        Raises:
+            ValueError: If the rates do not match the levels.
+        """
+        self.levels = np.maximum(np.array(levels, dtype=np.float64).reshape(-1), 0.0)
+        rates = np.asarray(regeneration_rates, dtype=np.float64)
+        if rates.ndim and rates.shape != self.levels.shape:
+            raise ValueError("Need one regeneration rate per element")
+        self.regeneration_rates = np.maximum(
+            np.broadcast_to(rates, self.levels.shape), 0.0
+        )
+
+    @classmethod
+    def from_resources(
+        cls, resources: Iterable[RegeneratingResource]
+    ) -> "ResourcePool":
+        """
+        Gather the levels and rates of individual resources into a pool.
+
+        Args:
+            resources (Iterable[RegeneratingResource]): The resources to copy.
+
+        Returns:
+            ResourcePool: A pool with one element per resource.
+        """
+        resources = list(resources)
+        return cls(
+            [resource.get_level() for resource in resources],
+            [resource.regeneration_rate for resource in resources],
+        )
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def consume(self, amounts, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Consume from every element at once.
+
+        Args:
+            amounts: The amount to consume from each element, or one amount
+                for all.
+            mask (Optional[np.ndarray]): Which elements to consume from.
+                Defaults to all.
+
+        Returns:
+            np.ndarray: A bool array that is True where the amount was
+            negative or more than the element held. Those elements are
+            unchanged.
+        """
+        amounts = _amounts(self, amounts, mask)
+        failed = (amounts < 0) | (self.levels < amounts)
+        self.levels -= np.where(failed, 0.0, amounts)
+        return failed
+
+    def produce(self, amounts, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Produce into every element at once.
+
+        Args:
+            amounts: The amount to add to each element, or one amount for all.
+            mask (Optional[np.ndarray]): Which elements to produce into.
+                Defaults to all.
+
+        Returns:
+            np.ndarray: A bool array that is True where the amount was
+            negative. Those elements are unchanged.
+        """
+        amounts = _amounts(self, amounts, mask)
+        failed = amounts < 0
+        self.levels += np.where(failed, 0.0, amounts)
+        return failed
+
+    def regenerate(self, mask: Optional[np.ndarray] = None) -> None:
+        """
+        Regenerate every element by its regeneration rate.
+
+        Args:
+            mask (Optional[np.ndarray]): Which elements to regenerate.
+                Defaults to all.
+        """
+        if mask is None:
+            self.levels += self.regeneration_rates
+        else:
+            self.levels += np.where(mask, self.regeneration_rates, 0.0)
+
+    def resource(self, index: int) -> "PooledResource":
+        """
+        Get one element as a Resource.
+
+        Args:
+            index (int): The element.
+
+        Returns:
+            PooledResource: A resource that reads and writes the element.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if not -len(self) <= index < len(self):
+            raise IndexError("Resource pool index out of range")
+        return PooledResource(self, index % len(self))
+
+
+class PooledResource(Resource):
+    """
+    One element of a ResourcePool, with the interface of RegeneratingResource.
+
+    Single operations raise ValueError like FiniteResource does.
+    """
+
+    def __init__(self, pool: ResourcePool, index: int):
+        self.pool = pool
+        self.index = index
+
+    @property
+    def regeneration_rate(self) -> float:
+        return float(self.pool.regeneration_rates[self.index])
+
+    def consume(self, amount: float) -> None:
+        if amount < 0:
+            raise ValueError("Cannot consume negative amount of resource.")
+        if self.pool.levels[self.index] < amount:
+            raise ValueError("Insufficient resource.")
+        self.pool.levels[self.index] -= amount
+
+    def produce(self, amount: float) -> None:
+        if amount < 0:
+            raise ValueError("Cannot produce negative amount of resource.")
+        self.pool.levels[self.index] += amount
+
+    def regenerate(self) -> None:
+        """Regenerate the resource based on its regeneration rate."""
+        self.produce(self.regeneration_rate)
+
+    def get_level(self) -> float:
+        return float(self.pool.levels[self.index])
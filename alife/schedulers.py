@@ -0,0 +1,245 @@
+# alife/schedulers.py
+
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from alife.core import Entity, Environment, Organism
+
+Action = Callable[[Entity, Environment], Any]
+
+
+def activate(agent: Entity, environment: Environment) -> None:
+    """
+    The default action of an agent: act() for organisms, interact() otherwise.
+
+    Args:
+        agent (Entity): The agent to activate.
+        environment (Environment): The environment it acts in.
+    """
+    if isinstance(agent, Organism):
+        agent.act(environment)
+    else:
+        agent.interact(environment)
+
+
+class Scheduler(ABC):
+    """
+    Abstract base class deciding how and in which order agents act in a step.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Initialize a scheduler.
+
+        Args:
+            seed (Optional[int]): Seed for any randomness of the scheduler, so
+                runs with the same seed activate agents identically.
+        """
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.steps = 0
+
+    def step(self, agents: Sequence[Entity], environment: Environment) -> None:
+        """
+        Activate agents for one step.
+
+        Args:
+            agents (Sequence[Entity]): The agents to activate. The sequence is
+                not read again once the step starts, so agents may add or
+                remove entities while acting.
+            environment (Environment): The environment they act in.
+        """
+        self._step(list(agents), environment)
+        self.steps += 1
+
+    @abstractmethod
+    def _step(self, agents: List[Entity], environment: Environment) -> None:
+        pass
+
+
+class SequentialScheduler(Scheduler):
+    """Activates agents one after another, in the order given."""
+
+    def __init__(self, action: Action = activate):
+        """
+        Initialize a sequential scheduler.
+
+        Args:
+            action (Action): Called with each agent and the environment.
+        """
+        super().__init__()
+        self.action = action
+
+    def _step(self, agents: List[Entity], environment: Environment) -> None:
+        for agent in agents:
+            self.action(agent, environment)
+
+
+class RandomScheduler(Scheduler):
+    """Activates agents one after another, in a new random order each step."""
+
+    def __init__(self, action: Action = activate, seed: Optional[int] = None):
+        """
+        Initialize a random-order scheduler.
+
+        Args:
+            action (Action): Called with each agent and the environment.
+            seed (Optional[int]): Seed for the activation order.
+        """
+        super().__init__(seed)
+        self.action = action
+
+    def _step(self, agents: List[Entity], environment: Environment) -> None:
+        for index in self.rng.permutation(len(agents)):
+            self.action(agents[index], environment)
+
+
+class StagedScheduler(Scheduler):
+    """
+    Runs each step as a series of stages; every agent finishes a stage before
+    any agent starts the next one.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[Union[str, Action]],
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize a staged scheduler.
+
+        Args:
+            stages (Sequence[Union[str, Action]]): The stages, in order. A
+                string names a method called on each agent with the
+                environment; a callable is called with the agent and the
+                environment.
+            shuffle (bool): Whether to activate agents in a new random order
+                each step. The same order is used for every stage of a step.
+            seed (Optional[int]): Seed for the activation order.
+
+        Raises:
+            ValueError: If there are no stages.
+        """
+        if not stages:
+            raise ValueError("A staged scheduler needs at least one stage")
+        super().__init__(seed)
+        self.stages = list(stages)
+        self.shuffle = shuffle
+
+    def _step(self, agents: List[Entity], environment: Environment) -> None:
+        if self.shuffle:
+            agents = [agents[index] for index in self.rng.permutation(len(agents))]
+        for stage in self.stages:
+            for agent in agents:
+                if isinstance(stage, str):
+                    getattr(agent, stage)(environment)
+                else:
+                    stage(agent, environment)
+
+
+def _default_decide(agent: Any, environment: Environment, rng: np.random.Generator):
+    return agent.decide(environment, rng)
+
+
+def _default_apply(agent: Any, environment: Environment, decision: Any) -> None:
+    agent.apply(environment, decision)
+
+
+def _decide_chunk(decide, environment, agents, seeds) -> List[Any]:
+    return [
+        decide(agent, environment, np.random.default_rng(seed))
+        for agent, seed in zip(agents, seeds)
+    ]
+
+
+class SimultaneousScheduler(Scheduler):
+    """
+    Activates all agents as if at the same instant, in two phases.
+
+    First every agent decides what to do, seeing the environment as it was at
+    the start of the step; then the decisions are applied one by one, in the
+    order of the agents. Since deciding does not change anything, it can run
+    in a pool of threads or processes. Each agent gets its own random
+    generator, seeded from the scheduler seed, the step and the agent's
+    position in the sequence, so results do not depend on the pool.
+    """
+
+    def __init__(
+        self,
+        decide: Callable[[Any, Environment, np.random.Generator], Any] = (
+            _default_decide
+        ),
+        apply: Callable[[Any, Environment, Any], None] = _default_apply,
+        seed: Optional[int] = None,
+        workers: int = 1,
+        executor: str = "thread",
+    ):
+        """
+        Initialize a simultaneous scheduler.
+
+        Args:
+            decide (Callable): Called with an agent, the environment and a
+                random generator; returns the agent's decision. It must not
+                change the agent or the environment. Defaults to calling
+                agent.decide(environment, rng).
+            apply (Callable): Called with an agent, the environment and the
+                agent's decision. Defaults to calling
+                agent.apply(environment, decision).
+            seed (Optional[int]): Seed for the agents' random generators.
+            workers (int): The number of threads or processes deciding.
+            executor (str): "thread" or "process". With processes, decide,
+                the agents and the environment must be picklable, and decide
+                must be a module-level function.
+
+        Raises:
+            ValueError: If workers is not positive or executor is unknown.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Invalid executor: {executor}")
+        super().__init__(seed)
+        self.decide = decide
+        self.apply = apply
+        self.workers = workers
+        self.executor = executor
+        self._entropy = np.random.SeedSequence(seed).entropy
+        self._pool: Optional[Executor] = None
+
+    def _seeds(self, count: int) -> List[List[int]]:
+        return [[self._entropy, self.steps, index] for index in range(count)]
+
+    def _step(self, agents: List[Entity], environment: Environment) -> None:
+        seeds = self._seeds(len(agents))
+        if self.workers == 1 or len(agents) < 2:
+            decisions = _decide_chunk(self.decide, environment, agents, seeds)
+        else:
+            if self._pool is None:
+                if self.executor == "thread":
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers)
+                else:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            bounds = np.linspace(0, len(agents), self.workers + 1).astype(int)
+            futures = [
+                self._pool.submit(
+                    _decide_chunk,
+                    self.decide,
+                    environment,
+                    agents[start:stop],
+                    seeds[start:stop],
+                )
+                for start, stop in zip(bounds, bounds[1:])
+            ]
+            decisions = [d for future in futures for d in future.result()]
+        for agent, decision in zip(agents, decisions):
+            self.apply(agent, environment, decision)
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,131 @@
+# alife/utils/checkpoint.py
+
+import json
+import struct
+import zlib
+from typing import Any, Dict, NamedTuple
+
+import numpy as np
+
+# File layout: MAGIC, the format version and the header length as two
+# little-endian uint32, the JSON header, then the arrays. Every array starts on
+# an ALIGNMENT-byte boundary so raw arrays can be memory-mapped in place.
+MAGIC = b"ALIFECKP"
+VERSION = 1
+ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sII")
+
+
+class Checkpoint(NamedTuple):
+    """The contents of a checkpoint file."""
+
+    kind: str
+    metadata: Dict[str, Any]
+    arrays: Dict[str, np.ndarray]
+
+
+def _encode(array: np.ndarray, pack_bits: bool, compress: bool):
+    # The bytes stored for an array and how to decode them
+    entry = {"dtype": array.dtype.str, "shape": list(array.shape)}
+    packed = pack_bits and array.dtype == bool
+    if packed:
+        data = np.packbits(array.reshape(-1)).tobytes()
+    else:
+        data = np.ascontiguousarray(array).tobytes()
+    if compress:
+        data = zlib.compress(data)
+    entry.update(packed=packed, compressed=compress, length=len(data))
+    return entry, data
+
+
+def save_checkpoint(
+    path: str,
+    kind: str,
+    metadata: Dict[str, Any],
+    arrays: Dict[str, np.ndarray],
+    pack_bits: bool = False,
+    compress: bool = False,
+) -> None:
+    """
+    Write a checkpoint file.
+
+    Args:
+        path (str): The file to write.
+        kind (str): What the checkpoint holds, checked when it is loaded.
+        metadata (Dict[str, Any]): JSON-serializable values.
+        arrays (Dict[str, np.ndarray]): Arrays stored as raw buffers.
+        pack_bits (bool): Store bool arrays eight cells per byte.
+        compress (bool): Compress every array with zlib.
+    """
+    entries = {}
+    blobs = []
+    offset = 0
+    for name, array in arrays.items():
+        entry, data = _encode(np.asarray(array), pack_bits, compress)
+        entry["offset"] = offset
+        entries[name] = entry
+        blobs.append(data)
+        offset += -(-len(data) // ALIGNMENT) * ALIGNMENT
+    header = json.dumps({"kind": kind, "metadata": metadata, "arrays": entries}).encode(
+        "utf-8"
+    )
+    start = -(-(_PREFIX.size + len(header)) // ALIGNMENT) * ALIGNMENT
+
+    with open(path, "wb") as file:
+        file.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        file.write(header)
+        for name, data in zip(entries, blobs):
+            file.seek(start + entries[name]["offset"])
+            file.write(data)
+        file.truncate(start + offset)
+
+
+def load_checkpoint(path: str, mmap: bool = False) -> Checkpoint:
+    """
+    Read a checkpoint file.
+
+    Args:
+        path (str): The file to read.
+        mmap (bool): Map arrays stored raw (neither packed nor compressed)
+            from the file instead of reading them. Pages are then read only
+            when used, and writes to the arrays stay in memory.
+
+    Returns:
+        Checkpoint: The kind, metadata and arrays of the checkpoint.
+
+    Raises:
+        ValueError: If the file is not a checkpoint of a supported version.
+    """
+    with open(path, "rb") as file:
+        prefix = file.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"{path} is not a checkpoint")
+        magic, version, header_length = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a checkpoint")
+        if version != VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {version}")
+        header = json.loads(file.read(header_length).decode("utf-8"))
+        start = -(-(_PREFIX.size + header_length) // ALIGNMENT) * ALIGNMENT
+
+        arrays = {}
+        for name, entry in header["arrays"].items():
+            dtype = np.dtype(entry["dtype"])
+            shape = tuple(entry["shape"])
+            raw = not entry["packed"] and not entry["compressed"]
+            if mmap and raw and entry["length"]:
+                arrays[name] = np.memmap(
+                    path, dtype, "c", start + entry["offset"], shape
+                )
+                continue
+            file.seek(start + entry["offset"])
+            data = file.read(entry["length"])
+            if entry["compressed"]:
+                data = zlib.decompress(data)
+            if entry["packed"]:
+                count = int(np.prod(shape))
+                bits = np.unpackbits(np.frombuffer(data, np.uint8), count=count)
+                arrays[name] = bits.astype(bool).reshape(shape)
+            else:
+                arrays[name] = np.frombuffer(data, dtype).reshape(shape).copy()
+    return Checkpoint(header["kind"], header["metadata"], arrays)
@@ -0,0 +1,249 @@
+# alife/utils/profiler.py
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+from alife.core import Simulation, SimulationHook
+
+
+class PhaseStats:
+    """Timings of one phase, accumulated over every time it ran."""
+
+    def __init__(self):
+        self.count = 0
+        self.wall_ns = 0
+        self.cpu_ns = 0
+        self.min_wall_ns: Optional[int] = None
+        self.max_wall_ns = 0
+        self.allocated_blocks = 0
+        self.allocated_bytes = 0
+        # Bucket b counts runs whose wall time was in [2**(b-1), 2**b) ns
+        self.histogram: Dict[int, int] = {}
+
+    def add(self, wall_ns: int, cpu_ns: int, blocks: int, allocated: int) -> None:
+        self.count += 1
+        self.wall_ns += wall_ns
+        self.cpu_ns += cpu_ns
+        if self.min_wall_ns is None or wall_ns < self.min_wall_ns:
+            self.min_wall_ns = wall_ns
+        self.max_wall_ns = max(self.max_wall_ns, wall_ns)
+        self.allocated_blocks += blocks
+        self.allocated_bytes += allocated
+        bucket = wall_ns.bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def to_dict(self, trace_memory: bool) -> Dict[str, Any]:
+        stats = {
+            "count": self.count,
+            "wall_seconds": self.wall_ns / 1e9,
+            "cpu_seconds": self.cpu_ns / 1e9,
+            "mean_wall_seconds": self.wall_ns / 1e9 / self.count,
+            "min_wall_seconds": (self.min_wall_ns or 0) / 1e9,
+            "max_wall_seconds": self.max_wall_ns / 1e9,
+            "allocated_blocks": self.allocated_blocks,
+            # Upper bound in seconds of each histogram bucket, and its count
+            "wall_histogram": {
+                2**bucket / 1e9: count
+                for bucket, count in sorted(self.histogram.items())
+            },
+        }
+        if trace_memory:
+            stats["allocated_bytes"] = self.allocated_bytes
+        return stats
+
+
+class Profiler(SimulationHook):
+    """
+    Measures where the time of a simulation goes, phase by phase.
+
+    For every phase the profiler keeps the number of runs, the total, mean,
+    smallest and largest wall time, the CPU time of the thread, a histogram
+    of wall times in power-of-two buckets, and the net change in the number
+    of memory blocks held by Python. Times of nested phases are included in
+    the phases around them, so "run_step" includes "update".
+
+    Attaching a profiler makes every phase do a few clock reads; once it is
+    detached, the simulation runs its methods unwrapped again.
+
+        profiler = Profiler()
+        profiler.attach(simulation)
+        simulation.run()
+        profiler.detach()
+        print(profiler.to_dict())
+    """
+
+    def __init__(
+        self,
+        trace: bool = False,
+        trace_memory: bool = False,
+        max_events: int = 1_000_000,
+    ):
+        """
+        Initialize a profiler.
+
+        Args:
+            trace (bool): Keep every run of every phase, for
+                to_chrome_trace().
+            trace_memory (bool): Also count the bytes allocated by each phase
+                with tracemalloc, including NumPy arrays. This slows the
+                simulation down considerably.
+            max_events (int): The most runs kept when tracing. Later runs are
+                still counted but not kept.
+
+        Raises:
+            ValueError: If max_events is negative.
+        """
+        if max_events < 0:
+            raise ValueError("max_events cannot be negative")
+        self.trace = trace
+        self.trace_memory = trace_memory
+        self.max_events = max_events
+        self.phases: Dict[str, PhaseStats] = {}
+        self.events: List[Tuple[str, int, int, int, int]] = []
+        self._stack: List[Tuple[str, int, int, int, int]] = []
+        self._simulation: Optional[Simulation] = None
+        self._started_tracemalloc = False
+        self._origin_ns = time.perf_counter_ns()
+
+    @property
+    def steps(self) -> int:
+        """The number of run_step() calls measured."""
+        stats = self.phases.get("run_step")
+        return stats.count if stats else 0
+
+    def attach(self, simulation: Simulation) -> None:
+        """
+        Start measuring a simulation.
+
+        Args:
+            simulation (Simulation): The simulation to measure.
+
+        Raises:
+            ValueError: If the profiler is already attached.
+        """
+        if self._simulation is not None:
+            raise ValueError("Profiler is already attached to a simulation")
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._simulation = simulation
+        simulation.add_hook(self)
+
+    def detach(self) -> None:
+        """Stop measuring. The results are kept."""
+        if self._simulation is not None:
+            self._simulation.remove_hook(self)
+            self._simulation = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self) -> None:
+        """Discard the results measured so far."""
+        self.phases.clear()
+        self.events.clear()
+
+    def __enter__(self) -> "Profiler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.detach()
+
+    def before(self, simulation: Simulation, phase: str) -> None:
+        self._stack.append(
+            (
+                phase,
+                time.perf_counter_ns(),
+                time.thread_time_ns(),
+                sys.getallocatedblocks(),
+                tracemalloc.get_traced_memory()[0] if self.trace_memory else 0,
+            )
+        )
+
+    def after(self, simulation: Simulation, phase: str) -> None:
+        end = time.perf_counter_ns()
+        cpu = time.thread_time_ns()
+        name, start, cpu_start, blocks, traced = self._stack.pop()
+        allocated = 0
+        if self.trace_memory:
+            allocated = tracemalloc.get_traced_memory()[0] - traced
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        stats.add(
+            end - start,
+            cpu - cpu_start,
+            sys.getallocatedblocks() - blocks,
+            allocated,
+        )
+        if self.trace and len(self.events) < self.max_events:
+            self.events.append(
+                (name, start, end - start, cpu - cpu_start, len(self._stack))
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the results.
+
+        Returns:
+            Dict[str, Any]: "steps", the number of run_step() calls, and
+                "phases", mapping each phase to its statistics. Times are in
+                seconds; "allocated_blocks" is the net change in the number
+                of memory blocks held by Python, and "allocated_bytes", when
+                memory is traced, the net change in traced bytes.
+        """
+        return {
+            "steps": self.steps,
+            "phases": {
+                name: stats.to_dict(self.trace_memory)
+                for name, stats in self.phases.items()
+            },
+        }
+
+    def to_chrome_trace(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the traced runs in the Chrome trace event format.
+
+        The result can be opened in chrome://tracing or Perfetto, which draw
+        every run of a phase as a slice nested under the phase around it.
+
+        Args:
+            path (Optional[str]): A file to write the trace to as JSON.
+
+        Returns:
+            Dict[str, Any]: The trace.
+
+        Raises:
+            ValueError: If the profiler was created without trace=True.
+        """
+        if not self.trace:
+            raise ValueError("Create the profiler with trace=True to get a trace")
+        pid = os.getpid()
+        tid = threading.get_ident()
+        # Nested runs end first, so sort outer runs before the runs they hold
+        events = sorted(self.events, key=lambda event: (event[1], event[4]))
+        trace = {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": "simulation",
+                    "ph": "X",
+                    "ts": (start - self._origin_ns) / 1e3,
+                    "dur": duration / 1e3,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"cpu_us": cpu / 1e3},
+                }
+                for name, start, duration, cpu, _ in events
+            ],
+            "displayTimeUnit": "ms",
+        }
+        if path is not None:
+            with open(path, "w") as file:
+                json.dump(trace, file)
+        return trace
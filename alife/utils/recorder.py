@@ -0,0 +1,355 @@
+# alife/utils/recorder.py
+
+import bisect
+import json
+import queue
+import struct
+import threading
+import zlib
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from alife.core import Simulation
+
+# File layout: MAGIC, the format version and the header length as two
+# little-endian uint32, the JSON header, then one record per frame. A record is
+# _RECORD (generation, kind, payload length) followed by its zlib-compressed
+# payload. Closing the recorder appends an index of the records and _FOOTER,
+# which points at it; files without a footer are read by scanning the records.
+MAGIC = b"ALIFETRJ"
+VERSION = 1
+_PREFIX = struct.Struct("<8sII")
+_RECORD = struct.Struct("<qBQ")
+_FOOTER = struct.Struct("<8sQ")
+_KEYFRAME = 0
+_DELTA = 1
+
+
+def default_frame(simulation: Simulation) -> np.ndarray:
+    """
+    The frame recorded for a simulation: the grid of its state.
+
+    Args:
+        simulation (Simulation): A simulation whose get_state() returns a grid
+            or a dict holding one under "grid".
+
+    Returns:
+        np.ndarray: The grid.
+    """
+    state = simulation.get_state()
+    if isinstance(state, dict):
+        state = state["grid"]
+    return np.asarray(state)
+
+
+def _bytes_of(frame: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(frame).reshape(-1).view(np.uint8)
+
+
+def _encode_keyframe(frame: np.ndarray) -> bytes:
+    header = json.dumps({"dtype": frame.dtype.str, "shape": frame.shape}).encode()
+    return struct.pack("<I", len(header)) + header + _bytes_of(frame).tobytes()
+
+
+def _decode_keyframe(payload: bytes) -> np.ndarray:
+    (length,) = struct.unpack_from("<I", payload)
+    header = json.loads(payload[4 : 4 + length])
+    frame = np.frombuffer(payload, np.dtype(header["dtype"]), offset=4 + length)
+    return frame.reshape(header["shape"]).copy()
+
+
+def _encode_delta(previous: np.ndarray, frame: np.ndarray) -> bytes:
+    # Positions of the bytes that changed, as gaps from the previous one, and
+    # the XOR of their old and new values
+    changed = _bytes_of(previous) ^ _bytes_of(frame)
+    positions = np.flatnonzero(changed)
+    gaps = np.diff(positions, prepend=0).astype(np.int64)
+    return (
+        struct.pack("<Q", len(positions))
+        + gaps.tobytes()
+        + changed[positions].tobytes()
+    )
+
+
+def _apply_delta(frame: np.ndarray, payload: bytes) -> None:
+    (count,) = struct.unpack_from("<Q", payload)
+    positions = np.cumsum(np.frombuffer(payload, np.int64, count, offset=8))
+    values = np.frombuffer(payload, np.uint8, count, offset=8 + 8 * count)
+    _bytes_of(frame)[positions] ^= values
+
+
+class TrajectoryRecorder:
+    """
+    Streams the frames of a simulation to a file as they are produced.
+
+    Every keyframe_interval-th frame is stored whole; the frames in between
+    are stored as the positions and XOR of the bytes that changed since the
+    previous frame, so a board where few cells change takes little space.
+    Encoding, compression and writing happen on a background thread.
+    Recording blocks once max_pending frames are waiting to be written, so
+    memory use stays bounded however fast the simulation runs.
+    """
+
+    def __init__(self, path: str, keyframe_interval: int = 100, max_pending: int = 64):
+        """
+        Open a file and start the writer thread.
+
+        Args:
+            path (str): The file to write.
+            keyframe_interval (int): The number of frames from one keyframe to
+                the next. Reading a frame decodes at most this many records.
+            max_pending (int): The number of frames that may wait for the
+                writer before record() blocks.
+
+        Raises:
+            ValueError: If keyframe_interval or max_pending is not positive.
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.generation = -1
+        self._file = open(path, "wb")
+        header = json.dumps({"keyframe_interval": keyframe_interval}).encode()
+        self._file.write(_PREFIX.pack(MAGIC, VERSION, len(header)) + header)
+        self._index: List[Tuple[int, int, int]] = []
+        self._queue: "queue.Queue[Optional[Tuple[int, np.ndarray]]]" = queue.Queue(
+            max_pending
+        )
+        self._error: Optional[BaseException] = None
+        self._detach: Optional[Callable[[], None]] = None
+        self._writer = threading.Thread(target=self._write_frames, daemon=True)
+        self._writer.start()
+
+    def record(self, frame, generation: Optional[int] = None) -> None:
+        """
+        Queue a frame to be written.
+
+        Args:
+            frame: An array-like. It is copied, so it may change afterwards.
+            generation (Optional[int]): The generation of the frame, which
+                must be greater than that of the previous frame. Defaults to
+                the previous generation plus one, starting from 0.
+
+        Raises:
+            ValueError: If the generation does not increase or the recorder
+                is closed.
+        """
+        self._raise_error()
+        if self._file.closed:
+            raise ValueError("Recorder is closed")
+        if generation is None:
+            generation = self.generation + 1
+        if generation <= self.generation:
+            raise ValueError("Generations must increase from frame to frame")
+        self.generation = generation
+        self._queue.put((generation, np.array(frame)))
+
+    def attach(
+        self,
+        simulation: Simulation,
+        frame: Callable[[Simulation], Any] = default_frame,
+    ) -> None:
+        """
+        Record a frame of a simulation now and after every run_step().
+
+        Args:
+            simulation (Simulation): The simulation to record.
+            frame (Callable[[Simulation], Any]): Extracts the frame from the
+                simulation. Defaults to default_frame().
+        """
+        # Another wrapper set on the instance, or else the method of the
+        # current class, which changes while the simulation has hooks
+        wrapped = vars(simulation).get("run_step")
+
+        def recorded_step() -> None:
+            if wrapped is not None:
+                wrapped()
+            else:
+                type(simulation).run_step(simulation)
+            self.record(frame(simulation))
+
+        simulation.run_step = recorded_step
+        self.record(frame(simulation))
+
+        def detach() -> None:
+            if simulation.run_step is recorded_step:
+                del simulation.run_step
+
+        self._detach = detach
+
+    def close(self) -> None:
+        """
+        Write the remaining frames and the index, and close the file.
+
+        The attached simulation, if any, stops being recorded.
+        """
+        if self._detach is not None:
+            self._detach()
+            self._detach = None
+        if self._file.closed:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        try:
+            self._raise_error()
+            index_offset = self._file.tell()
+            self._file.write(np.array(self._index, dtype=np.int64).tobytes())
+            self._file.write(_FOOTER.pack(MAGIC, index_offset))
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write_frames(self) -> None:
+        previous: Optional[np.ndarray] = None
+        since_keyframe = 0
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue  # Drain the queue so record() never blocks forever
+            generation, frame = item
+            try:
+                keyframe = (
+                    previous is None
+                    or since_keyframe == self.keyframe_interval
+                    or frame.shape != previous.shape
+                    or frame.dtype != previous.dtype
+                )
+                if keyframe:
+                    kind, payload = _KEYFRAME, _encode_keyframe(frame)
+                    since_keyframe = 0
+                else:
+                    kind, payload = _DELTA, _encode_delta(previous, frame)
+                payload = zlib.compress(payload, 1)
+                self._index.append((generation, self._file.tell(), kind))
+                self._file.write(_RECORD.pack(generation, kind, len(payload)))
+                self._file.write(payload)
+                previous = frame
+                since_keyframe += 1
+            except BaseException as error:
+                self._error = error
+
+
+class TrajectoryReader:
+    """
+    Random access to the frames of a file written by TrajectoryRecorder.
+
+    A frame is rebuilt from the keyframe before it and the deltas in between.
+    The last frame read is kept, so reading generations in order decodes
+    each record only once.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a recorded file.
+
+        Args:
+            path (str): The file to read.
+
+        Raises:
+            ValueError: If the file is not a recorded trajectory.
+        """
+        self._file = open(path, "rb")
+        prefix = self._file.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size or prefix[:8] != MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not a recorded trajectory")
+        _, version, header_length = _PREFIX.unpack(prefix)
+        if version != VERSION:
+            self._file.close()
+            raise ValueError(f"Unsupported trajectory version: {version}")
+        self.header = json.loads(self._file.read(header_length))
+        index = self._read_index(_PREFIX.size + header_length)
+        self.generations: List[int] = [int(g) for g in index[:, 0]]
+        self._offsets = index[:, 1]
+        self._kinds = index[:, 2]
+        self._cached: Optional[Tuple[int, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.generations)
+
+    def __getitem__(self, generation: int) -> np.ndarray:
+        """
+        Get the frame recorded at a generation.
+
+        Args:
+            generation (int): A recorded generation.
+
+        Returns:
+            np.ndarray: A new array holding the frame.
+
+        Raises:
+            KeyError: If no frame was recorded at that generation.
+        """
+        position = bisect.bisect_left(self.generations, generation)
+        if position == len(self) or self.generations[position] != generation:
+            raise KeyError(f"No frame recorded at generation {generation}")
+        start = position
+        while self._kinds[start] != _KEYFRAME:
+            start -= 1
+        if self._cached is not None and start <= self._cached[0] <= position:
+            start, frame = self._cached[0], self._cached[1]
+            records = range(start + 1, position + 1)
+        else:
+            frame = None
+            records = range(start, position + 1)
+        for record in records:
+            kind, payload = self._read_record(record)
+            if kind == _KEYFRAME:
+                frame = _decode_keyframe(payload)
+            else:
+                _apply_delta(frame, payload)
+        self._cached = (position, frame)
+        return frame.copy()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "TrajectoryReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _read_record(self, record: int) -> Tuple[int, bytes]:
+        self._file.seek(int(self._offsets[record]))
+        _, kind, length = _RECORD.unpack(self._file.read(_RECORD.size))
+        return kind, zlib.decompress(self._file.read(length))
+
+    def _read_index(self, start: int) -> np.ndarray:
+        file = self._file
+        end = file.seek(0, 2)
+        if end - start >= _FOOTER.size:
+            file.seek(end - _FOOTER.size)
+            magic, offset = _FOOTER.unpack(file.read(_FOOTER.size))
+            if magic == MAGIC and start <= offset <= end - _FOOTER.size:
+                file.seek(offset)
+                data = file.read(end - _FOOTER.size - offset)
+                return np.frombuffer(data, np.int64).reshape(-1, 3)
+
+        # No footer: the recorder was not closed, so scan the records
+        index = []
+        offset = start
+        while offset + _RECORD.size <= end:
+            file.seek(offset)
+            generation, kind, length = _RECORD.unpack(file.read(_RECORD.size))
+            if offset + _RECORD.size + length > end:
+                break  # A record cut short
+            index.append((generation, offset, kind))
+            offset += _RECORD.size + length
+        return np.array(index, dtype=np.int64).reshape(-1, 3)
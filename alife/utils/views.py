@@ -0,0 +1,22 @@
+# alife/utils/views.py
+
+import numpy as np
+
+
+def read_only(array) -> np.ndarray:
+    """
+    Get a read-only view of an array without copying it.
+
+    The view shows later changes made through the original array, so callers
+    that need a snapshot must copy it. A read-only version of something that
+    is not already an array (such as nested lists) is a new array.
+
+    Args:
+        array: An array or array-like.
+
+    Returns:
+        np.ndarray: A view that cannot be written through.
+    """
+    view = np.asarray(array).view()
+    view.flags.writeable = False
+    return view
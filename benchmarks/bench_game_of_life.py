@@ -0,0 +1,54 @@
+import argparse
+import time
+
+import numpy as np
+
+from alife.models.discrete_systems.cellular_automata.game_of_life import (
+    BACKENDS,
+    GameOfLifeEnvironment,
+)
+
+
+def generations_per_second(
+    backend: str, size: int, generations: int, density: float
+) -> float:
+    env = GameOfLifeEnvironment(size, size, backend=backend)
+    cells = np.random.default_rng(0).random((size, size)) < density
+    env.set_grid(cells)
+
+    start = time.perf_counter()
+    for _ in range(generations):
+        env.update()
+    return generations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure Game of Life generations per second for each backend"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 256, 1024, 2000])
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument(
+        "--max-python-size",
+        type=int,
+        default=256,
+        help="Skip the pure Python backend above this board size",
+    )
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'backend':>10} {'gen/s':>12} {'speedup':>10}")
+    for size in args.sizes:
+        baseline = None
+        for backend in BACKENDS:
+            if backend == "python" and size > args.max_python_size:
+                continue
+            rate = generations_per_second(backend, size, args.generations, args.density)
+            if backend == "python":
+                baseline = rate
+            speedup = f"{rate / baseline:.1f}x" if baseline else "-"
+            print(f"{size:>8} {backend:>10} {rate:>12.2f} {speedup:>10}")
+
+
+if __name__ == "__main__":
+    main()
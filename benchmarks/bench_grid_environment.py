@@ -0,0 +1,77 @@
+import argparse
+import time
+
+import numpy as np
+
+from alife.core import Entity
+from alife.environments.grid import GridEnvironment
+
+
+class Agent(Entity):
+    def interact(self, environment):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure entity operations and neighbor queries on GridEnvironment"
+    )
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--ticks", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    env = GridEnvironment(args.size, args.size)
+    cells = rng.choice(args.size * args.size, size=args.entities, replace=False)
+    agents = [Agent() for _ in range(args.entities)]
+
+    start = time.perf_counter()
+    for agent, cell in zip(agents, cells.tolist()):
+        env.add_entity(agent, cell % args.size, cell // args.size)
+    added = time.perf_counter() - start
+
+    steps = rng.integers(-1, 2, size=(args.ticks, args.entities, 2)).tolist()
+    start = time.perf_counter()
+    for tick in steps:
+        for agent, (dx, dy) in zip(agents, tick):
+            env.interact(agent, "move", x=dx, y=dy)
+    moved = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for agent in agents:
+        env._find_entity(agent)
+    found = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for agent in agents:
+        x, y = env._find_entity(agent)
+        env.interact(agent, "get_neighbors", x=x, y=y)
+    neighbors = time.perf_counter() - start
+
+    start = time.perf_counter()
+    positions = env.get_positions()
+    env.neighbor_ids(positions[:, 0], positions[:, 1])
+    batched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for agent in agents:
+        env.remove_entity(agent)
+    removed = time.perf_counter() - start
+
+    moves = args.ticks * args.entities
+    print(f"{args.entities} entities on a {args.size}x{args.size} grid")
+    print(f"{'operation':>10} {'total s':>10} {'ops/s':>12}")
+    for name, seconds, count in [
+        ("add", added, args.entities),
+        ("move", moved, moves),
+        ("find", found, args.entities),
+        ("neighbors", neighbors, args.entities),
+        ("batched", batched, args.entities),
+        ("remove", removed, args.entities),
+    ]:
+        print(f"{name:>10} {seconds:>10.3f} {count / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from alife.models.discrete_systems.cellular_automata.game_of_life import (
+    PARALLEL_BACKENDS,
+    GameOfLifeEnvironment,
+)
+
+
+def generations_per_second(
+    backend: str, size: int, workers: int, generations: int
+) -> float:
+    env = GameOfLifeEnvironment(size, size, backend=backend, workers=workers)
+    env.set_grid(np.random.default_rng(0).random((size, size)) < 0.2)
+    # Warm up the thread pool and the buffers before timing
+    env.update()
+
+    start = time.perf_counter()
+    for _ in range(generations):
+        env.update()
+    rate = generations / (time.perf_counter() - start)
+    env.close()
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure how Game of Life updates scale with worker threads"
+    )
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=list(PARALLEL_BACKENDS),
+        choices=PARALLEL_BACKENDS,
+    )
+    args = parser.parse_args()
+
+    worker_counts = []
+    workers = 1
+    while workers < args.max_workers:
+        worker_counts.append(workers)
+        workers *= 2
+    worker_counts.append(args.max_workers)
+
+    print(
+        f"{'backend':>10} {'workers':>8} {'gen/s':>10} {'speedup':>8} {'efficiency':>10}"
+    )
+    for backend in args.backends:
+        baseline = None
+        for workers in worker_counts:
+            rate = generations_per_second(backend, args.size, workers, args.generations)
+            if baseline is None:
+                baseline = rate
+            speedup = rate / baseline
+            print(
+                f"{backend:>10} {workers:>8} {rate:>10.2f} {speedup:>7.2f}x"
+                f" {speedup / workers:>10.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Benchmark suite for the models and environments.
+
+Run every benchmark and store the results:
+
+    python benchmarks/suite.py run --output results.json
+
+Compare two runs and exit with status 1 if anything got slower or bigger:
+
+    python benchmarks/suite.py compare baseline.json results.json
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from alife.core import Entity
+from alife.environments.fields import ResourceField
+from alife.environments.grid import GridEnvironment
+from alife.environments.neighborhood import GridTopology
+from alife.models.discrete_systems.cellular_automata.game_of_life import (
+    GameOfLifeEnvironment,
+)
+from alife.models.discrete_systems.langtons_ant import LangtonAntEnvironment
+from alife.models.discrete_systems.turmites import TurmiteEnvironment
+from alife.organisms.population import Population
+from alife.resources.pool import ResourcePool
+
+# A benchmark builds its workload from the parameters and returns a function
+# running one batch of work, the number of units in a batch and their name.
+Workload = Tuple[Callable[[], None], int, str]
+
+
+class Agent(Entity):
+    def interact(self, environment):
+        pass
+
+
+def game_of_life(backend: str, size: int, density: float) -> Workload:
+    env = GameOfLifeEnvironment(size, size, backend=backend)
+    env.set_grid(np.random.default_rng(0).random((size, size)) < density)
+    return env.update, 1, "generations"
+
+
+def langtons_ant(size: int, mode: str) -> Workload:
+    env = LangtonAntEnvironment(size, size, unbounded=mode == "unbounded")
+    if mode == "update":
+
+        def run():
+            for _ in range(1000):
+                env.update()
+
+        return run, 1000, "steps"
+    return lambda: env.advance(10_000), 10_000, "steps"
+
+
+def turmites(size: int, ants: int) -> Workload:
+    env = TurmiteEnvironment(size, size, "LLRR")
+    rng = np.random.default_rng(0)
+    env.add_ants(rng.integers(0, size, ants), rng.integers(0, size, ants))
+    return env.update, ants, "ant steps"
+
+
+def _grid_with_agents(size: int, entities: int) -> Tuple[GridEnvironment, list]:
+    env = GridEnvironment(size, size)
+    cells = np.random.default_rng(0).choice(size * size, entities, replace=False)
+    agents = [Agent() for _ in range(entities)]
+    for agent, cell in zip(agents, cells.tolist()):
+        env.add_entity(agent, cell % size, cell // size)
+    return env, agents
+
+
+def grid_move(size: int, entities: int) -> Workload:
+    env, agents = _grid_with_agents(size, entities)
+    moves = np.random.default_rng(1).integers(-1, 2, (entities, 2)).tolist()
+
+    def run():
+        for agent, (dx, dy) in zip(agents, moves):
+            env._move_entity(agent, dx, dy)
+
+    return run, entities, "moves"
+
+
+def grid_neighbors(size: int, entities: int) -> Workload:
+    env, _ = _grid_with_agents(size, entities)
+
+    def run():
+        positions = env.get_positions()
+        env.neighbor_ids(positions[:, 0], positions[:, 1])
+
+    return run, entities, "queries"
+
+
+def resource_field(size: int) -> Workload:
+    field = ResourceField(
+        GridTopology(size, size),
+        initial=1.0,
+        regeneration_rate=0.01,
+        decay_rate=0.01,
+        diffusion_rate=0.1,
+    )
+    return field.step, 1, "steps"
+
+
+def resource_pool(elements: int) -> Workload:
+    pool = ResourcePool(np.ones(elements), 0.1)
+
+    def run():
+        pool.regenerate()
+        pool.consume(0.05)
+
+    return run, elements, "elements"
+
+
+def population(organisms: int) -> Workload:
+    rng = np.random.default_rng(0)
+    pool = Population(["energy"])
+
+    def run():
+        pool.add(organisms - len(pool), energy=10.0)
+        pool["energy"] -= rng.random(pool.size)
+        pool["age"] += 1
+        pool.update_alive()
+        pool.remove_dead()
+
+    return run, organisms, "organism ticks"
+
+
+# Benchmark name: (function, full parameter grid, quick parameter grid)
+BENCHMARKS: Dict[str, Tuple[Callable[..., Workload], Dict, Dict]] = {
+    "game_of_life": (
+        game_of_life,
+        {
+            "backend": ["numpy", "bitpacked", "sparse"],
+            "size": [256, 1024, 2048],
+            "density": [0.01, 0.2],
+        },
+        {"backend": ["numpy", "bitpacked", "sparse"], "size": [128], "density": [0.2]},
+    ),
+    "langtons_ant": (
+        langtons_ant,
+        {"size": [256, 4096], "mode": ["update", "advance", "unbounded"]},
+        {"size": [64], "mode": ["update", "advance", "unbounded"]},
+    ),
+    "turmites": (
+        turmites,
+        {"size": [1024], "ants": [1, 1000, 100_000]},
+        {"size": [128], "ants": [100]},
+    ),
+    "grid_move": (
+        grid_move,
+        {"size": [1000], "entities": [1000, 100_000]},
+        {"size": [100], "entities": [1000]},
+    ),
+    "grid_neighbors": (
+        grid_neighbors,
+        {"size": [1000], "entities": [1000, 100_000]},
+        {"size": [100], "entities": [1000]},
+    ),
+    "resource_field": (
+        resource_field,
+        {"size": [256, 1024]},
+        {"size": [64]},
+    ),
+    "resource_pool": (
+        resource_pool,
+        {"elements": [10_000, 1_000_000]},
+        {"elements": [10_000]},
+    ),
+    "population": (
+        population,
+        {"organisms": [10_000, 1_000_000]},
+        {"organisms": [10_000]},
+    ),
+}
+
+
+def cases(quick: bool, only: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for name, (_, full, small) in BENCHMARKS.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        grid = small if quick else full
+        for values in itertools.product(*grid.values()):
+            yield name, dict(zip(grid, values))
+
+
+def measure(name: str, params: Dict[str, Any], min_time: float, repeats: int):
+    """
+    Time a benchmark and measure its peak memory.
+
+    The rate is the best of several timed runs, each repeating the batch
+    until min_time has passed. Peak memory is measured in a separate run
+    under tracemalloc, which slows code down, and covers setup and one batch.
+    """
+    function = BENCHMARKS[name][0]
+    run, units, unit = function(**params)
+    run()  # Warm up
+    best = 0.0
+    for _ in range(repeats):
+        batches = 0
+        start = time.perf_counter()
+        while True:
+            run()
+            batches += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = max(best, batches * units / elapsed)
+
+    tracemalloc.start()
+    try:
+        run, _, _ = function(**params)
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "benchmark": name,
+        "params": params,
+        "rate": best,
+        "unit": f"{unit}/s",
+        "peak_memory": peak,
+    }
+
+
+def run_suite(args) -> None:
+    results = []
+    print(f"{'benchmark':<16} {'params':<44} {'rate':>16} {'peak MiB':>10}")
+    for name, params in cases(args.quick, args.only):
+        result = measure(name, params, args.min_time, args.repeats)
+        results.append(result)
+        label = ", ".join(f"{key}={value}" for key, value in params.items())
+        print(
+            f"{name:<16} {label:<44} {result['rate']:>16,.1f}"
+            f" {result['peak_memory'] / 2**20:>10.2f}",
+            flush=True,
+        )
+    report = {
+        "metadata": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Wrote {len(results)} results to {args.output}")
+
+
+def _key(result: Dict[str, Any]) -> str:
+    return result["benchmark"] + json.dumps(result["params"], sort_keys=True)
+
+
+def compare(args) -> int:
+    with open(args.baseline) as file:
+        baseline = {_key(result): result for result in json.load(file)["results"]}
+    with open(args.current) as file:
+        current = json.load(file)["results"]
+
+    regressions = 0
+    print(f"{'benchmark':<16} {'params':<44} {'speed':>8} {'memory':>8}")
+    for result in current:
+        before = baseline.get(_key(result))
+        if before is None:
+            continue
+        speed = result["rate"] / before["rate"]
+        memory = (result["peak_memory"] + 1) / (before["peak_memory"] + 1)
+        flags = []
+        if speed < 1 - args.threshold:
+            flags.append("SLOWER")
+        if memory > 1 + args.memory_threshold:
+            flags.append("MORE MEMORY")
+        regressions += bool(flags)
+        label = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+        print(
+            f"{result['benchmark']:<16} {label:<44} {speed:>7.2f}x {memory:>7.2f}x"
+            f" {' '.join(flags)}"
+        )
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the models and environments and compare runs"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks")
+    run.add_argument("--output", help="Write the results to this JSON file")
+    run.add_argument(
+        "--quick", action="store_true", help="Use small sizes, for smoke tests"
+    )
+    run.add_argument(
+        "--only", nargs="+", default=[], help="Run benchmarks whose name contains any"
+    )
+    run.add_argument("--min-time", type=float, default=0.2)
+    run.add_argument("--repeats", type=int, default=3)
+
+    diff = commands.add_parser("compare", help="Compare two result files")
+    diff.add_argument("baseline")
+    diff.add_argument("current")
+    diff.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Flag benchmarks that got slower by more than this fraction",
+    )
+    diff.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=0.2,
+        help="Flag benchmarks whose peak memory grew by more than this fraction",
+    )
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run_suite(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -22,31 +22,30 @@ def run_langtons_ant():
     steps = []
     black_cells = []
 
-    for step in range(11000):
-        sim.run_step()
-        if step % 100 == 0:
-            state = sim.get_state()
-            grid = state["grid"].astype(float)
-            im.set_array(grid)
-            ax1.set_title(f"Step: {state['steps']}")
-
-            # Count and record the number of black cells
-            num_black_cells = np.sum(grid)
-            steps.append(step)
-            black_cells.append(num_black_cells)
-
-            # Update the plot of black cells
-            ax2.clear()
-            ax2.plot(steps, black_cells)
-            ax2.set_title("Number of Black Cells")
-            ax2.set_xlabel("Steps")
-            ax2.set_ylabel("Black Cells")
-
-            plt.tight_layout()
-            plt.pause(0.01)
+    for step in range(0, 11000, 100):
+        sim.run_steps(100)
+        state = sim.get_state()
+        grid = state["grid"].astype(float)
+        im.set_array(grid)
+        ax1.set_title(f"Step: {state['steps']}")
+
+        # Count and record the number of black cells
+        num_black_cells = np.sum(grid)
+        steps.append(state["steps"])
+        black_cells.append(num_black_cells)
+
+        # Update the plot of black cells
+        ax2.clear()
+        ax2.plot(steps, black_cells)
+        ax2.set_title("Number of Black Cells")
+        ax2.set_xlabel("Steps")
+        ax2.set_ylabel("Black Cells")
+
+        plt.tight_layout()
+        plt.pause(0.01)
 
         if step % 1000 == 0:
-            print(f"Step {step}: {np.sum(sim.get_state()['grid'])} black cells")
+            print(f"Step {state['steps']}: {num_black_cells:.0f} black cells")
 
     plt.show()
 
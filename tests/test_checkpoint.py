@@ -0,0 +1,158 @@
+import numpy as np
+import pytest
+
+from alife.models.discrete_systems.cellular_automata.game_of_life import (
+    GameOfLifeSimulation,
+)
+from alife.models.discrete_systems.langtons_ant import LangtonAntSimulation
+from alife.models.discrete_systems.turmites import TurmiteSimulation
+from alife.utils.checkpoint import load_checkpoint, save_checkpoint
+from tests.test_core import MockEnvironment, MockSimulation
+
+
+@pytest.mark.parametrize("pack_bits", [False, True])
+@pytest.mark.parametrize("compress", [False, True])
+def test_arrays_round_trip(tmp_path, pack_bits, compress):
+    path = tmp_path / "state.ckpt"
+    arrays = {
+        "cells": np.random.default_rng(0).random((13, 7)) < 0.5,
+        "words": np.arange(5, dtype=np.uint64),
+        "empty": np.zeros((0, 3), dtype=np.int64),
+    }
+    save_checkpoint(path, "test", {"step": 3}, arrays, pack_bits, compress)
+    for mmap in [False, True]:
+        checkpoint = load_checkpoint(path, mmap)
+        assert checkpoint.kind == "test"
+        assert checkpoint.metadata == {"step": 3}
+        for name, array in arrays.items():
+            assert checkpoint.arrays[name].dtype == array.dtype
+            assert np.array_equal(checkpoint.arrays[name], array)
+
+
+def test_raw_arrays_are_memory_mapped(tmp_path):
+    path = tmp_path / "state.ckpt"
+    save_checkpoint(path, "test", {}, {"grid": np.ones((64, 64), dtype=bool)})
+    grid = load_checkpoint(path, mmap=True).arrays["grid"]
+    assert isinstance(grid, np.memmap)
+    grid[0, 0] = False  # Copy-on-write: the file is not changed
+    assert load_checkpoint(path).arrays["grid"].all()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.ckpt"
+    path.write_bytes(b"not a checkpoint at all")
+    with pytest.raises(ValueError):
+        load_checkpoint(path)
+
+    save_checkpoint(path, "test", {}, {})
+    sim = GameOfLifeSimulation(8, 8)
+    with pytest.raises(ValueError):
+        sim.load_checkpoint(path)
+    with pytest.raises(NotImplementedError):
+        MockSimulation(MockEnvironment()).save_checkpoint(path)
+
+
+def test_simulation_checkpoints_map_by_default(tmp_path):
+    path = tmp_path / "life.ckpt"
+    GameOfLifeSimulation(64, 64, "numpy", seed=1).save_checkpoint(path)
+    assert isinstance(load_checkpoint(path, mmap=True).arrays["grid"], np.memmap)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "bitpacked", "sparse"])
+@pytest.mark.parametrize("mmap", [False, True])
+def test_game_of_life_resumes_exactly(tmp_path, backend, mmap):
+    path = tmp_path / "life.ckpt"
+    sim = GameOfLifeSimulation(24, 20, backend, seed=1, max_generations=500)
+    sim.initialize()
+    for _ in range(30):
+        sim.run_step()
+    sim.save_checkpoint(path, pack_bits=not mmap)
+
+    restored = GameOfLifeSimulation(24, 20, backend, max_generations=500)
+    restored.load_checkpoint(path, mmap=mmap)
+    assert restored.generation == 30
+    while not sim.is_complete():
+        sim.run_step()
+        restored.run_step()
+        assert np.array_equal(
+            np.asarray(sim.environment.get_state()),
+            np.asarray(restored.environment.get_state()),
+        )
+    assert restored.is_complete()
+    assert (restored.period, restored.transient) == (sim.period, sim.transient)
+
+    with pytest.raises(ValueError):
+        GameOfLifeSimulation(20, 24, backend).load_checkpoint(path)
+    with pytest.raises(ValueError):
+        GameOfLifeSimulation(24, 20, backend, rule="B36/S23").load_checkpoint(path)
+
+
+def test_hashlife_checkpoint_loads_into_other_backends(tmp_path):
+    path = tmp_path / "life.ckpt"
+    sim = GameOfLifeSimulation(32, 32, "hashlife", seed=2)
+    sim.initialize()
+    sim.run_steps(64)
+    sim.save_checkpoint(path, compress=True)
+
+    restored = GameOfLifeSimulation(32, 32, "sparse")
+    restored.load_checkpoint(path)
+    assert restored.generation == 64
+    assert np.array_equal(restored.environment.get_state(), sim.environment.get_state())
+
+
+@pytest.mark.parametrize("unbounded", [False, True])
+def test_langtons_ant_resumes_exactly(tmp_path, unbounded):
+    path = tmp_path / "ant.ckpt"
+    sim = LangtonAntSimulation(40, 40, unbounded, chunk_size=16)
+    sim.run_steps(5000)
+    sim.save_checkpoint(path)
+
+    restored = LangtonAntSimulation(40, 40, unbounded, chunk_size=16)
+    restored.load_checkpoint(path, mmap=True)
+    assert restored.steps == 5000
+    sim.run_steps(3000)
+    restored.run_steps(3000)
+    expected, actual = sim.get_state(), restored.get_state()
+    assert actual["ant"] == expected["ant"]
+    assert actual["origin"] == expected["origin"]
+    assert np.array_equal(actual["grid"], expected["grid"])
+
+    with pytest.raises(ValueError):
+        LangtonAntSimulation(40, 40, not unbounded).load_checkpoint(path)
+
+
+def test_langtons_ant_keeps_skipped_highways(tmp_path):
+    path = tmp_path / "ant.ckpt"
+    sim = LangtonAntSimulation(0, 0, unbounded=True, skip_highways=True)
+    sim.run_steps(10**9)
+    assert sim.environment.highways
+    sim.save_checkpoint(path)
+
+    restored = LangtonAntSimulation(0, 0, unbounded=True, skip_highways=True)
+    restored.load_checkpoint(path)
+    sim.run_steps(50_000)
+    restored.run_steps(50_000)
+    x, y, _ = sim.environment.get_state((0, 0, 0, 0))["ant"]
+    bounds = (x - 300, y - 300, x + 300, y + 300)
+    expected, actual = sim.get_state(bounds), restored.get_state(bounds)
+    assert actual["ant"] == expected["ant"]
+    assert np.array_equal(actual["grid"], expected["grid"])
+    assert restored.environment.color_at(0, 0) == sim.environment.color_at(0, 0)
+
+
+def test_turmites_resume_exactly(tmp_path):
+    path = tmp_path / "turmites.ckpt"
+    sim = TurmiteSimulation(30, 30, "LLRR", num_ants=5, seed=3)
+    sim.initialize()
+    sim.run_steps(500)
+    sim.save_checkpoint(path)
+
+    restored = TurmiteSimulation(30, 30, "LLRR")
+    restored.load_checkpoint(path)
+    sim.run_steps(500)
+    restored.run_steps(500)
+    for key, value in sim.get_state().items():
+        assert np.array_equal(restored.get_state()[key], value)
+
+    with pytest.raises(ValueError):
+        TurmiteSimulation(30, 30, "RL").load_checkpoint(path)
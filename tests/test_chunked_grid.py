@@ -0,0 +1,58 @@
+import pytest
+
+from alife.models.discrete_systems.chunked_grid import ChunkedGrid
+
+
+def test_cells_are_allocated_lazily():
+    grid = ChunkedGrid(chunk_size=8)
+    assert len(grid) == 0
+    assert grid[100, -100] == 0
+    assert len(grid) == 0
+
+    grid[-1, -1] = 1
+    grid[8, 0] = 2
+    assert grid[-1, -1] == 1
+    assert grid[8, 0] == 2
+    assert len(grid) == 2
+    assert grid.nbytes == 2 * 8 * 8
+
+
+def test_to_array_covers_allocated_chunks():
+    grid = ChunkedGrid(chunk_size=4)
+    grid[-1, 2] = 1
+    grid[5, -3] = 3
+    assert grid.bounds() == (-4, -4, 8, 4)
+
+    array, (x0, y0) = grid.to_array()
+    assert array.shape == (8, 12)
+    assert (x0, y0) == (-4, -4)
+    assert array[2 - y0, -1 - x0] == 1
+    assert array[-3 - y0, 5 - x0] == 3
+    assert array.sum() == 4
+
+
+def test_to_array_window():
+    grid = ChunkedGrid(chunk_size=4)
+    grid[-1, 2] = 1
+    grid[5, -3] = 3
+    array, origin = grid.to_array((-2, 1, 3, 4))
+    assert origin == (-2, 1)
+    assert array.shape == (3, 5)
+    assert array[1, 1] == 1
+    assert array.sum() == 1
+
+
+def test_empty_grid():
+    array, origin = ChunkedGrid().to_array()
+    assert array.shape == (0, 0)
+    assert origin == (0, 0)
+
+
+@pytest.mark.parametrize("chunk_size", [0, 3, 48])
+def test_chunk_size_must_be_power_of_two(chunk_size):
+    with pytest.raises(ValueError):
+        ChunkedGrid(chunk_size)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,6 +1,16 @@
+import copy
+
 import pytest
 
-from alife.core import Entity, Environment, Organism, Resource, Simulation
+from alife.core import (
+    Entity,
+    Environment,
+    Organism,
+    Resource,
+    Simulation,
+    SimulationHook,
+)
+from alife.resources.base import FiniteResource
 
 
 # Mock classes for testing
@@ -152,5 +162,170 @@ def test_simulation():
     assert sim.get_state()["steps"] == 0
 
 
+class CountingResource(FiniteResource):
+    reads = 0
+
+    def get_level(self) -> float:
+        CountingResource.reads += 1
+        return super().get_level()
+
+
+def test_organism_caches_alive_state():
+    organism = MockOrganism()
+    energy = CountingResource(10)
+    organism.add_resource("energy", energy)
+    organism.add_resource("water", CountingResource(5))
+    CountingResource.reads = 0
+    assert organism.is_alive()
+    assert CountingResource.reads == 0
+
+    energy.consume(10)
+    assert not organism.is_alive()
+    energy.produce(1)
+    assert organism.is_alive()
+
+    organism.add_resource("energy", FiniteResource(0))
+    assert not organism.is_alive()
+    energy.consume(1)  # No longer held by the organism
+    organism.resources["energy"].produce(2)
+    assert organism.is_alive()
+
+    # Resources that do not report changes are still read
+    organism.add_resource("mock", MockResource(1))
+    assert organism.is_alive()
+    organism.resources["mock"].consume(1)
+    assert not organism.is_alive()
+
+
+def test_organism_notices_resources_changed_directly():
+    organism = MockOrganism()
+    organism.add_resource("energy", FiniteResource(10))
+    organism.resources["energy"] = FiniteResource(0)
+    assert not organism.is_alive()
+    organism.add_resource("energy", FiniteResource(3))
+    assert organism.is_alive()
+    organism.resources["water"] = FiniteResource(0)
+    assert not organism.is_alive()
+    del organism.resources["water"]
+    assert organism.is_alive()
+
+    copied = copy.deepcopy(organism)
+    copied.resources["energy"].consume(3)
+    assert not copied.is_alive()
+    assert organism.is_alive()
+
+    class BareOrganism(MockOrganism):
+        def __init__(self):
+            self.resources = {}
+
+    bare = BareOrganism()
+    energy = FiniteResource(1)
+    bare.add_resource("energy", energy)
+    assert bare.is_alive()
+    energy.consume(1)
+    assert not bare.is_alive()
+    assert MockOrganism().is_alive()
+
+
+def test_sweep_dead_organisms():
+    env = MockEnvironment()
+    sim = MockSimulation(env)
+    organisms = [MockOrganism() for _ in range(4)]
+    for organism in organisms:
+        organism.add_resource("energy", FiniteResource(1))
+        env.add_entity(organism)
+        sim.watch(organism)
+    assert sim.sweep_dead() == []
+
+    organisms[2].resources["energy"].consume(1)
+    organisms[0].resources["energy"].consume(1)
+    organisms[1].resources["energy"].consume(1)
+    organisms[1].resources["energy"].produce(1)
+    assert list(sim.dead) == [organisms[2], organisms[0]]
+    assert sim.sweep_dead() == [organisms[2], organisms[0]]
+    assert env.get_entities() == [organisms[1], organisms[3]]
+    assert not sim.dead
+
+    # Swept organisms are no longer watched
+    organisms[0].resources["energy"].produce(1)
+    organisms[0].resources["energy"].consume(1)
+    assert not sim.dead
+
+    newborn = MockOrganism()
+    newborn.add_resource("energy", FiniteResource(0))
+    sim.watch(newborn)
+    assert sim.sweep_dead() == [newborn]
+
+
+def test_hooks_wrap_phases_only_while_added():
+    calls = []
+
+    class Hook(SimulationHook):
+        def before(self, simulation, phase):
+            calls.append(("before", phase))
+
+        def after(self, simulation, phase):
+            calls.append(("after", phase))
+
+    class UpdatingSimulation(MockSimulation):
+        def run_step(self) -> None:
+            super().run_step()
+            self.environment.update()
+            with self.phase("resources"):
+                pass
+
+    simulation = UpdatingSimulation(MockEnvironment())
+    hook = Hook()
+    simulation.add_hook(hook)
+    simulation.run_step()
+    assert calls == [
+        ("before", "run_step"),
+        ("before", "update"),
+        ("after", "update"),
+        ("before", "resources"),
+        ("after", "resources"),
+        ("after", "run_step"),
+    ]
+
+    copied = copy.deepcopy(simulation)
+    assert type(copied) is UpdatingSimulation
+    assert type(copied.environment) is MockEnvironment
+
+    simulation.remove_hook(hook)
+    assert type(simulation) is UpdatingSimulation
+    assert type(simulation.environment) is MockEnvironment
+    calls.clear()
+    simulation.run()
+    assert calls == []
+    with pytest.raises(ValueError):
+        simulation.remove_hook(hook)
+
+
+def test_hooks_follow_overrides_and_new_environments():
+    phases = []
+
+    class Hook(SimulationHook):
+        def before(self, simulation, phase):
+            phases.append(phase)
+
+    class Override(MockSimulation):
+        def run_step(self) -> None:
+            super().run_step()
+            self.environment.update()
+
+    simulation = Override(MockEnvironment())
+    simulation.add_hook(Hook())
+    simulation.run_step()
+    # The overridden run_step is one phase, not two
+    assert phases == ["run_step", "update"]
+
+    old = simulation.environment
+    simulation.environment = MockEnvironment()
+    phases.clear()
+    old.update()
+    simulation.run_step()
+    assert phases == ["run_step", "update"]
+
+
 if __name__ == "__main__":
     pytest.main()
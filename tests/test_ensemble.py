@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from alife.models.discrete_systems.cellular_automata.ensemble import (
+    GameOfLifeEnsembleEnvironment,
+    GameOfLifeEnsembleSimulation,
+)
+from alife.models.discrete_systems.cellular_automata.game_of_life import (
+    GameOfLifeSimulation,
+)
+
+
+def test_members_match_individual_simulations():
+    seeds = [3, 14, 15, 92]
+    ensemble = GameOfLifeEnsembleSimulation(12, 9, seeds)
+    ensemble.initialize()
+    singles = [GameOfLifeSimulation(12, 9, backend="numpy", seed=s) for s in seeds]
+    for sim in singles:
+        sim.initialize()
+
+    for _ in range(20):
+        ensemble.run_step()
+        for sim in singles:
+            sim.run_step()
+
+    boards = ensemble.get_state()["boards"]
+    for board, sim in zip(boards, singles):
+        assert np.array_equal(board, sim.get_state()["grid"])
+
+
+def test_seeded_python_backend_matches_ensemble():
+    ensemble = GameOfLifeEnsembleSimulation(6, 6, [7])
+    ensemble.initialize()
+    sim = GameOfLifeSimulation(6, 6, seed=7)
+    sim.initialize()
+    assert ensemble.get_state()["boards"][0].tolist() == sim.get_state()["grid"]
+
+
+def test_populations():
+    env = GameOfLifeEnsembleEnvironment(4, 4, 2)
+    boards = np.zeros((2, 4, 4), dtype=bool)
+    boards[1, 0, :3] = True
+    env.set_boards(boards)
+    assert env.populations().tolist() == [0, 3]
+
+    with pytest.raises(ValueError):
+        env.set_boards(np.zeros((3, 4, 4), dtype=bool))
+
+
+def test_still_life_and_oscillator_detection():
+    sim = GameOfLifeEnsembleSimulation(8, 8, [0, 0, 0, 0], max_period=8)
+    sim.initialize()
+    boards = np.zeros((4, 8, 8), dtype=bool)
+    boards[0, 1:3, 1:3] = True  # block
+    boards[1, 3, 2:5] = True  # blinker
+    for x, y in [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]:
+        boards[2, y, x] = True  # glider, period 32 on an 8x8 torus
+    boards[3, 0, 0:2] = True  # dies after one generation
+    sim.environment.set_boards(boards)
+    sim._reset_detection()
+    sim._record_hashes()
+
+    for _ in range(10):
+        sim.run_step()
+
+    state = sim.get_state()
+    assert state["periods"].tolist() == [1, 2, 0, 1]
+    assert state["transients"].tolist() == [0, 0, -1, 1]
+    assert not sim.is_complete()
+
+
+def test_run_stops_when_all_boards_settle():
+    sim = GameOfLifeEnsembleSimulation(16, 16, list(range(8)), max_generations=2000)
+    sim.run()
+    state = sim.get_state()
+    assert sim.generation < 2000
+    assert (state["periods"] > 0).all()
+    assert (state["transients"] >= 0).all()
+
+
+def test_reset_restores_seeded_boards():
+    sim = GameOfLifeEnsembleSimulation(10, 10, [1, 2])
+    sim.initialize()
+    initial = sim.get_state()["boards"].copy()
+    for _ in range(5):
+        sim.run_step()
+    sim.reset()
+    assert sim.generation == 0
+    assert np.array_equal(sim.get_state()["boards"], initial)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,10 +1,20 @@
 import numpy as np
 import pytest
 
+from alife.environments.neighborhood import MOORE, VON_NEUMANN, Neighborhood
+from alife.models.discrete_systems.cellular_automata.ensemble import (
+    GameOfLifeEnsembleSimulation,
+)
 from alife.models.discrete_systems.cellular_automata.game_of_life import (
     GameOfLifeEnvironment,
     GameOfLifeSimulation,
 )
+from alife.models.discrete_systems.cellular_automata.hashing import (
+    CycleDetector,
+    GridHasher,
+    grid_hashes,
+)
+from alife.models.discrete_systems.cellular_automata.rules import CONWAY, LifeRule
 
 
 def test_environment_initialization():
@@ -61,5 +71,344 @@ def test_simulation_reset():
     assert sim.generation == 0
 
 
+def test_invalid_backend():
+    with pytest.raises(ValueError):
+        GameOfLifeEnvironment(10, 10, backend="fortran")
+
+
+@pytest.mark.parametrize("width,height", [(1, 1), (2, 3), (7, 5), (16, 16)])
+def test_numpy_backend_matches_python(width, height):
+    rng = np.random.default_rng(width * 100 + height)
+    cells = rng.random((height, width)) < 0.4
+
+    python_env = GameOfLifeEnvironment(width, height)
+    numpy_env = GameOfLifeEnvironment(width, height, backend="numpy")
+    python_env.grid = cells.tolist()
+    numpy_env.grid = cells.copy()
+
+    for _ in range(10):
+        python_env.update()
+        numpy_env.update()
+        assert np.array_equal(np.array(python_env.grid), numpy_env.grid)
+
+
+def test_numpy_backend_accepts_list_grid():
+    env = GameOfLifeEnvironment(3, 3, backend="numpy")
+    env.grid = [[True, True, False], [True, True, False], [False, False, False]]
+    env.update()
+    assert env.grid.dtype == bool
+    assert env.grid.tolist() == [
+        [True, True, False],
+        [True, True, False],
+        [False, False, False],
+    ]
+
+
+def test_numpy_simulation_run():
+    sim = GameOfLifeSimulation(20, 20, backend="numpy")
+    sim.initialize()
+    assert isinstance(sim.get_state()["grid"], np.ndarray)
+    sim.run_step()
+    assert sim.get_state()["generation"] == 1
+    assert sim.get_state()["grid"].shape == (20, 20)
+
+
+@pytest.mark.parametrize(
+    "width,height", [(1, 1), (3, 2), (63, 5), (64, 4), (65, 7), (130, 9)]
+)
+def test_bitpacked_backend_matches_numpy(width, height):
+    rng = np.random.default_rng(width * 100 + height)
+    cells = rng.random((height, width)) < 0.4
+
+    numpy_env = GameOfLifeEnvironment(width, height, backend="numpy")
+    packed_env = GameOfLifeEnvironment(width, height, backend="bitpacked")
+    numpy_env.set_grid(cells)
+    packed_env.set_grid(cells)
+
+    for _ in range(10):
+        numpy_env.update()
+        packed_env.update()
+        assert np.array_equal(packed_env.get_state(), numpy_env.grid)
+
+
+def test_bitpacked_state():
+    env = GameOfLifeEnvironment(100, 10, backend="bitpacked")
+    cells = np.zeros((10, 100), dtype=bool)
+    cells[3, 70] = True
+    env.set_grid(cells)
+
+    packed = env.get_state(packed=True)
+    assert packed.dtype == np.uint64
+    assert packed.shape == (10, 2)
+    assert packed[3, 1] == 1 << 6
+
+    state = env.get_state()
+    assert state.dtype == bool
+    assert np.array_equal(state, cells)
+
+
+def test_bitpacked_glider_wraps_around():
+    env = GameOfLifeEnvironment(70, 6, backend="bitpacked")
+    glider = np.zeros((6, 70), dtype=bool)
+    for x, y in [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]:
+        glider[y, x] = True
+    env.set_grid(glider)
+
+    # A glider moves one cell diagonally every four generations, so after
+    # 4 * lcm(70, 6) generations it is back where it started.
+    for _ in range(4 * 210):
+        env.update()
+    assert np.array_equal(env.get_state(), glider)
+
+
+@pytest.mark.parametrize("density", [0.002, 0.05, 0.4])
+def test_sparse_backend_matches_numpy(density):
+    rng = np.random.default_rng(int(density * 1000))
+    cells = rng.random((40, 30)) < density
+
+    numpy_env = GameOfLifeEnvironment(30, 40, backend="numpy")
+    sparse_env = GameOfLifeEnvironment(30, 40, backend="sparse")
+    numpy_env.set_grid(cells)
+    sparse_env.set_grid(cells)
+
+    for _ in range(30):
+        numpy_env.update()
+        sparse_env.update()
+        assert np.array_equal(sparse_env.grid, numpy_env.grid)
+
+
+def test_sparse_backend_tracks_changes():
+    env = GameOfLifeEnvironment(50, 50, backend="sparse")
+    cells = np.zeros((50, 50), dtype=bool)
+    cells[10, 9:12] = True  # blinker
+    env.set_grid(cells)
+
+    env.update()
+    assert len(env._changed) == 4
+    grid = env.grid
+    env.update()
+    # Small changes are applied in place
+    assert env.grid is grid
+    assert np.array_equal(env.grid, cells)
+
+
+def test_sparse_backend_detects_external_changes():
+    env = GameOfLifeEnvironment(20, 20, backend="sparse")
+    env.update()
+    assert len(env._changed) == 0
+
+    # Reassigning the grid is picked up without any extra call
+    cells = np.zeros((20, 20), dtype=bool)
+    cells[5, 4:7] = True
+    env.grid = cells.copy()
+    env.update()
+    assert env.grid[4:7, 5].all() and env.grid.sum() == 3
+
+    # In-place edits need mark_dirty()
+    env.grid[15, 14:17] = True
+    env.mark_dirty()
+    env.update()
+    assert env.grid[5, 4:7].all() and env.grid[14:17, 15].all()
+
+
+@pytest.mark.parametrize("backend", ["numpy", "bitpacked"])
+@pytest.mark.parametrize("workers", [2, 3, 8])
+def test_parallel_update_matches_serial(backend, workers):
+    cells = np.random.default_rng(workers).random((37, 70)) < 0.3
+    serial_env = GameOfLifeEnvironment(70, 37, backend="numpy")
+    parallel_env = GameOfLifeEnvironment(70, 37, backend=backend, workers=workers)
+    serial_env.set_grid(cells)
+    parallel_env.set_grid(cells)
+
+    for _ in range(10):
+        serial_env.update()
+        parallel_env.update()
+        assert np.array_equal(parallel_env.get_state(), serial_env.grid)
+    parallel_env.close()
+
+
+def test_parallel_update_swaps_buffers():
+    env = GameOfLifeEnvironment(16, 16, backend="numpy", workers=2)
+    env.set_grid(np.random.default_rng(0).random((16, 16)) < 0.3)
+    env.update()
+    first = env.grid
+    env.update()
+    env.update()
+    assert env.grid is first
+    env.close()
+
+
+def test_parallel_update_with_more_workers_than_rows():
+    env = GameOfLifeEnvironment(8, 2, backend="numpy", workers=4)
+    reference = GameOfLifeEnvironment(8, 2, backend="numpy")
+    cells = np.random.default_rng(1).random((2, 8)) < 0.5
+    env.set_grid(cells)
+    reference.set_grid(cells)
+    env.update()
+    reference.update()
+    assert np.array_equal(env.grid, reference.grid)
+    env.close()
+
+
+def test_workers_validation():
+    with pytest.raises(ValueError):
+        GameOfLifeEnvironment(10, 10, backend="python", workers=2)
+    with pytest.raises(ValueError):
+        GameOfLifeEnvironment(10, 10, backend="numpy", workers=0)
+    with pytest.raises(ValueError):
+        GameOfLifeSimulation(16, 16, backend="hashlife", workers=2)
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy", "bitpacked", "sparse"])
+def test_simulation_detects_oscillator(backend):
+    sim = GameOfLifeSimulation(8, 8, backend=backend, seed=0)
+    sim.initialize()
+    blinker = np.zeros((8, 8), dtype=bool)
+    blinker[1, 1:4] = True
+    sim.environment.set_grid(blinker)
+    sim.cycle_detector.reset()
+    sim._observe(rehash=True)
+    while not sim.is_complete():
+        sim.run_step()
+
+    state = sim.get_state()
+    assert sim.generation == 2
+    assert state["period"] == 2
+    assert state["transient"] == 0
+
+
+def test_simulation_reports_transient():
+    sim = GameOfLifeSimulation(16, 16, backend="sparse", seed=0)
+    sim.initialize()
+    # Three cells in an L become a block after one generation
+    cells = np.zeros((16, 16), dtype=bool)
+    cells[4, 4] = cells[4, 5] = cells[5, 4] = True
+    sim.environment.set_grid(cells)
+    sim.cycle_detector.reset()
+    sim._observe(rehash=True)
+    while not sim.is_complete():
+        sim.run_step()
+
+    assert sim.period == 1
+    assert sim.transient == 1
+    assert sim.generation == 2
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_cycle_detection_matches_ensemble(seed):
+    sim = GameOfLifeSimulation(16, 16, backend="sparse", seed=seed)
+    sim.max_generations = 2000
+    sim.run()
+    ensemble = GameOfLifeEnsembleSimulation(16, 16, [seed], max_generations=2000)
+    ensemble.run()
+
+    state = ensemble.get_state()
+    assert sim.period == state["periods"][0]
+    assert sim.transient == state["transients"][0]
+
+
+def test_cycle_detection_can_be_disabled():
+    sim = GameOfLifeSimulation(8, 8, backend="numpy", seed=0, detect_cycles=False)
+    sim.initialize()
+    sim.environment.set_grid(np.zeros((8, 8), dtype=bool))
+    while not sim.is_complete():
+        sim.run_step()
+    assert sim.generation == 100
+    assert sim.get_state()["period"] is None
+
+
+def test_incremental_hash_matches_full_hash():
+    rng = np.random.default_rng(0)
+    cells = rng.random((13, 11)) < 0.3
+    hasher = GridHasher(11, 13)
+    hasher.rehash(cells)
+    for _ in range(5):
+        changed = rng.choice(cells.size, size=7, replace=False)
+        cells.reshape(-1)[changed] ^= True
+        assert hasher.update(cells, changed) == int(grid_hashes(cells))
+
+
+def test_cycle_detector_history_is_bounded():
+    detector = CycleDetector(max_history=3)
+    for generation, state in enumerate([1, 2, 3, 4, 5]):
+        assert not detector.observe(state, generation)
+    # State 1 has been forgotten, state 4 is still remembered
+    assert not detector.observe(1, 5)
+    assert detector.observe(4, 6)
+    assert (detector.transient, detector.period) == (3, 3)
+
+
+@pytest.mark.parametrize(
+    "neighborhood, boundary, rule",
+    [
+        (VON_NEUMANN, "fixed", LifeRule([1, 3], [1, 2])),
+        (MOORE, "reflecting", CONWAY),
+        (Neighborhood.moore(2), "toroidal", LifeRule([7, 8, 9], [6, 7, 8, 9, 10])),
+        (Neighborhood.moore(2), "fixed", LifeRule([7, 8, 9], [6, 7, 8, 9, 10])),
+        (Neighborhood([(1, 0), (0, 1), (1, 1)]), "toroidal", LifeRule([1], [1, 2])),
+        (Neighborhood([(2, 0), (-1, 0)]), "fixed", LifeRule([1], [1, 2])),
+        (Neighborhood([(2, 1), (0, -1), (-1, 0)]), "reflecting", LifeRule([1], [1, 2])),
+    ],
+)
+def test_custom_topologies_agree_across_backends(neighborhood, boundary, rule):
+    cells = np.random.default_rng(1).random((12, 15)) < 0.3
+    grids = []
+    for backend in ["python", "numpy", "sparse"]:
+        env = GameOfLifeEnvironment(
+            15, 12, backend, rule=rule, neighborhood=neighborhood, boundary=boundary
+        )
+        env.set_grid(cells)
+        env.advance(12)
+        grids.append(np.array(env.get_state(), dtype=bool))
+    assert np.array_equal(grids[0], grids[1])
+    assert np.array_equal(grids[0], grids[2])
+
+
+def test_fixed_boundary_stops_glider():
+    # A glider running into a fixed edge does not reappear on the other side
+    env = GameOfLifeEnvironment(8, 8, "numpy", boundary="fixed")
+    cells = np.zeros((8, 8), dtype=bool)
+    for x, y in [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]:
+        cells[y + 3, x + 3] = True
+    env.set_grid(cells)
+    env.advance(40)
+    assert not env.get_state()[:4, :4].any()
+
+
+def test_custom_topology_validation():
+    with pytest.raises(ValueError):
+        GameOfLifeEnvironment(8, 8, "bitpacked", boundary="fixed")
+    with pytest.raises(ValueError):
+        GameOfLifeEnvironment(8, 8, "numpy", workers=2, neighborhood=VON_NEUMANN)
+    with pytest.raises(ValueError):
+        GameOfLifeEnvironment(8, 8, neighborhood=Neighborhood.moore(6))
+    with pytest.raises(ValueError):
+        GameOfLifeSimulation(8, 8, "hashlife", boundary="reflecting")
+
+
+@pytest.mark.parametrize(
+    "backend", ["python", "numpy", "bitpacked", "sparse", "hashlife"]
+)
+def test_state_view(backend):
+    sim = GameOfLifeSimulation(16, 16, backend, seed=3)
+    sim.initialize()
+    view = sim.state_view()
+    assert view["generation"] == 0
+    assert np.array_equal(view["grid"], np.asarray(sim.environment.get_state()))
+    assert not view["grid"].flags.writeable
+    sim.run_step()
+    assert sim.state_view()["version"] > view["version"]
+    if backend in ("numpy", "sparse"):
+        assert np.shares_memory(sim.state_view()["grid"], sim.environment.grid)
+
+
+def test_initialize_bumps_version():
+    # The python backend without a seed fills the grid in place
+    sim = GameOfLifeSimulation(16, 16)
+    before = sim.state_view()["version"]
+    sim.initialize()
+    assert sim.state_view()["version"] > before
+
+
 if __name__ == "__main__":
     pytest.main()
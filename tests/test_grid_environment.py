@@ -1,9 +1,11 @@
 # tests/test_game_of_life.py
 
+import numpy as np
 import pytest
 
 from alife.core import Entity
 from alife.environments.grid import GridEnvironment
+from alife.environments.neighborhood import VON_NEUMANN
 
 
 class DummyEntity(Entity):
@@ -74,5 +76,166 @@ def test_wrap_around():
     assert env.grid[4][4] is None
 
 
+def test_entity_positions_follow_moves():
+    env = GridEnvironment(5, 5)
+    first, second = DummyEntity(), DummyEntity()
+    env.add_entity(first, 0, 0)
+    env.add_entity(second, 4, 4)
+
+    env.interact(first, "move", x=-1, y=2)
+    assert env._find_entity(first) == (4, 2)
+    assert env.interact(second, "move", x=0, y=-2)["success"] is False
+    assert env._find_entity(second) == (4, 4)
+
+    env.remove_entity(first)
+    assert env.get_entities() == [second]
+    assert env.grid[2][4] is None
+    with pytest.raises(ValueError):
+        env._find_entity(first)
+
+
+def test_entities_keep_insertion_order():
+    env = GridEnvironment(10, 10)
+    entities = [DummyEntity() for _ in range(20)]
+    for i, entity in enumerate(entities):
+        env.add_entity(entity, i % 10, i // 10)
+    env.remove_entity(entities[3])
+    assert list(env.entities) == entities[:3] + entities[4:]
+    assert env.entities[3] is entities[4]
+    assert env.entities[-1] is entities[-1]
+    assert env.entities[:2] == entities[:2]
+    env.add_entity(entities[3], 3, 0)
+    assert env.entities[-1] is entities[3]
+    assert not hasattr(env.entities, "append")
+
+
+def test_add_and_remove_errors():
+    env = GridEnvironment(5, 5)
+    entity = DummyEntity()
+    env.add_entity(entity, 1, 1)
+    with pytest.raises(ValueError):
+        env.add_entity(entity, 2, 2)
+    with pytest.raises(ValueError):
+        env.add_entity(DummyEntity(), 1, 1)
+
+    env.remove_entity(entity)
+    with pytest.raises(ValueError):
+        env.remove_entity(entity)
+
+
+def test_occupancy_stays_in_sync():
+    env = GridEnvironment(6, 4)
+    entities = [DummyEntity() for _ in range(3)]
+    for i, entity in enumerate(entities):
+        env.add_entity(entity, i, i)
+    env.interact(entities[0], "move", x=-1, y=0)
+    env.remove_entity(entities[1])
+
+    for y in range(env.height):
+        for x in range(env.width):
+            cell = env.grid[y][x]
+            expected = -1 if cell is None else env.entity_id(cell)
+            assert env.occupancy[y, x] == expected
+    assert env.get_entity(env.occupancy[2, 2]) is entities[2]
+    assert env.get_positions().tolist() == [[5, 0], [2, 2]]
+    with pytest.raises(ValueError):
+        env.get_entity(env.entity_id(entities[2]) - 1)
+
+
+def test_batched_neighbor_queries_match_get_neighbors():
+    env = GridEnvironment(7, 5)
+    rng = np.random.default_rng(0)
+    for cell in rng.choice(35, size=15, replace=False).tolist():
+        env.add_entity(DummyEntity(), cell % 7, cell // 7)
+
+    xs, ys = np.meshgrid(np.arange(7), np.arange(5))
+    ids = env.neighbor_ids(xs.ravel(), ys.ravel())
+    counts = env.count_neighbors(xs.ravel(), ys.ravel())
+    assert ids.shape == (35, 8)
+    for i, (x, y) in enumerate(zip(xs.ravel(), ys.ravel())):
+        neighbors = env.interact(None, "get_neighbors", x=x, y=y)["neighbors"]
+        expected = [-1 if n is None else env.entity_id(n) for n in neighbors]
+        assert ids[i].tolist() == expected
+        assert counts[i] == sum(n is not None for n in neighbors)
+
+
+def test_fixed_boundary():
+    env = GridEnvironment(4, 4, boundary="fixed")
+    corner, other = DummyEntity(), DummyEntity()
+    env.add_entity(corner, 0, 0)
+    env.add_entity(other, 1, 1)
+
+    result = env.interact(corner, "move", x=-1, y=0)
+    assert result["success"] is False
+    assert env._find_entity(corner) == (0, 0)
+
+    neighbors = env.interact(corner, "get_neighbors", x=0, y=0)["neighbors"]
+    assert neighbors[:5] == [None] * 5
+    assert neighbors[7] is other
+    ids = env.neighbor_ids([0], [0])
+    assert ids[0].tolist() == [-1] * 7 + [env.entity_id(other)]
+    assert env.count_neighbors([0, 3], [0, 3]).tolist() == [1, 0]
+
+
+def test_von_neumann_neighbors():
+    env = GridEnvironment(5, 5, neighborhood=VON_NEUMANN)
+    above = DummyEntity()
+    env.add_entity(above, 2, 1)
+    env.add_entity(DummyEntity(), 1, 1)
+    neighbors = env.interact(None, "get_neighbors", x=2, y=2)["neighbors"]
+    assert len(neighbors) == 4
+    assert neighbors.count(None) == 3
+    assert above in neighbors
+
+
+def test_state_view_is_read_only_and_versioned():
+    env = GridEnvironment(4, 3)
+    view = env.state_view()
+    assert view["occupancy"].shape == (3, 4)
+    assert (view["occupancy"] == -1).all()
+    with pytest.raises(ValueError):
+        view["occupancy"][0, 0] = 5
+
+    entity = DummyEntity()
+    env.add_entity(entity, 1, 2)
+    # The view follows changes without being fetched again
+    assert view["occupancy"][2, 1] == env.entity_id(entity)
+    version = env.state_view()["version"]
+    assert version > view["version"]
+
+    env.update()  # No fields, so nothing changes
+    assert env.state_view()["version"] == version
+    env.interact(entity, "move", x=1, y=0)
+    assert env.state_view()["version"] > version
+
+    food = env.add_field("food", initial=1.0, regeneration_rate=1.0)
+    levels = env.state_view()["fields"]["food"]
+    version = env.state_view()["version"]
+    env.update()
+    assert env.state_view()["version"] > version
+    assert levels[0, 0] == 2.0 and not levels.flags.writeable
+    assert np.shares_memory(levels, food.levels)
+
+
+def test_fields_update_and_harvest():
+    env = GridEnvironment(4, 3)
+    food = env.add_field("food", initial=1.0, regeneration_rate=0.5, capacity=2.0)
+    with pytest.raises(ValueError):
+        env.add_field("food")
+
+    first, second = DummyEntity(), DummyEntity()
+    env.add_entity(first, 1, 1)
+    env.add_entity(second, 2, 1)
+    assert env.harvest("food", [0.25, 3.0]).tolist() == [0.25, 1.0]
+    assert food.levels[1, 1] == 0.75 and food.levels[1, 2] == 0.0
+
+    env.update()
+    assert food.levels[1, 2] == 0.5 and food.levels[0, 0] == 1.5
+
+    result = env.interact(first, "harvest", field="food", amount=10.0)
+    assert result == {"success": True, "amount": 1.25}
+    assert env.harvest("food", 1.0, [second]).tolist() == [0.5]
+
+
 if __name__ == "__main__":
     pytest.main()
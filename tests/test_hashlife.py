@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+from alife.models.discrete_systems.cellular_automata.game_of_life import (
+    GameOfLifeEnvironment,
+    GameOfLifeSimulation,
+)
+from alife.models.discrete_systems.cellular_automata.hashlife import (
+    HashLife,
+    HashLifeEnvironment,
+)
+
+GLIDER = [(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)]
+
+
+def random_cells(width, height, seed):
+    return np.random.default_rng(seed).random((height, width)) < 0.3
+
+
+def test_hashlife_round_trip():
+    cells = random_cells(16, 16, 0)
+    universe = HashLife(4)
+    universe.load(cells)
+    assert np.array_equal(universe.to_array(), cells)
+    assert universe.root.population == cells.sum()
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        HashLifeEnvironment(10, 16)
+    with pytest.raises(ValueError):
+        GameOfLifeSimulation(12, 12, backend="hashlife")
+
+
+@pytest.mark.parametrize("width,height", [(1, 1), (2, 2), (16, 16), (8, 32), (32, 4)])
+def test_hashlife_matches_numpy_step_by_step(width, height):
+    cells = random_cells(width, height, width + height)
+    numpy_env = GameOfLifeEnvironment(width, height, backend="numpy")
+    hashlife_env = HashLifeEnvironment(width, height)
+    numpy_env.set_grid(cells)
+    hashlife_env.set_grid(cells)
+
+    for _ in range(12):
+        numpy_env.update()
+        hashlife_env.update()
+        assert np.array_equal(hashlife_env.get_state(), numpy_env.grid)
+
+
+@pytest.mark.parametrize("generations", [1, 7, 64, 100, 333])
+def test_hashlife_jumps_match_numpy(generations):
+    cells = random_cells(32, 32, generations)
+    numpy_env = GameOfLifeEnvironment(32, 32, backend="numpy")
+    hashlife_env = HashLifeEnvironment(32, 32)
+    numpy_env.set_grid(cells)
+    hashlife_env.set_grid(cells)
+
+    numpy_env.advance(generations)
+    hashlife_env.advance(generations)
+    assert np.array_equal(hashlife_env.get_state(), numpy_env.grid)
+
+
+def test_hashlife_glider_over_a_million_generations():
+    sim = GameOfLifeSimulation(64, 64, backend="hashlife")
+    cells = np.zeros((64, 64), dtype=bool)
+    for x, y in GLIDER:
+        cells[y, x] = True
+    sim.environment.set_grid(cells)
+
+    # The glider is back in place every 4 * 64 generations
+    sim.run_steps(2**20)
+    assert sim.generation == 2**20
+    assert np.array_equal(sim.get_state()["grid"], cells)
+
+
+def test_hashlife_collects_cache():
+    cells = random_cells(32, 32, 1)
+    numpy_env = GameOfLifeEnvironment(32, 32, backend="numpy")
+    hashlife_env = HashLifeEnvironment(32, 32, max_nodes=2000)
+    numpy_env.set_grid(cells)
+    hashlife_env.set_grid(cells)
+
+    numpy_env.advance(200)
+    hashlife_env.advance(200)
+    assert hashlife_env.universe.collections > 0
+    assert hashlife_env.universe.cache_size <= 2000
+    assert np.array_equal(hashlife_env.get_state(), numpy_env.grid)
+
+
+def test_hashlife_simulation():
+    sim = GameOfLifeSimulation(16, 16, backend="hashlife")
+    sim.initialize()
+    initial = sim.get_state()["grid"]
+    assert initial.shape == (16, 16)
+    sim.run_step()
+    assert sim.generation == 1
+    sim.reset()
+    assert sim.generation == 0
+
+
+def test_run_steps_on_array_backends():
+    sim = GameOfLifeSimulation(16, 16, backend="numpy")
+    sim.initialize()
+    expected = GameOfLifeEnvironment(16, 16, backend="numpy")
+    expected.set_grid(sim.get_state()["grid"])
+    expected.advance(5)
+
+    sim.run_steps(5)
+    assert sim.generation == 5
+    assert np.array_equal(sim.get_state()["grid"], expected.grid)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -1,6 +1,7 @@
 import numpy as np
 import pytest
 
+from alife.models.discrete_systems import langtons_ant
 from alife.models.discrete_systems.langtons_ant import (
     LangtonAnt,
     LangtonAntEnvironment,
@@ -149,5 +150,144 @@ def test_langton_ant_simulation_long_run():
     print(f"Final number of black cells: {final_black_cells}")
 
 
+@pytest.mark.parametrize("width, height, steps", [(10, 10, 500), (37, 23, 12000)])
+def test_run_steps_matches_run_step(width, height, steps):
+    """
+    Test that run_steps() produces exactly the same grid and ant as calling
+    run_step() repeatedly, including when the ant wraps around the edges.
+    """
+    stepped = LangtonAntSimulation(width, height)
+    stepped.initialize()
+    for _ in range(steps):
+        stepped.run_step()
+
+    batched = LangtonAntSimulation(width, height)
+    batched.initialize()
+    batched.run_steps(steps // 3)
+    batched.run_steps(steps - steps // 3)
+
+    assert batched.steps == stepped.steps
+    assert np.array_equal(batched.get_state()["grid"], stepped.get_state()["grid"])
+    assert batched.get_state()["ant"] == stepped.get_state()["ant"]
+
+
+def test_unbounded_matches_large_torus():
+    """
+    Test that the unbounded world behaves like a torus too large to wrap,
+    both for single steps and for run_steps().
+    """
+    steps = 12000
+    torus = LangtonAntSimulation(400, 400)
+    torus.run_steps(steps)
+
+    stepped = LangtonAntSimulation(400, 400, unbounded=True, chunk_size=16)
+    for _ in range(100):
+        stepped.run_step()
+    batched = LangtonAntSimulation(400, 400, unbounded=True, chunk_size=16)
+    batched.run_steps(100)
+    assert stepped.get_state()["ant"] == batched.get_state()["ant"]
+    assert np.array_equal(stepped.get_state()["grid"], batched.get_state()["grid"])
+
+    batched.run_steps(steps - 100)
+    state = batched.get_state()
+    assert state["ant"] == torus.get_state()["ant"]
+    x0, y0 = state["origin"]
+    height, width = state["grid"].shape
+    expected = torus.get_state()["grid"][y0 : y0 + height, x0 : x0 + width]
+    assert np.array_equal(state["grid"], expected)
+    assert torus.get_state()["grid"].sum() == state["grid"].sum()
+
+
+def test_unbounded_highway_does_not_wrap():
+    """
+    Test that the ant keeps building its highway into negative coordinates
+    and that memory only covers the chunks it visited.
+    """
+    sim = LangtonAntSimulation(10, 10, unbounded=True)
+    sim.run_steps(20000)
+    x, y, _ = sim.get_state()["ant"]
+    assert x < 0 or y < 0
+    grid = sim.environment.grid
+    assert grid.nbytes == len(grid) * 64 * 64
+    x0, y0, x1, y1 = grid.bounds()
+    assert len(grid) < (x1 - x0) * (y1 - y0) // (64 * 64) + 1
+
+
+def test_highway_skipping_matches_stepping(monkeypatch):
+    """
+    Test that skipping highway periods gives exactly the same ant and cells
+    as running every step, also when skipped periods are kept in closed form.
+    """
+    monkeypatch.setattr(langtons_ant, "MATERIALIZE_WINDOWS", 50)
+    steps = 123457
+    stepped = LangtonAntSimulation(10, 10, unbounded=True)
+    stepped.run_steps(steps)
+    skipped = LangtonAntSimulation(10, 10, unbounded=True, skip_highways=True)
+    for part in (20000, 1, 51233, steps - 71234):
+        skipped.run_steps(part)
+
+    expected = stepped.get_state()
+    x0, y0 = expected["origin"]
+    height, width = expected["grid"].shape
+    state = skipped.get_state((x0, y0, x0 + width, y0 + height))
+    assert state["ant"] == expected["ant"]
+    assert state["highways"]
+    assert np.array_equal(state["grid"], expected["grid"])
+    env = skipped.environment
+    for x, y in [(x0 + 3, y0 + 5), expected["ant"][:2], (x0 + width - 1, y0)]:
+        assert env.color_at(x, y) == expected["grid"][y - y0, x - x0]
+
+
+def test_highway_skipping_is_fast_and_linear():
+    """
+    Test that 10^12 steps finish at once, and that once on the highway the ant
+    moves two cells diagonally every 104 steps.
+    """
+    far = LangtonAntSimulation(10, 10, unbounded=True, skip_highways=True)
+    far.run_steps(10**12)
+    farther = LangtonAntSimulation(10, 10, unbounded=True, skip_highways=True)
+    farther.run_steps(10**12 + 104 * 1000)
+
+    x, y, direction = far.get_state((0, 0, 1, 1))["ant"]
+    x2, y2, direction2 = farther.get_state((0, 0, 1, 1))["ant"]
+    assert (abs(x2 - x), abs(y2 - y)) == (2000, 2000)
+    assert direction2 == direction
+    assert far.environment.grid.nbytes < 10**7
+
+    # Without bounds, the state is a window around the ant
+    state = far.get_state()
+    (x0, y0), grid = state["origin"], state["grid"]
+    assert grid.shape[0] <= 1024 and grid.shape[1] <= 1024
+    assert 0 <= x - x0 < grid.shape[1] and 0 <= y - y0 < grid.shape[0]
+    assert grid[y - y0, x - x0] == far.environment.color_at(x, y)
+
+
+def test_highway_skipping_requires_unbounded():
+    with pytest.raises(ValueError):
+        LangtonAntSimulation(10, 10, skip_highways=True)
+
+
+def test_state_view_does_not_copy():
+    env = LangtonAntEnvironment(11, 11)
+    view = env.state_view()
+    assert np.shares_memory(view["grid"], env.grid)
+    with pytest.raises(ValueError):
+        view["grid"][0, 0] = True
+    env.advance(0)
+    assert env.state_view()["version"] == view["version"]
+    env.update()
+    env.advance(10)
+    assert env.state_view()["version"] == view["version"] + 2
+    assert view["grid"].sum() == env.get_state()["grid"].sum() > 0
+
+    unbounded = LangtonAntSimulation(0, 0, unbounded=True)
+    unbounded.run_steps(500)
+    view = unbounded.state_view()
+    assert view["steps"] == 500 and view["grid"] is None
+    x, y, _ = view["ant"]
+    grid = unbounded.get_state((x - 5, y - 5, x + 5, y + 5))["grid"]
+    assert view["color_at"](x - 2, y + 3) == grid[8, 3]
+
+
 if __name__ == "__main__":
     pytest.main()
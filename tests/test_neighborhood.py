@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from alife.environments.neighborhood import (
+    BOUNDARIES,
+    MOORE,
+    VON_NEUMANN,
+    GridTopology,
+    Neighborhood,
+)
+
+
+def test_neighborhood_shapes():
+    assert len(MOORE) == 8
+    assert MOORE.offsets[0] == (-1, -1)
+    assert MOORE.offsets[-1] == (1, 1)
+    assert len(VON_NEUMANN) == 4
+    assert len(Neighborhood.moore(2)) == 24
+    assert len(Neighborhood.von_neumann(2)) == 12
+    assert Neighborhood.moore(2).radius == 2
+    assert Neighborhood.moore(1) == MOORE
+
+    with pytest.raises(ValueError):
+        Neighborhood([])
+    with pytest.raises(ValueError):
+        Neighborhood([(0, 0), (1, 0)])
+
+
+def test_resolve_boundaries():
+    torus = GridTopology(5, 4, boundary="toroidal")
+    assert torus.resolve(-1, 4) == (4, 0)
+    assert torus.resolve(12, -9) == (2, 3)
+
+    fixed = GridTopology(5, 4, boundary="fixed")
+    assert fixed.resolve(-1, 0) is None
+    assert fixed.resolve(4, 3) == (4, 3)
+    assert fixed.resolve(0, 100) is None
+
+    mirror = GridTopology(5, 4, boundary="reflecting")
+    assert mirror.resolve(-1, -2) == (0, 1)
+    assert mirror.resolve(5, 4) == (4, 3)
+    assert mirror.resolve(11, 0) == (1, 0)
+
+    with pytest.raises(ValueError):
+        GridTopology(5, 4, boundary="spherical")
+
+
+@pytest.mark.parametrize("boundary", BOUNDARIES)
+@pytest.mark.parametrize(
+    "neighborhood", [MOORE, VON_NEUMANN, Neighborhood.moore(2)], ids=repr
+)
+def test_lookups_agree(boundary, neighborhood):
+    topology = GridTopology(6, 5, neighborhood, boundary)
+    cells = np.random.default_rng(0).random((5, 6)) < 0.4
+    xs, ys = np.meshgrid(np.arange(6), np.arange(5))
+    nx, ny, inside = topology.neighbors(xs.ravel(), ys.ravel())
+    counts = topology.count(cells)
+
+    for i, (x, y) in enumerate(zip(xs.ravel(), ys.ravel())):
+        expected = [topology.resolve(x + dx, y + dy) for dx, dy in neighborhood.offsets]
+        assert topology.cell_neighbors(x, y) == expected
+        got = [
+            None if inside is not None and not inside[i, k] else (nx[i, k], ny[i, k])
+            for k in range(len(neighborhood))
+        ]
+        assert got == expected
+        assert counts[y, x] == sum(cells[c[1], c[0]] for c in expected if c)
+
+
+@pytest.mark.parametrize("boundary", BOUNDARIES)
+@pytest.mark.parametrize(
+    "neighborhood",
+    [MOORE, Neighborhood([(2, 1), (0, -1), (-1, 0)]), Neighborhood([(3, 0)])],
+    ids=repr,
+)
+def test_reverse_neighbors_see_the_cells(boundary, neighborhood):
+    topology = GridTopology(6, 5, neighborhood, boundary)
+    xs, ys = topology.reverse_neighbors([0, 5, 2], [0, 4, 2])
+    got = sorted(zip(xs.tolist(), ys.tolist()))
+    expected = sorted(
+        (x, y)
+        for x in range(6)
+        for y in range(5)
+        for cell in topology.cell_neighbors(x, y)
+        if cell in [(0, 0), (5, 4), (2, 2)]
+    )
+    assert got == expected
+
+
+if __name__ == "__main__":
+    pytest.main()
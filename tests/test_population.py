@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from alife.core import Organism
+from alife.organisms.population import Population
+from alife.resources.base import FiniteResource
+
+
+def test_add_and_columns():
+    population = Population(["energy", "water"], capacity=2)
+    ids = population.add(3, x=[1, 2, 3], y=4, energy=[10.0, 20.0, 30.0])
+    assert ids.tolist() == [0, 1, 2]
+    assert len(population) == 3
+    assert population.capacity >= 3
+    assert population["x"].tolist() == [1, 2, 3]
+    assert population["y"].tolist() == [4, 4, 4]
+    assert population["energy"].tolist() == [10.0, 20.0, 30.0]
+    assert population["water"].tolist() == [0.0, 0.0, 0.0]
+    assert population["alive"].all()
+
+    assert population.add(2).tolist() == [3, 4]
+    assert population["energy"].tolist() == [10.0, 20.0, 30.0, 0.0, 0.0]
+
+    with pytest.raises(ValueError):
+        population.add(1, food=1.0)
+    with pytest.raises(ValueError):
+        Population(["alive"])
+
+
+def test_remove_and_compact():
+    population = Population()
+    population.add(6, x=np.arange(6), energy=np.arange(6) + 1.0)
+    population.remove([1, 4])
+    assert len(population) == 4
+    assert 1 not in population and 2 in population
+    assert not population["alive"][[1, 4]].any()
+    with pytest.raises(ValueError):
+        population.remove(1)
+    with pytest.raises(ValueError):
+        population.remove(99)
+
+    population.compact()
+    assert population.size == 4
+    assert population.ids.tolist() == [0, 2, 3, 5]
+    assert population["x"].tolist() == [0, 2, 3, 5]
+    assert population.rows([5, 0]).tolist() == [3, 0]
+
+
+def test_removals_compact_automatically():
+    population = Population(capacity=16)
+    ids = population.add(10_000)
+    for chunk in np.array_split(ids[:9_000], 90):
+        population.remove(chunk)
+    assert len(population) == 1_000
+    # Vacant rows never outnumber present ones by much
+    assert population.size < 3_000
+    assert population.ids[population.present].tolist() == ids[9_000:].tolist()
+
+
+def test_update_alive_and_remove_dead():
+    population = Population(["energy", "water"])
+    population.add(4, energy=[1.0, 0.0, 2.0, 3.0], water=[1.0, 1.0, 0.0, 1.0])
+    assert population.update_alive().tolist() == [1, 2]
+    assert population.update_alive().tolist() == []
+    assert population.remove_dead().tolist() == [1, 2]
+    assert len(population) == 2
+
+
+def test_member_is_an_organism():
+    population = Population(["energy"])
+    ids = population.add(2, x=[3, 4], y=[5, 6], energy=[10.0, 1.0])
+    member = population.agent(ids[0])
+    assert isinstance(member, Organism)
+    assert member.position == (3, 5)
+    assert member.is_alive()
+
+    member.resources["energy"].consume(4)
+    assert population["energy"][0] == 6.0
+    with pytest.raises(ValueError):
+        member.resources["energy"].consume(100)
+    with pytest.raises(ValueError):
+        member.resources["energy"].produce(-1)
+
+    population["energy"] -= 1.0
+    assert member.resources["energy"].get_level() == 5.0
+    assert not population.agent(ids[1]).is_alive()
+
+    member.position = (7, 8)
+    member.age = 3
+    member.add_resource("energy", FiniteResource(42))
+    assert population["x"][0] == 7 and population["y"][0] == 8
+    assert population["age"][0] == 3
+    assert population["energy"][0] == 42
+    with pytest.raises(ValueError):
+        member.add_resource("water", FiniteResource(1))
+
+
+def test_member_follows_its_row():
+    population = Population()
+    population.add(3, energy=[1.0, 2.0, 3.0])
+    member = population.agent(2)
+    population.remove(0)
+    population.compact()
+    assert member.row == 1
+    assert member.resources["energy"].get_level() == 3.0
+    assert [m.id for m in population] == [1, 2]
+
+    population.remove(2)
+    assert not member.is_alive()
+    with pytest.raises(ValueError):
+        member.resources["energy"].get_level()
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from alife.models.discrete_systems.cellular_automata.game_of_life import (
+    GameOfLifeSimulation,
+)
+from alife.models.discrete_systems.turmites import TurmiteSimulation
+from alife.utils.profiler import Profiler
+from alife.utils.recorder import TrajectoryReader, TrajectoryRecorder
+
+
+def test_profiles_phases_of_a_simulation():
+    simulation = GameOfLifeSimulation(32, 32, max_generations=5, detect_cycles=False)
+    with Profiler() as profiler:
+        profiler.attach(simulation)
+        simulation.run()
+        simulation.get_state()
+
+    results = profiler.to_dict()
+    assert results["steps"] == 5
+    phases = results["phases"]
+    assert phases["initialize"]["count"] == 1
+    assert phases["update"]["count"] == 5
+    assert phases["get_state"]["count"] == 1
+    run_step = phases["run_step"]
+    assert run_step["wall_seconds"] >= phases["update"]["wall_seconds"] > 0
+    assert sum(run_step["wall_histogram"].values()) == 5
+    assert "allocated_bytes" not in run_step
+    json.dumps(results)
+
+    # Nothing is measured once detached
+    simulation.run_step()
+    assert profiler.steps == 5
+
+
+def test_profiles_update_of_replaced_environment():
+    # TurmiteSimulation.initialize builds a new environment
+    simulation = TurmiteSimulation(16, 16, "RL")
+    with Profiler() as profiler:
+        profiler.attach(simulation)
+        simulation.initialize()
+        for _ in range(4):
+            simulation.run_step()
+    assert profiler.to_dict()["phases"]["update"]["count"] == 4
+
+
+@pytest.mark.parametrize("recorder_first", [True, False])
+def test_profiler_and_recorder_attach_in_any_order(tmp_path, recorder_first):
+    simulation = GameOfLifeSimulation(8, 8, "numpy", seed=1, detect_cycles=False)
+    simulation.initialize()
+    recorder = TrajectoryRecorder(str(tmp_path / "life.trj"))
+    profiler = Profiler()
+    if recorder_first:
+        recorder.attach(simulation)
+        profiler.attach(simulation)
+        simulation.run_step()
+        recorder.close()
+        simulation.run_step()
+        profiler.detach()
+    else:
+        profiler.attach(simulation)
+        recorder.attach(simulation)
+        simulation.run_step()
+        profiler.detach()
+        simulation.run_step()
+        simulation.run_step()
+        recorder.close()
+
+    with TrajectoryReader(str(tmp_path / "life.trj")) as reader:
+        assert len(reader) == (2 if recorder_first else 4)
+    assert profiler.steps == (2 if recorder_first else 1)
+
+
+def test_chrome_trace_nests_phases(tmp_path):
+    simulation = GameOfLifeSimulation(16, 16, max_generations=3, detect_cycles=False)
+    profiler = Profiler(trace=True, trace_memory=True)
+    profiler.attach(simulation)
+    simulation.run()
+    profiler.detach()
+
+    assert profiler.to_dict()["phases"]["update"]["allocated_bytes"] >= 0
+    path = tmp_path / "trace.json"
+    trace = profiler.to_chrome_trace(str(path))
+    assert json.loads(path.read_text()) == trace
+    names = [event["name"] for event in trace["traceEvents"]]
+    assert names[:3] == ["initialize", "run_step", "update"]
+    assert names.count("update") == 3
+    step, update = trace["traceEvents"][1:3]
+    assert step["ts"] <= update["ts"]
+    assert update["ts"] + update["dur"] <= step["ts"] + step["dur"]
+
+    with pytest.raises(ValueError):
+        Profiler().to_chrome_trace()
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from alife.models.discrete_systems.cellular_automata.game_of_life import (
+    GameOfLifeSimulation,
+)
+from alife.models.discrete_systems.langtons_ant import LangtonAntSimulation
+from alife.utils.recorder import TrajectoryReader, TrajectoryRecorder
+
+
+def test_game_of_life_frames_read_back_in_any_order(tmp_path):
+    path = tmp_path / "life.trj"
+    sim = GameOfLifeSimulation(30, 20, "numpy", seed=4)
+    sim.initialize()
+    expected = []
+    with TrajectoryRecorder(path, keyframe_interval=7, max_pending=2) as recorder:
+        recorder.attach(sim)
+        expected.append(sim.environment.get_state().copy())
+        for _ in range(40):
+            sim.run_step()
+            expected.append(sim.environment.get_state().copy())
+    # Closing detaches the recorder
+    assert "run_step" not in vars(sim)
+
+    with TrajectoryReader(path) as reader:
+        assert reader.generations == list(range(41))
+        for generation in [40, 0, 13, 14, 15, 3, 39, 40]:
+            assert np.array_equal(reader[generation], expected[generation])
+        with pytest.raises(KeyError):
+            reader[41]
+
+
+def test_deltas_are_smaller_than_keyframes(tmp_path):
+    frame = np.zeros((256, 256), dtype=bool)
+    sizes = []
+    for interval in [1, 100]:
+        path = tmp_path / f"frames{interval}.trj"
+        with TrajectoryRecorder(path, keyframe_interval=interval) as recorder:
+            rng = np.random.default_rng(0)
+            for _ in range(50):
+                frame[rng.integers(256), rng.integers(256)] ^= True
+                recorder.record(frame)
+        sizes.append(path.stat().st_size)
+    assert sizes[1] * 3 < sizes[0]
+
+
+def test_explicit_generations_dtypes_and_shapes(tmp_path):
+    path = tmp_path / "frames.trj"
+    frames = {
+        0: np.arange(6, dtype=np.float64).reshape(2, 3),
+        5: np.arange(6, dtype=np.float64).reshape(2, 3) * 1.5,
+        9: np.arange(12, dtype=np.int32).reshape(3, 4),
+        10: np.arange(12, dtype=np.int32).reshape(3, 4) % 5,
+    }
+    recorder = TrajectoryRecorder(path)
+    for generation, frame in frames.items():
+        recorder.record(frame, generation)
+    with pytest.raises(ValueError):
+        recorder.record(frames[0], 10)
+    recorder.close()
+    with pytest.raises(ValueError):
+        recorder.record(frames[0])
+
+    with TrajectoryReader(path) as reader:
+        assert reader.generations == [0, 5, 9, 10]
+        for generation, frame in frames.items():
+            assert reader[generation].dtype == frame.dtype
+            assert np.array_equal(reader[generation], frame)
+
+
+def test_reads_files_that_were_not_closed(tmp_path):
+    path = tmp_path / "ant.trj"
+    sim = LangtonAntSimulation(16, 16)
+    recorder = TrajectoryRecorder(path, keyframe_interval=4)
+    recorder.attach(sim)
+    for _ in range(10):
+        sim.run_step()
+    # Stop the writer without writing the index, as if the run was killed
+    recorder._queue.put(None)
+    recorder._writer.join()
+    recorder._file.flush()
+
+    with TrajectoryReader(path) as reader:
+        assert reader.generations == list(range(11))
+        assert np.array_equal(reader[10], sim.get_state()["grid"])
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.trj"
+    path.write_bytes(b"nothing")
+    with pytest.raises(ValueError):
+        TrajectoryReader(path)
+    with pytest.raises(ValueError):
+        TrajectoryRecorder(tmp_path / "x.trj", keyframe_interval=0)
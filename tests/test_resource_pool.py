@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from alife.resources.base import RegeneratingResource
+from alife.resources.pool import ResourcePool
+
+
+def test_initial_levels_and_rates():
+    pool = ResourcePool([5, -1, 2], [1, -2, 0.5])
+    assert pool.levels.tolist() == [5, 0, 2]
+    assert pool.regeneration_rates.tolist() == [1, 0, 0.5]
+    assert len(pool) == 3
+
+    assert ResourcePool([1, 2], 3).regeneration_rates.tolist() == [3, 3]
+    with pytest.raises(ValueError):
+        ResourcePool([1, 2], [1, 2, 3])
+
+
+def test_consume_reports_failures():
+    pool = ResourcePool([10, 3, 5, 8])
+    failed = pool.consume([4, 4, -1, 8])
+    assert failed.tolist() == [False, True, True, False]
+    assert pool.levels.tolist() == [6, 3, 5, 0]
+
+    failed = pool.consume(2, mask=np.array([True, True, False, False]))
+    assert failed.tolist() == [False, False, False, False]
+    assert pool.levels.tolist() == [4, 1, 5, 0]
+
+
+def test_produce_and_regenerate():
+    pool = ResourcePool([0, 0, 0], [1, 2, 3])
+    failed = pool.produce([1, -1, 1])
+    assert failed.tolist() == [False, True, False]
+    assert pool.levels.tolist() == [1, 0, 1]
+
+    pool.regenerate()
+    assert pool.levels.tolist() == [2, 2, 4]
+    pool.regenerate(mask=np.array([False, True, False]))
+    assert pool.levels.tolist() == [2, 4, 4]
+
+
+def test_matches_individual_resources():
+    rng = np.random.default_rng(0)
+    resources = [
+        RegeneratingResource(level, rate)
+        for level, rate in zip(rng.uniform(0, 10, 50), rng.uniform(0, 1, 50))
+    ]
+    pool = ResourcePool.from_resources(resources)
+    for _ in range(20):
+        amounts = rng.uniform(0, 5, 50)
+        failed = pool.consume(amounts)
+        for resource, amount, fail in zip(resources, amounts, failed):
+            try:
+                resource.consume(amount)
+                assert not fail
+            except ValueError:
+                assert fail
+            resource.regenerate()
+        pool.regenerate()
+    assert np.allclose(pool.levels, [r.get_level() for r in resources])
+
+
+def test_pooled_resource():
+    pool = ResourcePool([5, 1], [0, 2])
+    resource = pool.resource(1)
+    resource.regenerate()
+    assert resource.get_level() == 3
+    resource.consume(3)
+    assert pool.levels[1] == 0
+    with pytest.raises(ValueError):
+        resource.consume(1)
+    with pytest.raises(ValueError):
+        resource.produce(-1)
+    with pytest.raises(IndexError):
+        pool.resource(2)
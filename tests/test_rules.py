@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from alife.models.discrete_systems.cellular_automata.ensemble import (
+    GameOfLifeEnsembleSimulation,
+)
+from alife.models.discrete_systems.cellular_automata.game_of_life import (
+    GameOfLifeEnvironment,
+    GameOfLifeSimulation,
+)
+from alife.models.discrete_systems.cellular_automata.hashlife import (
+    HashLifeEnvironment,
+)
+from alife.models.discrete_systems.cellular_automata.rules import (
+    CONWAY,
+    NAMED_RULES,
+    LifeRule,
+    as_rule,
+)
+
+
+def test_parse_rulestrings():
+    rule = LifeRule.from_string("B36/S23")
+    assert rule.birth == {3, 6}
+    assert rule.survival == {2, 3}
+    assert str(rule) == "B36/S23"
+
+    assert LifeRule.from_string("s23/b3") == CONWAY
+    assert LifeRule.from_string("23/3") == CONWAY
+    assert LifeRule.from_string("B2/S") == NAMED_RULES["seeds"]
+    assert as_rule("HighLife") == LifeRule.from_string("B36/S23")
+    assert as_rule(CONWAY) is CONWAY
+
+    for invalid in ["B3S23", "B9/S23", "life-like", ""]:
+        with pytest.raises(ValueError):
+            LifeRule.from_string(invalid)
+
+
+def test_lookup_table():
+    table = CONWAY.lookup_table()
+    assert table.shape == (20,)
+    # Dead cells: born with a total (neighbors) of 3
+    assert np.flatnonzero(table[:10]).tolist() == [3]
+    # Live cells: the total includes the cell, so 2 or 3 neighbors is 3 or 4
+    assert np.flatnonzero(table[10:]).tolist() == [3, 4]
+    with pytest.raises(ValueError):
+        table[0] = True
+
+
+@pytest.mark.parametrize("rule", sorted(NAMED_RULES))
+def test_apply_matches_next_state(rule):
+    rule = NAMED_RULES[rule]
+    index = np.array([[alive * 10 + total for total in range(10)] for alive in (0, 1)])
+    expected = [
+        [rule.next_state(bool(alive), total - alive) for total in range(10)]
+        for alive in (0, 1)
+    ]
+    assert rule.apply(index.astype(np.uint8)).tolist() == expected
+
+
+@pytest.mark.parametrize("rule", ["highlife", "seeds", "day_and_night", "B0/S8"])
+@pytest.mark.parametrize(
+    "backend,workers",
+    [("numpy", 1), ("bitpacked", 1), ("sparse", 1), ("numpy", 3), ("bitpacked", 2)],
+)
+def test_backends_match_python_reference(rule, backend, workers):
+    cells = np.random.default_rng(len(rule)).random((13, 70)) < 0.35
+    reference = GameOfLifeEnvironment(70, 13, rule=rule)
+    env = GameOfLifeEnvironment(70, 13, backend=backend, workers=workers, rule=rule)
+    reference.set_grid(cells)
+    env.set_grid(cells)
+
+    for _ in range(8):
+        reference.update()
+        env.update()
+        assert np.array_equal(env.get_state(), np.array(reference.grid))
+    env.close()
+
+
+def test_hashlife_with_rule():
+    cells = np.random.default_rng(0).random((16, 16)) < 0.3
+    reference = GameOfLifeEnvironment(16, 16, backend="numpy", rule="highlife")
+    env = HashLifeEnvironment(16, 16, rule="highlife")
+    reference.set_grid(cells)
+    env.set_grid(cells)
+
+    reference.advance(37)
+    env.advance(37)
+    assert np.array_equal(env.get_state(), reference.grid)
+
+    with pytest.raises(ValueError):
+        HashLifeEnvironment(16, 16, rule="B0/S8")
+
+
+def test_simulation_and_ensemble_rules():
+    sim = GameOfLifeSimulation(12, 12, backend="numpy", seed=5, rule="day_and_night")
+    ensemble = GameOfLifeEnsembleSimulation(12, 12, [5], rule="day_and_night")
+    sim.initialize()
+    ensemble.initialize()
+    for _ in range(10):
+        sim.run_step()
+        ensemble.run_step()
+    assert np.array_equal(ensemble.get_state()["boards"][0], sim.get_state()["grid"])
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,135 @@
+import pytest
+
+from alife.core import Entity
+from alife.schedulers import (
+    RandomScheduler,
+    SequentialScheduler,
+    SimultaneousScheduler,
+    StagedScheduler,
+)
+from tests.test_core import MockEnvironment, MockOrganism, MockSimulation
+
+
+class Recorder(Entity):
+    def __init__(self, name, log):
+        super().__init__()
+        self.name = name
+        self.log = log
+
+    def interact(self, environment):
+        self.log.append(self.name)
+
+    def sense(self, environment):
+        self.log.append(("sense", self.name))
+
+    def move(self, environment):
+        self.log.append(("move", self.name))
+
+
+class Walker(Entity):
+    """Moves by a random step; with simultaneous updates, towards the others."""
+
+    def __init__(self, position):
+        super().__init__()
+        self.position = position
+
+    def interact(self, environment):
+        pass
+
+    def decide(self, environment, rng):
+        mean = sum(w.position for w in environment.get_entities()) / len(
+            environment.get_entities()
+        )
+        return (mean - self.position) / 2 + rng.normal()
+
+    def apply(self, environment, decision):
+        self.position += decision
+
+
+def _walkers(count):
+    env = MockEnvironment()
+    for position in range(count):
+        env.add_entity(Walker(float(position)))
+    return env
+
+
+def test_sequential_and_random_order():
+    log = []
+    agents = [Recorder(name, log) for name in "abcde"]
+    SequentialScheduler().step(agents, MockEnvironment())
+    assert log == list("abcde")
+
+    orders = []
+    for seed in [1, 1, 2]:
+        log.clear()
+        scheduler = RandomScheduler(seed=seed)
+        scheduler.step(agents, MockEnvironment())
+        scheduler.step(agents, MockEnvironment())
+        assert sorted(log[:5]) == list("abcde")
+        orders.append(log[:])
+    assert orders[0] == orders[1]
+    assert orders[0] != orders[2]
+
+
+def test_staged_scheduler():
+    log = []
+    agents = [Recorder(name, log) for name in "ab"]
+    StagedScheduler(["sense", "move"]).step(agents, MockEnvironment())
+    assert log == [("sense", "a"), ("sense", "b"), ("move", "a"), ("move", "b")]
+
+    log.clear()
+    StagedScheduler([lambda agent, env: agent.log.append(agent.name)]).step(
+        agents, MockEnvironment()
+    )
+    assert log == ["a", "b"]
+    with pytest.raises(ValueError):
+        StagedScheduler([])
+
+
+def _halfway_to_mean(agent, environment, rng):
+    positions = [walker.position for walker in environment.get_entities()]
+    return (sum(positions) / len(positions) - agent.position) / 2
+
+
+def test_simultaneous_decisions_see_the_same_state():
+    env = MockEnvironment()
+    for position in [0.0, 4.0]:
+        env.add_entity(Walker(position))
+    SimultaneousScheduler(decide=_halfway_to_mean).step(env.get_entities(), env)
+    assert [w.position for w in env.get_entities()] == [1.0, 3.0]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_simultaneous_results_do_not_depend_on_workers(executor):
+    results = []
+    for workers in [1, 3]:
+        env = _walkers(7)
+        scheduler = SimultaneousScheduler(seed=5, workers=workers, executor=executor)
+        for _ in range(3):
+            scheduler.step(env.get_entities(), env)
+        scheduler.close()
+        results.append([w.position for w in env.get_entities()])
+    assert results[0] == results[1]
+
+    with pytest.raises(ValueError):
+        SimultaneousScheduler(workers=0)
+    with pytest.raises(ValueError):
+        SimultaneousScheduler(executor="gpu")
+
+
+def test_simulation_steps_agents_with_its_scheduler():
+    env = MockEnvironment()
+    acted = []
+    organism = MockOrganism()
+    organism.act = lambda environment: acted.append(organism)
+    env.add_entity(organism)
+
+    sim = MockSimulation(env)
+    sim.step_agents()
+    assert acted == [organism]
+    assert isinstance(sim.scheduler, SequentialScheduler)
+
+    log = []
+    sim.scheduler = StagedScheduler(["sense"])
+    sim.step_agents([Recorder("x", log)])
+    assert log == [("sense", "x")]
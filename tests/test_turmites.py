@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from alife.models.discrete_systems.langtons_ant import LangtonAntSimulation
+from alife.models.discrete_systems.turmites import (
+    TurmiteEnvironment,
+    TurmiteRule,
+    TurmiteSimulation,
+)
+
+
+def test_rulestring_parsing():
+    rule = TurmiteRule.from_string("llrr")
+    assert (rule.states, rule.colors) == (1, 4)
+    assert rule.write.tolist() == [[1, 2, 3, 0]]
+    assert rule.turn.tolist() == [[3, 3, 1, 1]]
+
+    for invalid in ["", "R", "RXL"]:
+        with pytest.raises(ValueError):
+            TurmiteRule.from_string(invalid)
+
+
+def test_invalid_tables():
+    with pytest.raises(ValueError):
+        TurmiteRule([[1, 2]], [[1, 1]], [[0, 0]])
+    with pytest.raises(ValueError):
+        TurmiteRule([[1, 0]], [[1, 1]], [[0, 1]])
+    with pytest.raises(ValueError):
+        TurmiteRule([[1, 0]], [[1, 1]], [[0, 0], [0, 0]])
+
+
+def test_rl_turmite_matches_langtons_ant():
+    turmite = TurmiteSimulation(30, 20, "RL")
+    turmite.initialize()
+    langton = LangtonAntSimulation(30, 20)
+    langton.initialize()
+    for _ in range(3000):
+        turmite.run_step()
+    langton.run_steps(3000)
+
+    state = turmite.get_state()
+    assert np.array_equal(state["grid"].astype(bool), langton.get_state()["grid"])
+    ant = (state["x"][0], state["y"][0], state["direction"][0])
+    assert ant == langton.get_state()["ant"]
+
+
+def test_ants_step_together():
+    # Ants far apart behave exactly like ants simulated on their own
+    env = TurmiteEnvironment(64, 64, "LLRR")
+    env.add_ants([10, 40], [10, 40], [0, 2])
+    env.advance(200)
+
+    for x, y, direction in [(10, 10, 0), (40, 40, 2)]:
+        single = TurmiteEnvironment(64, 64, "LLRR")
+        single.add_ants(x, y, direction)
+        single.advance(200)
+        near = (slice(y - 20, y + 20), slice(x - 20, x + 20))
+        assert np.array_equal(env.grid[near], single.grid[near])
+
+
+def test_collision_lowest_index_writes():
+    # State 0 paints color 1 and state 1 paints color 0
+    rule = TurmiteRule([[1, 1], [0, 0]], [[1, 1], [3, 3]], [[0, 0], [1, 1]])
+    env = TurmiteEnvironment(5, 5, rule)
+    env.add_ants([2, 2], [2, 2], state=[0, 1])
+    env.update()
+    assert env.grid[2, 2] == 1
+    # Both ants read the same color, then turned their own way
+    assert env.direction.tolist() == [1, 3]
+
+    env = TurmiteEnvironment(5, 5, rule)
+    env.add_ants([2, 2], [2, 2], state=[1, 0])
+    env.update()
+    assert env.grid[2, 2] == 0
+
+
+def test_add_ants_validation():
+    env = TurmiteEnvironment(5, 5)
+    with pytest.raises(ValueError):
+        env.add_ants(5, 0)
+    with pytest.raises(ValueError):
+        env.add_ants(0, 0, state=1)
+
+
+def test_simulation_reset():
+    sim = TurmiteSimulation(20, 20, "RLR", num_ants=50, seed=3)
+    sim.initialize()
+    initial = sim.get_state()
+    sim.run_steps(100)
+    assert sim.steps == 100
+    assert sim.get_state()["grid"].max() == 2
+    sim.reset()
+    state = sim.get_state()
+    assert sim.steps == 0
+    assert not state["grid"].any()
+    assert np.array_equal(state["x"], initial["x"])
+
+
+def test_state_view_does_not_copy():
+    env = TurmiteEnvironment(8, 8, "LLRR")
+    env.add_ants([1, 5], [2, 6])
+    view = env.state_view()
+    assert np.shares_memory(view["grid"], env.grid)
+    assert not view["x"].flags.writeable
+    env.update()
+    assert env.state_view()["version"] == view["version"] + 1
+    assert view["grid"].sum() == 2
+
+
+if __name__ == "__main__":
+    pytest.main()